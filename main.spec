@@ -1,4 +1,5 @@
 # -*- mode: python ; coding: utf-8 -*-
+from PyInstaller.utils.hooks import collect_submodules
 
 
 a = Analysis(
@@ -7,7 +8,9 @@ a = Analysis(
     binaries=[],
     datas=[("chromium", "chromium"),
     ("venv/Lib/site-packages/gender_guesser/data", "gender_guesser/data")],
-    hiddenimports=[],
+    # Source adapters are loaded by name (sources.get_adapter) and stages import
+    # their modules lazily, so bundle every package module explicitly.
+    hiddenimports=collect_submodules("sanctions_pipeline"),
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,10 @@
+"""
+EU sanctions data pipeline.
+
+Downloads the SanctionsMap travel-ban XML and PDF, splits them into entity
+chunks and populates an analyst-ready Excel workbook.  Importing the package
+is cheap: the scraping, PDF and spreadsheet dependencies are only loaded by
+the stage modules that need them.
+"""
+
+__version__ = "1.1.0"
@@ -0,0 +1,114 @@
+"""
+Chunk archives: the per-entity XML and PDF text chunks of one run, stored as
+a single append-only zip instead of thousands of small files.
+
+Members are named ``entity<N>.<ext>`` so any entity can be read directly
+through the zip's central directory without scanning the archive.  The
+programme code travels in the member comment (the PDF ``Programme:`` field,
+or the first regulation's programme for XML entities).
+"""
+import os
+import re
+import uuid
+import zipfile
+from pathlib import Path
+
+_MEMBER_RE = re.compile(r"entity(\d+)\.\w+$")
+
+
+def temp_path(path):
+    """
+    Unique temporary name next to ``path``.  A PID alone is not enough: a
+    retried task may write the same file concurrently, from this host or
+    from another one sharing the work directory.
+    """
+    return path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+
+
+class ChunkWriter:
+    """Append chunks to a new archive; it replaces ``path`` only on a clean close."""
+
+    def __init__(self, path, suffix, compresslevel=6):
+        self.path = Path(path)
+        self.suffix = suffix
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = temp_path(self.path)
+        self._zip = zipfile.ZipFile(self._tmp_path, "w", compression=zipfile.ZIP_DEFLATED,
+                                    compresslevel=compresslevel)
+        self.count = 0
+
+    def append(self, data, programme=None):
+        self.count += 1
+        info = zipfile.ZipInfo(f"entity{self.count}{self.suffix}", date_time=(1980, 1, 1, 0, 0, 0))
+        info.compress_type = zipfile.ZIP_DEFLATED
+        if programme:
+            info.comment = programme.encode("utf-8")
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._zip.writestr(info, data)
+        return self.count
+
+    def close(self):
+        self._zip.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        self._zip.close()
+        try:
+            self._tmp_path.unlink()
+        except OSError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class ChunkArchive:
+    """Read-only, random access view of an archive written by ``ChunkWriter``."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._zip = zipfile.ZipFile(self.path, "r")
+        self._members = {}
+        for info in self._zip.infolist():
+            m = _MEMBER_RE.match(info.filename)
+            if m:
+                self._members[int(m.group(1))] = info
+
+    def __len__(self):
+        return len(self._members)
+
+    def __contains__(self, seq):
+        return seq in self._members
+
+    def numbers(self):
+        return sorted(self._members)
+
+    def read_bytes(self, seq):
+        return self._zip.read(self._members[seq])
+
+    def get(self, seq):
+        return self.read_bytes(seq).decode("utf-8")
+
+    def programme(self, seq):
+        comment = self._members[seq].comment
+        return comment.decode("utf-8") if comment else None
+
+    def __iter__(self):
+        for seq in self.numbers():
+            yield seq, self.read_bytes(seq)
+
+    def close(self):
+        self._zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
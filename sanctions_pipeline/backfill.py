@@ -0,0 +1,246 @@
+"""
+Backfills over archived publications with one coordinator and many workers.
+
+``submit`` queues one ``prepare`` task per publication folder in a
+``workqueue.WorkQueue``.  Workers, on any machine that can reach the queue
+file and the work directory, then take tasks in this order:
+
+* ``prepare`` splits the XML feed into the chunk archive and extracts the PDF
+  chunks under ``<work dir>/<run>/``.  It then queues one ``enrich`` task per
+  range of ``chunk_size`` entities;
+* ``enrich`` runs ``partitions.enrich_partition`` over its range and writes
+  ``parts/<first>-<last>.json``.  The worker that finishes a run's last range
+  queues its ``merge``;
+* ``merge`` combines the parts in entity order, matches REM2 against the PDF
+  and publishes ``sanctions_output.*`` for the run.  The output is the same as
+  a plain ``convert`` of that publication.
+
+Every task writes its files atomically under fixed names, so a task that is
+retried after an expired lease gives the same result.
+"""
+import os
+import re
+import socket
+import threading
+import time
+from pathlib import Path
+
+from .config import DataPaths
+from .workqueue import WorkQueue
+
+PRIORITIES = {"merge": 0, "enrich": 1, "prepare": 2}
+HANDLERS = {}
+
+
+def task_handler(kind):
+    """Register ``func(task, queue) -> (result, then)`` for ``kind``; see ``WorkQueue.complete``."""
+    def decorator(func):
+        HANDLERS[kind] = func
+        return func
+    return decorator
+
+
+def run_name(folder):
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", Path(folder).name) or "run"
+
+
+def publication_inputs(folder):
+    """The XML feed and PDF of an archived publication: in ``folder`` or its ``xml_files``/``pdf`` folders."""
+    from .pipeline import latest_file
+
+    folder = Path(folder)
+    xml_file = latest_file(folder, ".xml") or latest_file(folder / "xml_files", ".xml")
+    pdf_file = latest_file(folder, ".pdf") or latest_file(folder / "pdf", ".pdf")
+    return xml_file, pdf_file
+
+
+def submit(queue_path, folders, work_dir, chunk_size=500, formats=("xlsx",), max_attempts=3):
+    """Queue a ``prepare`` task for each publication folder; already queued runs are left alone."""
+    work_dir = Path(work_dir).resolve()
+    added = 0
+    with WorkQueue(queue_path) as queue:
+        for folder in folders:
+            xml_file, pdf_file = publication_inputs(folder)
+            if xml_file is None:
+                print(f"⚠️ No XML feed in {folder}, skipped")
+                continue
+            run = run_name(folder)
+            payload = {
+                "xml": str(xml_file.resolve()),
+                "pdf": str(pdf_file.resolve()) if pdf_file else None,
+                "work_dir": str(work_dir / run),
+                "chunk_size": chunk_size,
+                "formats": list(formats),
+                "max_attempts": max_attempts,
+            }
+            if queue.add(run, "prepare", "", payload, PRIORITIES["prepare"], max_attempts):
+                added += 1
+                print(f"📥 Queued {run}: {xml_file.name}" + (f" + {pdf_file.name}" if pdf_file else ""))
+            else:
+                print(f"⏭️ {run} is already queued")
+    print(f"✅ {added} publication(s) queued in {queue_path}")
+    return added
+
+
+@task_handler("prepare")
+def prepare(task, queue):
+    from .artifacts import ChunkArchive
+    from .pdf_text import extract_text_from_pdf, save_text_entities, split_entities_from_text
+    from .xml_split import split_xml_entities
+
+    p = task.payload
+    paths = DataPaths(Path(p["work_dir"]))
+    paths.parent_dir.mkdir(parents=True, exist_ok=True)
+    split_xml_entities(p["xml"], paths.xml_chunks_archive)
+    if p["pdf"]:
+        save_text_entities(split_entities_from_text(extract_text_from_pdf(p["pdf"])), paths.pdf_chunks_archive)
+
+    with ChunkArchive(paths.xml_chunks_archive) as archive:
+        seqs = archive.numbers()
+    size = max(1, p["chunk_size"])
+    ranges = [(seqs[i], seqs[min(i + size, len(seqs)) - 1]) for i in range(0, len(seqs), size)]
+
+    def then(queue):
+        for first, last in ranges:
+            queue.add(task.run, "enrich", f"{first:08d}-{last:08d}", {**p, "first": first, "last": last},
+                      PRIORITIES["enrich"], p["max_attempts"])
+        if not ranges:
+            queue.add(task.run, "merge", "", p, PRIORITIES["merge"], p["max_attempts"])
+
+    return {"entities": len(seqs), "ranges": len(ranges)}, then
+
+
+@task_handler("enrich")
+def enrich(task, queue):
+    from .artifacts import ChunkArchive
+    from .partitions import enrich_partition, write_json
+
+    p = task.payload
+    paths = DataPaths(Path(p["work_dir"]))
+    with ChunkArchive(paths.xml_chunks_archive) as archive:
+        seqs = [seq for seq in archive.numbers() if p["first"] <= seq <= p["last"]]
+    part = enrich_partition(paths.xml_chunks_archive, seqs)
+    parts_dir = paths.parent_dir / "parts"
+    parts_dir.mkdir(exist_ok=True)
+    out_path = parts_dir / f"{task.key}.json"
+    write_json(out_path, {"seqs": seqs, **part})
+
+    def then(queue):
+        if queue.unfinished(task.run, "enrich") == 0:
+            queue.add(task.run, "merge", "", p, PRIORITIES["merge"], p["max_attempts"])
+
+    return {"path": str(out_path), "rows": len(seqs)}, then
+
+
+@task_handler("merge")
+def merge(task, queue):
+    import json
+
+    from .conversion import build_pdf_rem2_mapping
+    from .exporters import publish_table
+    from .partitions import combine_parts, finish_table
+
+    p = task.payload
+    paths = DataPaths(Path(p["work_dir"]))
+    parts = []
+    for _, result in queue.results(task.run, "enrich"):
+        path = result["path"]
+        with open(path, encoding="utf-8") as f:
+            part = json.load(f)
+        parts.append((part["seqs"], part))
+    _, columns, flags = combine_parts(parts)
+    pdf_mapping = build_pdf_rem2_mapping(paths.pdf_chunks_archive)
+    table = finish_table(columns, flags, pdf_mapping)
+    written = publish_table(table, p["formats"], paths.xlsx_path, pdf_mapping)
+    return {"rows": len(table), "outputs": {fmt: str(path) for fmt, path in written.items()}}, None
+
+
+class _LeaseKeeper(threading.Thread):
+    """Renews a task's lease every third of its length, on its own connection."""
+
+    def __init__(self, queue_path, task, owner, lease_s):
+        super().__init__(daemon=True)
+        self.args = (queue_path, task, owner, lease_s)
+        self.stopped = threading.Event()
+
+    def run(self):
+        queue_path, task, owner, lease_s = self.args
+        with WorkQueue(queue_path) as queue:
+            while not self.stopped.wait(lease_s / 3):
+                if not queue.renew(task, owner, lease_s):
+                    return
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stopped.set()
+        self.join()
+
+
+def work(queue_path, worker_id=None, lease_s=300.0, wait=False, poll_s=5.0, max_tasks=None):
+    """
+    Claim and run tasks until the queue has nothing pending or leased (or, with
+    ``wait``, forever).  Returns the number of tasks completed.
+    """
+    owner = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    done = 0
+    with WorkQueue(queue_path) as queue:
+        while max_tasks is None or done < max_tasks:
+            task = queue.claim(owner, lease_s)
+            if task is None:
+                # Other workers' leases may still expire or queue follow-ups.
+                if wait or queue.active():
+                    time.sleep(poll_s)
+                    continue
+                break
+
+            label = f"{task.kind} {task.run}" + (f" {task.key}" if task.key else "")
+            print(f"🔧 {owner}: {label} (attempt {task.attempts})")
+            start = time.perf_counter()
+            with _LeaseKeeper(queue_path, task, owner, lease_s):
+                try:
+                    result, then = HANDLERS[task.kind](task, queue)
+                except Exception as e:
+                    queue.fail(task, owner, f"{type(e).__name__}: {e}")
+                    print(f"❌ {owner}: {label} failed: {e}")
+                    continue
+            if queue.complete(task, owner, result, then):
+                done += 1
+                print(f"✅ {owner}: {label} done in {time.perf_counter() - start:.2f}s")
+            else:
+                print(f"⚠️ {owner}: lease on {label} was lost, result discarded")
+    print(f"🏁 {owner}: {done} task(s) completed")
+    return done
+
+
+def _work_process(queue_path, worker_id, lease_s, wait, poll_s):
+    return work(queue_path, worker_id, lease_s, wait, poll_s)
+
+
+def work_local(queue_path, processes, lease_s=300.0, wait=False, poll_s=5.0):
+    """Run ``processes`` workers on this machine; returns the tasks completed by all of them."""
+    if processes <= 1:
+        return work(queue_path, lease_s=lease_s, wait=wait, poll_s=poll_s)
+    from concurrent.futures import ProcessPoolExecutor
+
+    host = socket.gethostname()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_work_process, queue_path, f"{host}:{os.getpid()}.{i}", lease_s, wait, poll_s)
+                   for i in range(processes)]
+        return sum(f.result() for f in futures)
+
+
+def print_status(queue_path):
+    with WorkQueue(queue_path) as queue:
+        counts, failures = queue.summary()
+        for run, kinds in counts.items():
+            merged = queue.results(run, "merge")
+            state = ", ".join(f"{kind} " + "/".join(f"{n} {s}" for s, n in states.items())
+                              for kind, states in kinds.items())
+            rows = f" → {merged[0][1]['rows']} rows" if merged else ""
+            print(f" - {run}: {state}{rows}")
+    for run, kind, key, attempts, error in failures:
+        print(f"❌ {run} {kind} {key} failed after {attempts} attempt(s): {error}")
+    return counts
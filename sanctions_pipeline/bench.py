@@ -0,0 +1,382 @@
+"""
+Performance measurements that are tracked over time.
+
+Results are printed and appended as one JSON line per measurement to
+``<data dir>/benchmarks/<name>.jsonl`` so regressions show up between runs.
+"""
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+from . import __version__
+
+# Dependencies that must never be loaded just to start the CLI.
+HEAVY_MODULES = ("pandas", "pdfplumber", "playwright", "openpyxl", "regex", "gender_guesser", "requests", "lxml")
+
+STARTUP_COMMANDS = (
+    (),
+    ("run",),
+    ("download",),
+    ("split",),
+    ("convert",),
+    ("watch",),
+    ("merge",),
+    ("serve",),
+    ("check",),
+    ("show",),
+    ("backfill", "status"),
+    ("bench", "startup"),
+    ("bench", "parse"),
+    ("bench", "split"),
+    ("bench", "pdf"),
+    ("bench", "xlsx"),
+)
+
+
+def record_result(paths, name, result):
+    out_dir = paths.parent_dir / "benchmarks"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    entry = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(terse=True),
+        **result,
+    }
+    out_path = out_dir / f"{name}.jsonl"
+    with open(out_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return out_path
+
+
+def _cli_prefix():
+    if getattr(sys, "frozen", False):
+        return [sys.executable]
+    return [sys.executable, "-m", "sanctions_pipeline"]
+
+
+def _heavy_modules_after_parse(args):
+    # Commands with required arguments make argparse exit; the imports are what count.
+    probe = (
+        "import contextlib, io, sys\n"
+        "from sanctions_pipeline.cli import build_parser\n"
+        "with contextlib.suppress(SystemExit), contextlib.redirect_stderr(io.StringIO()):\n"
+        f"    build_parser().parse_known_args({list(args)!r})\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True)
+    return [m for m in out.stdout.strip().split(",") if m]
+
+
+def measure_startup(paths, repeat=5, record=True):
+    """Time ``<command> --help`` in a fresh interpreter for every subcommand."""
+    print(f"⏱️ Measuring start-up time ({repeat} runs per command)...")
+    results = {}
+    for command in STARTUP_COMMANDS:
+        argv = [*_cli_prefix(), *command, "--help"]
+        timings = []
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            timings.append(time.perf_counter() - start)
+
+        label = " ".join(command) or "(none)"
+        heavy = [] if getattr(sys, "frozen", False) else _heavy_modules_after_parse(command)
+        results[label] = {
+            "median_ms": round(statistics.median(timings) * 1000, 1),
+            "min_ms": round(min(timings) * 1000, 1),
+            "heavy_modules": heavy,
+        }
+        warn = f"  ⚠️ loads {', '.join(heavy)}" if heavy else ""
+        print(f" - {label:<16} median {results[label]['median_ms']:>7.1f} ms"
+              f"   min {results[label]['min_ms']:>7.1f} ms{warn}")
+
+    if record:
+        out_path = record_result(paths, "startup", {"repeat": repeat, "commands": results})
+        print(f"✅ Start-up timings appended to: {out_path}")
+    return results
+
+
+def _available_backends():
+    from .xmlbackend import BACKENDS, get_backend
+
+    backends = []
+    for name in BACKENDS:
+        try:
+            backends.append(get_backend(name))
+        except RuntimeError:
+            print(f"⚠️ {name} backend not available, skipped")
+    return backends
+
+
+def measure_parse(paths, xml_file, repeat=3, record=True):
+    """
+    Time the travel-ban feed through every available XML backend: ``parse``
+    streams the entities and runs all field lookups, ``rows`` also builds the
+    output rows.  The PDF mapping and gender dictionary are loaded up front so
+    only XML work is timed.
+    """
+    import contextlib
+    import io
+
+    from .conversion import build_pdf_rem2_mapping, get_gender_detector
+    from .sources.base import iter_elements, namespace_of
+    from .sources.eu import ENTITY_FIELDS, EUTravelBanAdapter, entity_queries
+
+    pdf_mapping = build_pdf_rem2_mapping(paths.pdf_chunks_archive) if paths.pdf_chunks_archive.exists() else {}
+    detector = get_gender_detector()
+    size_mb = xml_file.stat().st_size / 1e6
+    print(f"⏱️ XML parse throughput on {xml_file} ({size_mb:.1f} MB), best of {repeat}")
+
+    def parse_only(backend):
+        count = 0
+        for entity in iter_elements(xml_file, "sanctionEntity", backend=backend):
+            queries = entity_queries(backend, namespace_of(entity))
+            for attr in ENTITY_FIELDS:
+                getattr(queries, attr)(entity)
+            count += 1
+        return count
+
+    def rows(backend):
+        adapter = EUTravelBanAdapter(pdf_mapping=pdf_mapping, detector=detector)
+        adapter.backend = backend
+        with contextlib.redirect_stdout(io.StringIO()):
+            return sum(1 for _ in adapter.iter_records(xml_file))
+
+    results = {}
+    for backend in _available_backends():
+        entry = {}
+        for label, func in (("parse", parse_only), ("rows", rows)):
+            timings = []
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                count = func(backend)
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            entry[label] = {
+                "entities": count,
+                "best_s": round(best, 3),
+                "entities_per_s": round(count / best, 1) if best else None,
+                "mb_per_s": round(size_mb / best, 2) if best else None,
+            }
+        results[backend.name] = entry
+        print(f" - {backend.name:<6} parse {entry['parse']['entities_per_s']:>9.0f} entities/s"
+              f"   rows {entry['rows']['entities_per_s']:>9.0f} entities/s")
+
+    if {"lxml", "etree"} <= results.keys():
+        for label in ("parse", "rows"):
+            ratio = results["etree"][label]["best_s"] / results["lxml"][label]["best_s"]
+            print(f"   lxml {label} speed-up: {ratio:.2f}x")
+
+    if record:
+        out_path = record_result(paths, "parse", {"xml": str(xml_file), "size_mb": round(size_mb, 2),
+                                                  "repeat": repeat, "backends": results})
+        print(f"✅ Parse timings appended to: {out_path}")
+    return results
+
+
+def measure_split(paths, xml_file, workers=None, repeat=3, record=True):
+    """
+    Time the XML split with 1 (the single whole-feed parse) and more processes
+    parsing byte ranges of the mapped feed.  Each archive is compared member by
+    member with the single-process one.
+    """
+    import contextlib
+    import io
+    import os
+    import tempfile
+    import zipfile
+    from pathlib import Path
+
+    from .xml_split import split_xml_entities
+
+    if workers is None:
+        workers = [1]
+        while workers[-1] < max(2, os.cpu_count() or 1):
+            workers.append(workers[-1] * 2)
+    workers = sorted(set(workers) | {1})
+    size_mb = xml_file.stat().st_size / 1e6
+    print(f"⏱️ XML split on {xml_file} ({size_mb:.1f} MB), {os.cpu_count()} CPU(s), best of {repeat}")
+
+    def members(path):
+        with zipfile.ZipFile(path) as zf:
+            return [(info.filename, info.comment, zf.read(info)) for info in zf.infolist()]
+
+    results = {}
+    reference = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in workers:
+            archive = Path(tmp) / f"split_{n}.zip"
+            timings = []
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    count = split_xml_entities(xml_file, archive, workers=n)
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            chunks = members(archive)
+            if reference is None:
+                reference = chunks
+            entry = {
+                "entities": count,
+                "best_s": round(best, 3),
+                "entities_per_s": round(count / best, 1) if best else None,
+                "mb_per_s": round(size_mb / best, 2) if best else None,
+                "same_chunks": chunks == reference,
+            }
+            results[n] = entry
+            verdict = "" if n == 1 else ("   identical" if entry["same_chunks"] else "   DIFFERENT chunks")
+            speedup = results[1]["best_s"] / best if best else 0
+            print(f" - {n:>2} process(es) {entry['entities_per_s']:>9.0f} entities/s   {speedup:.2f}x{verdict}")
+
+    if record:
+        out_path = record_result(paths, "split", {"xml": str(xml_file), "size_mb": round(size_mb, 2),
+                                                  "cpus": os.cpu_count(), "repeat": repeat,
+                                                  "workers": {str(n): e for n, e in results.items()}})
+        print(f"✅ Split timings appended to: {out_path}")
+    return results
+
+
+def measure_pdf(paths, pdf_file, repeat=1, record=True):
+    """
+    Extract ``pdf_file`` with every PDF backend and report pages per second.
+    Each backend's entity chunks and REM2 mapping are compared with the
+    default backend's, which is what ``split`` would produce today.
+    """
+    import contextlib
+    import io
+
+    from .conversion import pdf_rem2_mapping
+    from .pdf_text import DEFAULT_PDF_BACKEND, PDF_BACKENDS, iter_page_texts, split_entities_from_text
+
+    size_mb = pdf_file.stat().st_size / 1e6
+    print(f"⏱️ PDF text extraction on {pdf_file} ({size_mb:.1f} MB), best of {repeat}")
+
+    results = {}
+    reference = None
+    for name in PDF_BACKENDS:
+        timings = []
+        try:
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                pages = list(iter_page_texts(pdf_file, name))
+                timings.append(time.perf_counter() - start)
+        except RuntimeError as e:
+            print(f"⚠️ {e}, skipped")
+            continue
+        text = "".join(t + "\n" for t in pages if t)
+        with contextlib.redirect_stdout(io.StringIO()):
+            entities = split_entities_from_text(text)
+        chunks = [(e["programme"], e["text"]) for e in entities]
+        mapping = pdf_rem2_mapping(text for _, text in chunks)
+        best = min(timings)
+        entry = {
+            "pages": len(pages),
+            "best_s": round(best, 3),
+            "pages_per_s": round(len(pages) / best, 1) if best else None,
+            "chunks": len(chunks),
+            "rem2_keys": len(mapping),
+        }
+        if name == DEFAULT_PDF_BACKEND:
+            reference = (chunks, mapping)
+        if reference is not None:
+            ref_chunks, ref_mapping = reference
+            entry["same_chunks"] = chunks == ref_chunks
+            entry["same_rem2"] = mapping == ref_mapping
+            entry["first_chunk_diff"] = next(
+                (i + 1 for i, (a, b) in enumerate(zip(ref_chunks, chunks)) if a != b),
+                None if len(chunks) == len(ref_chunks) else min(len(chunks), len(ref_chunks)) + 1)
+            entry["rem2_diff_keys"] = sum(1 for k in ref_mapping.keys() | mapping.keys()
+                                          if ref_mapping.get(k) != mapping.get(k))
+        results[name] = entry
+
+        verdict = ""
+        if reference is not None and name != DEFAULT_PDF_BACKEND:
+            if entry["same_chunks"] and entry["same_rem2"]:
+                verdict = f"   identical to {DEFAULT_PDF_BACKEND}"
+            else:
+                verdict = (f"   differs from {DEFAULT_PDF_BACKEND}: first chunk {entry['first_chunk_diff']}, "
+                           f"{entry['rem2_diff_keys']} REM2 key(s)")
+        print(f" - {name:<10} {entry['pages_per_s']:>8.1f} pages/s   {entry['chunks']} chunks{verdict}")
+
+    if DEFAULT_PDF_BACKEND in results:
+        base = results[DEFAULT_PDF_BACKEND]["best_s"]
+        for name, entry in results.items():
+            if name != DEFAULT_PDF_BACKEND and entry["best_s"]:
+                print(f"   {name} speed-up: {base / entry['best_s']:.2f}x")
+
+    if record:
+        out_path = record_result(paths, "pdf", {"pdf": str(pdf_file), "size_mb": round(size_mb, 2),
+                                                "repeat": repeat, "backends": results})
+        print(f"✅ PDF timings appended to: {out_path}")
+    return results
+
+
+def measure_xlsx(paths, generate=None, seed=1, repeat=3, record=True):
+    """
+    Write the same output with per-cell fills (``cells``, the previous
+    rendering) and with the status column and conditional-formatting rules
+    (``rules``).  Reports save time, file size and full ``load_workbook``
+    time.  The table is converted from the last run's chunks, or from a
+    synthetic corpus of ``generate`` entities.
+    """
+    import contextlib
+    import io
+    import tempfile
+    from pathlib import Path
+
+    from openpyxl import load_workbook
+
+    from .conversion import build_pdf_rem2_mapping
+    from .excel import HIGHLIGHT_MODES, write_workbook
+    from .sources.eu import EUTravelBanAdapter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        if generate:
+            from .synthetic import generate_corpus
+
+            xml_archive, pdf_archive = tmp / "xml_chunks.zip", tmp / "pdf_text_chunks.zip"
+            generate_corpus(generate, xml_archive, pdf_archive, seed=seed)
+        else:
+            xml_archive, pdf_archive = paths.xml_chunks_archive, paths.pdf_chunks_archive
+            if not xml_archive.exists():
+                raise FileNotFoundError(f"{xml_archive} not found; run the pipeline first or use --generate N")
+        with contextlib.redirect_stdout(io.StringIO()):
+            pdf_mapping = build_pdf_rem2_mapping(pdf_archive)
+            table = EUTravelBanAdapter(pdf_mapping=pdf_mapping).build_table(xml_archive)
+        print(f"⏱️ XLSX save and load, {len(table)} rows, best of {repeat}")
+
+        results = {}
+        for mode in HIGHLIGHT_MODES:
+            out_path = tmp / f"{mode}.xlsx"
+            save, load = [], []
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                write_workbook(table, out_path, highlight=mode)
+                save.append(time.perf_counter() - start)
+                start = time.perf_counter()
+                load_workbook(out_path).close()
+                load.append(time.perf_counter() - start)
+            results[mode] = {
+                "save_s": round(min(save), 3),
+                "load_s": round(min(load), 3),
+                "size_kb": round(out_path.stat().st_size / 1024, 1),
+            }
+            entry = results[mode]
+            print(f" - {mode:<6} save {entry['save_s']:>7.3f}s   load {entry['load_s']:>7.3f}s   "
+                  f"{entry['size_kb']:>9.1f} KB")
+
+    cells, rules = results["cells"], results["rules"]
+    print(f"   rules vs cells: save {cells['save_s'] / rules['save_s']:.2f}x, "
+          f"load {cells['load_s'] / rules['load_s']:.2f}x, size {rules['size_kb'] / cells['size_kb']:.0%}")
+
+    if record:
+        out_path = record_result(paths, "xlsx", {"rows": len(table), "generated": generate, "repeat": repeat,
+                                                 "modes": results})
+        print(f"✅ XLSX timings appended to: {out_path}")
+    return results
@@ -0,0 +1,68 @@
+"""
+Building blocks shared by the binary files the pipeline publishes (the name
+index and the run snapshot): little-endian integer arrays and string tables.
+
+A string table is an offset array (u64, one more entry than strings) plus
+the concatenated bytes.  Readers memory-map the file and wrap each section
+with ``typed_section``; ``Strings`` decodes items on access.
+"""
+import sys
+from array import array
+
+
+def le_bytes(values, typecode):
+    """``values`` as a little-endian ``array`` of ``typecode``."""
+    arr = array(typecode, values)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def string_table(strings):
+    """``(offsets, blob)`` for byte strings; sort them first if readers bisect."""
+    offsets = [0]
+    for s in strings:
+        offsets.append(offsets[-1] + len(s))
+    return le_bytes(offsets, "Q"), b"".join(strings)
+
+
+def typed_section(part, typecode):
+    """A little-endian array section as an indexable view of ``typecode`` items."""
+    if sys.byteorder == "little":
+        return part.cast(typecode)
+    arr = array(typecode, part.tobytes())
+    arr.byteswap()
+    return arr
+
+
+class Strings:
+    """Sequence view of a string table; items are decoded on access."""
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def raw(self, i):
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.raw(i).decode("utf-8")
+
+    def bisect_left(self, key):
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.raw(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find(self, key):
+        pos = self.bisect_left(key)
+        return pos if pos < len(self) and self.raw(pos) == key else None
@@ -0,0 +1,135 @@
+"""
+Stage manifests for resumable runs.
+
+After every stage a JSON manifest is written to ``<data>/manifests/<stage>.json``
+recording the SHA-256 of its inputs and outputs, its parameters and whether it
+completed.  With ``resume=True`` a stage is skipped when its last manifest is
+complete, the inputs still hash the same, the parameters match and every
+output is still on disk unchanged.
+"""
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .artifacts import temp_path
+from .pipeline import file_sha256
+
+MANIFEST_VERSION = 1
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def manifest_path(paths, stage):
+    return paths.manifests_dir / f"{stage}.json"
+
+
+def load_manifest(paths, stage):
+    try:
+        with open(manifest_path(paths, stage), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def completed_since(paths, stage, earlier_stage):
+    """
+    Whether ``stage`` completed at or after the last run of ``earlier_stage``,
+    i.e. the run that started with ``earlier_stage`` got through ``stage``.
+    """
+    manifest = load_manifest(paths, stage)
+    earlier = load_manifest(paths, earlier_stage)
+    if not manifest or manifest.get("status") != "complete" or not earlier:
+        return False
+    return manifest.get("checked_at", manifest["completed_at"]) >= earlier["completed_at"]
+
+
+def _hash_files(files):
+    return {name: {"path": str(path), "sha256": file_sha256(path)} for name, path in files.items()}
+
+
+def manifest_is_valid(manifest, input_hashes, params):
+    if not manifest or manifest.get("version") != MANIFEST_VERSION:
+        return False
+    if manifest.get("status") != "complete":
+        return False
+    if manifest.get("params") != params:
+        return False
+    if manifest.get("inputs") != input_hashes:
+        return False
+    for entry in manifest.get("outputs", {}).values():
+        path = entry["path"]
+        if not os.path.isfile(path) or file_sha256(path) != entry["sha256"]:
+            return False
+    return True
+
+
+def write_manifest(paths, stage, status, inputs, outputs=None, params=None, result=None,
+                   duration_s=None, error=None):
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "stage": stage,
+        "status": status,
+        "completed_at": _now(),
+        "duration_s": duration_s,
+        "params": params or {},
+        "inputs": inputs,
+        "outputs": outputs or {},
+        "result": result or {},
+        "error": error,
+    }
+    return _save(paths, stage, manifest)
+
+
+def _save(paths, stage, manifest):
+    out_path = manifest_path(paths, stage)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = temp_path(out_path)
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, out_path)
+    return manifest
+
+
+def run_stage(paths, stage, inputs, func, resume=False, params=None):
+    """
+    Run ``func`` unless ``resume`` is set and the stage's manifest is still valid.
+
+    ``inputs`` maps names to files; ``func`` returns ``(outputs, result)`` where
+    ``outputs`` maps names to the files it wrote (``None`` for an output it could
+    not produce, which marks the stage incomplete) and ``result`` is a small
+    JSON-able dict handed back to later stages.  Returns the manifest.
+    """
+    params = params or {}
+    input_hashes = _hash_files({name: Path(p) for name, p in inputs.items() if p})
+
+    if resume:
+        manifest = load_manifest(paths, stage)
+        if manifest_is_valid(manifest, input_hashes, params):
+            print(f"⏭️ Skipping {stage}: unchanged since {manifest['completed_at']}")
+            # A skipped stage still counts as reached by this run (see ``completed_since``).
+            manifest["checked_at"] = _now()
+            _save(paths, stage, manifest)
+            manifest["skipped"] = True
+            return manifest
+
+    start = time.perf_counter()
+    try:
+        outputs, result = func()
+    except Exception as e:
+        write_manifest(paths, stage, "failed", input_hashes, params=params,
+                       duration_s=round(time.perf_counter() - start, 3), error=str(e))
+        raise
+
+    produced = {name: Path(p) for name, p in outputs.items() if p and Path(p).exists()}
+    status = "complete" if len(produced) == len(outputs) else "incomplete"
+    return write_manifest(paths, stage, status, input_hashes, outputs=_hash_files(produced), params=params,
+                          result=result, duration_s=round(time.perf_counter() - start, 3))
+
+
+def output_path(manifest, name):
+    entry = manifest.get("outputs", {}).get(name)
+    return Path(entry["path"]) if entry else None
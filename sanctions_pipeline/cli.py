@@ -0,0 +1,341 @@
+"""
+Command-line interface.
+
+Only ``argparse`` and the light ``config``/``pipeline`` modules are imported
+here; every subcommand pulls in its heavy dependencies when it runs.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from . import __version__
+from .config import OUTPUT_FORMATS, default_paths
+
+
+def _formats(value):
+    formats = [f.strip().lower() for f in value.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in OUTPUT_FORMATS]
+    if unknown or not formats:
+        raise argparse.ArgumentTypeError(
+            f"unknown format(s) {', '.join(unknown) or '(none)'}; choose from {', '.join(OUTPUT_FORMATS)}")
+    return formats
+
+
+def _counts(value):
+    try:
+        counts = [int(n) for n in value.split(",") if n.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated numbers, got {value!r}") from None
+    if not counts or min(counts) < 1:
+        raise argparse.ArgumentTypeError("process counts must be at least 1")
+    return counts
+
+
+def _add_formats_argument(p):
+    p.add_argument("--formats", type=_formats, default=["xlsx"],
+                   help=f"comma-separated outputs: {', '.join(OUTPUT_FORMATS)} (default: xlsx)")
+
+
+def _local_sources(paths, args):
+    from .pipeline import latest_file
+
+    xml_file = args.xml or latest_file(paths.xml_folder, ".xml")
+    pdf_file = args.pdf or latest_file(paths.pdf_folder, ".pdf")
+    return xml_file, pdf_file
+
+
+def cmd_run(args, paths):
+    from .pipeline import run_all
+
+    run_all(paths, xml_file=args.xml, pdf_file=args.pdf, formats=args.formats, resume=args.resume,
+            workers=args.workers)
+
+
+def cmd_download(args, paths):
+    from .pipeline import download_stage
+
+    xml_file, pdf_file = download_stage(paths)
+    print(f"- XML file: {xml_file if xml_file else 'none'}")
+    print(f"- PDF: {pdf_file if pdf_file else 'none'}")
+
+
+def cmd_split(args, paths):
+    from .pipeline import split_all
+
+    xml_file, pdf_file = _local_sources(paths, args)
+    split_all(paths, xml_file, pdf_file, workers=args.workers)
+
+
+def cmd_convert(args, paths):
+    from .pipeline import convert_stage
+
+    convert_stage(paths, args.formats, by_programme=args.by_programme, workers=args.workers)
+
+
+def cmd_watch(args, paths):
+    from .daemon import watch
+
+    run = watch(paths, interval=args.interval, port=args.port, formats=args.formats, once=args.once)
+    if args.once and run["error"]:
+        raise RuntimeError(f"watch cycle failed: {run['error']}")
+
+
+def cmd_check(args, paths):
+    from .equivalence import check_synthetic, run_check
+
+    engines = args.engine or ["current"]
+    if args.generate:
+        ok = check_synthetic(args.generate, seed=args.seed, engines=engines, keep_dir=args.keep)
+    else:
+        xml_chunks = args.xml_chunks or paths.xml_chunks_archive
+        pdf_chunks = args.pdf_chunks or paths.pdf_chunks_archive
+        if not Path(xml_chunks).exists():
+            raise FileNotFoundError(f"{xml_chunks} not found; run the pipeline first or use --generate N")
+        ok = run_check(xml_chunks, pdf_chunks, engines=engines)
+    if not ok:
+        raise RuntimeError("engines disagree with the legacy conversion")
+
+
+def cmd_serve(args, paths):
+    from .lookup import serve
+
+    serve(paths, port=args.port, reload_interval=args.reload_interval)
+
+
+def cmd_merge(args, paths):
+    from .sources.engine import merge_sources
+
+    merge_sources(paths, args.sources, formats=args.formats, workers=args.workers)
+
+
+def cmd_show(args, paths):
+    from .artifacts import ChunkArchive
+
+    archive_path = paths.xml_chunks_archive if args.kind == "xml" else paths.pdf_chunks_archive
+    with ChunkArchive(archive_path) as archive:
+        if args.number not in archive:
+            raise LookupError(f"entity {args.number} not in {archive_path} ({len(archive)} entities)")
+        programme = archive.programme(args.number)
+        if programme:
+            print(f"# programme: {programme}")
+        print(archive.get(args.number))
+
+
+def cmd_bench_startup(args, paths):
+    from .bench import measure_startup
+
+    measure_startup(paths, repeat=args.repeat, record=not args.no_record)
+
+
+def cmd_bench_parse(args, paths):
+    from .bench import measure_parse
+    from .pipeline import latest_file
+
+    xml_file = args.xml or latest_file(paths.xml_folder, ".xml")
+    if not xml_file:
+        raise FileNotFoundError(f"no XML feed in {paths.xml_folder}; pass --xml")
+    measure_parse(paths, Path(xml_file), repeat=args.repeat, record=not args.no_record)
+
+
+def cmd_bench_split(args, paths):
+    from .bench import measure_split
+    from .pipeline import latest_file
+
+    xml_file = args.xml or latest_file(paths.xml_folder, ".xml")
+    if not xml_file:
+        raise FileNotFoundError(f"no XML feed in {paths.xml_folder}; pass --xml")
+    measure_split(paths, Path(xml_file), workers=args.workers, repeat=args.repeat, record=not args.no_record)
+
+
+def cmd_bench_pdf(args, paths):
+    from .bench import measure_pdf
+    from .pipeline import latest_file
+
+    pdf_file = args.pdf or latest_file(paths.pdf_folder, ".pdf")
+    if not pdf_file:
+        raise FileNotFoundError(f"no PDF in {paths.pdf_folder}; pass --pdf")
+    measure_pdf(paths, Path(pdf_file), repeat=args.repeat, record=not args.no_record)
+
+
+def cmd_bench_xlsx(args, paths):
+    from .bench import measure_xlsx
+
+    measure_xlsx(paths, generate=args.generate, seed=args.seed, repeat=args.repeat, record=not args.no_record)
+
+
+def cmd_backfill_submit(args, paths):
+    from .backfill import submit
+
+    submit(args.queue, args.publications, args.work_dir or paths.parent_dir / "backfill",
+           chunk_size=args.chunk_size, formats=args.formats, max_attempts=args.max_attempts)
+
+
+def cmd_backfill_worker(args, paths):
+    from .backfill import work, work_local
+
+    if args.processes > 1:
+        work_local(args.queue, args.processes, lease_s=args.lease, wait=args.wait, poll_s=args.poll)
+    else:
+        work(args.queue, worker_id=args.id, lease_s=args.lease, wait=args.wait, poll_s=args.poll,
+             max_tasks=args.max_tasks)
+
+
+def cmd_backfill_status(args, paths):
+    from .backfill import print_status
+
+    print_status(args.queue)
+
+
+def cmd_backfill_retry(args, paths):
+    from .workqueue import WorkQueue
+
+    with WorkQueue(args.queue) as queue:
+        print(f"🔁 {queue.retry_failed(args.run)} failed task(s) queued again")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="sanctions-pipeline",
+        description="Download, split and convert the EU travel-ban sanctions list.",
+    )
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    parser.add_argument("--data-dir", type=Path, default=None,
+                        help="output folder (default: data/ next to the program)")
+    sub = parser.add_subparsers(dest="command", metavar="COMMAND")
+
+    p = sub.add_parser("run", help="download, split and convert (default)")
+    p.add_argument("--xml", type=Path, help="use a local XML feed instead of downloading")
+    p.add_argument("--pdf", type=Path, help="use a local PDF instead of downloading")
+    p.add_argument("--resume", action="store_true",
+                   help="skip stages whose manifest shows they already completed on the same inputs")
+    p.add_argument("--workers", type=int, help="processes that parse byte ranges of the XML feed (default: 1, a single parse)")
+    _add_formats_argument(p)
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser("download", help="only fetch the XML feed and PDF")
+    p.set_defaults(func=cmd_download)
+
+    p = sub.add_parser("split", help="split local XML/PDF into entity chunks")
+    p.add_argument("--xml", type=Path, help="XML feed (default: newest in data/xml_files)")
+    p.add_argument("--pdf", type=Path, help="PDF (default: newest in data/pdf)")
+    p.add_argument("--workers", type=int, help="processes that parse byte ranges of the XML feed (default: 1, a single parse)")
+    p.set_defaults(func=cmd_split)
+
+    p = sub.add_parser("convert", help="build the outputs from existing chunks")
+    _add_formats_argument(p)
+    p.add_argument("--by-programme", action="store_true",
+                   help="enrich per programme with cached partitions and also write data/programmes/")
+    p.add_argument("--workers", type=int, help="processes for --by-programme (default: one per stale partition)")
+    p.set_defaults(func=cmd_convert)
+
+    p = sub.add_parser("watch", help="keep running, re-process only when the sources change")
+    p.add_argument("--interval", type=int, default=900, help="seconds between polls (default: 900)")
+    p.add_argument("--port", type=int, default=8765, help="status endpoint port on 127.0.0.1 (default: 8765)")
+    p.add_argument("--once", action="store_true", help="run a single poll cycle and exit")
+    _add_formats_argument(p)
+    p.set_defaults(func=cmd_watch)
+
+    p = sub.add_parser("check", help="compare conversion engines with the legacy conversion")
+    p.add_argument("--generate", type=int, metavar="N", help="use a synthetic corpus of N entities")
+    p.add_argument("--seed", type=int, default=1, help="synthetic corpus seed (default: 1)")
+    p.add_argument("--keep", type=Path, metavar="DIR", help="write the synthetic archives to DIR")
+    p.add_argument("--xml-chunks", type=Path, help="XML chunk archive (default: the last run's)")
+    p.add_argument("--pdf-chunks", type=Path, help="PDF chunk archive (default: the last run's)")
+    p.add_argument("--engine", action="append", help="engine to check, repeatable (default: current)")
+    p.set_defaults(func=cmd_check)
+
+    p = sub.add_parser("serve", help="answer name lookups over HTTP on 127.0.0.1 from the latest output")
+    p.add_argument("--port", type=int, default=8766, help="port on 127.0.0.1 (default: 8766)")
+    p.add_argument("--reload-interval", type=float, default=5.0,
+                   help="seconds between checks for a newer output (default: 5)")
+    p.set_defaults(func=cmd_serve)
+
+    p = sub.add_parser("merge", help="build one output from several sanctions lists")
+    p.add_argument("sources", nargs="+", metavar="SOURCE[=FILE]",
+                   help="eu-travel-ban, eu-fsf, un or ofac-sdn, optionally with a local feed file")
+    p.add_argument("--workers", type=int, default=None, help="worker processes (default: one per source)")
+    _add_formats_argument(p)
+    p.set_defaults(func=cmd_merge)
+
+    p = sub.add_parser("show", help="print one entity chunk from the last run")
+    p.add_argument("kind", choices=("xml", "pdf"))
+    p.add_argument("number", type=int, help="1-based entity number")
+    p.set_defaults(func=cmd_show)
+
+    backfill = sub.add_parser("backfill", help="process archived publications with workers sharing a queue")
+    backfill_sub = backfill.add_subparsers(dest="backfill_command", metavar="ACTION", required=True)
+    p = backfill_sub.add_parser("submit", help="queue publication folders (coordinator)")
+    p.add_argument("queue", type=Path, help="SQLite queue file on storage every worker can reach")
+    p.add_argument("publications", nargs="+", type=Path, metavar="FOLDER",
+                   help="folder with one publication's XML feed and PDF")
+    p.add_argument("--work-dir", type=Path, help="shared folder for chunks and outputs (default: data/backfill)")
+    p.add_argument("--chunk-size", type=int, default=500, help="entities per enrich task (default: 500)")
+    p.add_argument("--max-attempts", type=int, default=3, help="attempts per task before it fails (default: 3)")
+    _add_formats_argument(p)
+    p.set_defaults(func=cmd_backfill_submit)
+    p = backfill_sub.add_parser("worker", help="claim and run queued tasks")
+    p.add_argument("queue", type=Path)
+    p.add_argument("--processes", type=int, default=1, help="workers to run on this machine (default: 1)")
+    p.add_argument("--lease", type=float, default=300.0, help="lease length in seconds (default: 300)")
+    p.add_argument("--poll", type=float, default=5.0, help="seconds between claims while waiting (default: 5)")
+    p.add_argument("--wait", action="store_true", help="keep waiting for new tasks when the queue is drained")
+    p.add_argument("--max-tasks", type=int, help="exit after this many tasks")
+    p.add_argument("--id", help="worker name in the queue (default: HOST:PID)")
+    p.set_defaults(func=cmd_backfill_worker)
+    p = backfill_sub.add_parser("status", help="task counts per publication and failures")
+    p.add_argument("queue", type=Path)
+    p.set_defaults(func=cmd_backfill_status)
+    p = backfill_sub.add_parser("retry", help="queue failed tasks again")
+    p.add_argument("queue", type=Path)
+    p.add_argument("--run", help="only this publication")
+    p.set_defaults(func=cmd_backfill_retry)
+
+    bench = sub.add_parser("bench", help="performance measurements")
+    bench_sub = bench.add_subparsers(dest="bench_command", metavar="BENCH", required=True)
+    p = bench_sub.add_parser("startup", help="time the start-up of every subcommand")
+    p.add_argument("--repeat", type=int, default=5)
+    p.add_argument("--no-record", action="store_true", help="do not append to the history file")
+    p.set_defaults(func=cmd_bench_startup)
+    p = bench_sub.add_parser("parse", help="compare XML parser backends on the travel-ban feed")
+    p.add_argument("--xml", type=Path, help="XML feed (default: newest in data/xml_files)")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--no-record", action="store_true", help="do not append to the history file")
+    p.set_defaults(func=cmd_bench_parse)
+    p = bench_sub.add_parser("split", help="time the XML split with byte-range parsing in 1..N processes")
+    p.add_argument("--xml", type=Path, help="XML feed (default: newest in data/xml_files)")
+    p.add_argument("--workers", type=_counts, default=None,
+                   help="comma-separated process counts (default: 1,2,4... up to the CPU count)")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--no-record", action="store_true", help="do not append to the history file")
+    p.set_defaults(func=cmd_bench_split)
+    p = bench_sub.add_parser("pdf", help="compare PDF text-extraction backends on the regulation PDF")
+    p.add_argument("--pdf", type=Path, help="PDF (default: newest in data/pdf)")
+    p.add_argument("--repeat", type=int, default=1)
+    p.add_argument("--no-record", action="store_true", help="do not append to the history file")
+    p.set_defaults(func=cmd_bench_pdf)
+    p = bench_sub.add_parser("xlsx", help="compare per-cell fills with conditional-formatting highlighting")
+    p.add_argument("--generate", type=int, metavar="N", help="use a synthetic corpus of N entities")
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--no-record", action="store_true", help="do not append to the history file")
+    p.set_defaults(func=cmd_bench_xlsx)
+
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        args = parser.parse_args([*argv, "run"])
+
+    paths = default_paths(args.data_dir)
+    try:
+        args.func(args, paths)
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        print("Fatal error:", str(e))
+        return 1
+    return 0
@@ -0,0 +1,99 @@
+"""
+Shared settings and on-disk layout.
+
+Nothing in this module touches the filesystem at import time: stages call
+``DataPaths.ensure()`` right before they write.
+"""
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+
+def resource_path(relative):
+    if hasattr(sys, "_MEIPASS"):
+        return os.path.join(sys._MEIPASS, relative)
+    return os.path.join(os.path.abspath("."), relative)
+
+
+CHROME_PATH = resource_path("chromium/chrome-win/chrome.exe")
+
+SANCTIONS_URL = "https://www.sanctionsmap.eu/#/main/travel/ban"
+
+if hasattr(sys, "_MEIPASS"):
+    BASE_DIR = Path.cwd()        # folder where EXE was launched from
+else:
+    BASE_DIR = Path(__file__).resolve().parent.parent
+
+CSV_COLUMNS = [
+    "FULL_NAME", "CATEGORY", "F_NAME", "M_NAME", "L_NAME", "GENDER", "DOB",
+    "ADD_CITY", "ADD_COUNTRY", "STATE", "NATIONALITIES", "ADDRESS",
+    "IDENTITY NUMBER", "IDENTITY TYPE", "REF_DATE", "DETAILS", "WEB_LINK",
+    "VIOLATION_ID", "SOURCE", "ALIAS", "ASSOCIATES", "MAIN ACTIVITY",
+    "CITIZENSHIP INFORMATION", "STATUS", "REM1", "REM2", "REM3", "REMARKS"
+]
+
+# Appended after the original layout: ISO 3166-1 alpha-2 codes from the gazetteer.
+CODE_COLUMNS = ["ADD_COUNTRY_CODE", "NATIONALITY_CODES"]
+OUTPUT_COLUMNS = CSV_COLUMNS + CODE_COLUMNS
+
+DEFAULT_WEB_LINK = "https://www.sanctionsmap.eu/#/main/travel/ban"
+DEFAULT_SOURCE = "EU TRAVEL BAN"
+
+OUTPUT_FORMATS = ("xlsx", "parquet", "csv", "jsonl")
+
+
+@dataclass(frozen=True)
+class DataPaths:
+    """Locations of every file the pipeline reads or writes under one data folder."""
+
+    parent_dir: Path
+
+    @property
+    def xml_folder(self):
+        return self.parent_dir / "xml_files"
+
+    @property
+    def xml_chunks_archive(self):
+        return self.parent_dir / "xml_chunks.zip"
+
+    @property
+    def pdf_folder(self):
+        return self.parent_dir / "pdf"
+
+    @property
+    def pdf_chunks_archive(self):
+        return self.parent_dir / "pdf_text_chunks.zip"
+
+    @property
+    def manifests_dir(self):
+        return self.parent_dir / "manifests"
+
+    @property
+    def xlsx_path(self):
+        return self.parent_dir / "sanctions_output.xlsx"
+
+    @property
+    def sources_dir(self):
+        return self.parent_dir / "sources"
+
+    @property
+    def partitions_dir(self):
+        return self.parent_dir / "partitions"
+
+    @property
+    def programmes_dir(self):
+        return self.parent_dir / "programmes"
+
+    @property
+    def merged_path(self):
+        return self.parent_dir / "merged_output.xlsx"
+
+    def ensure(self):
+        for d in (self.parent_dir, self.xml_folder, self.pdf_folder):
+            d.mkdir(parents=True, exist_ok=True)
+        return self
+
+
+def default_paths(data_dir=None):
+    return DataPaths(Path(data_dir) if data_dir else BASE_DIR / "data")
@@ -0,0 +1,203 @@
+"""
+Conversion stage: build the output table from the XML chunks and the REM2
+values recovered from the PDF chunks.  The per-entity rules live in the
+EU travel-ban source adapter (``sources.eu``).
+"""
+import os
+import re
+from functools import lru_cache
+
+import gender_guesser.detector as gender
+import regex
+
+from .artifacts import ChunkArchive
+from .normalize import all_variants, clean_name, is_latin_name
+
+
+_NAME_ALIAS_RE = regex.compile(r"(?i)Name\/Alias\s*:\s*(.*)")
+_NAME_STOP_RE = regex.compile(
+    r"(?i)\b(title|function|birth information|birth date|citizenship information|"
+    r"contact information|identity information|address|remark|url|programme)\b\s*[:]"
+)
+_NUMBER_RE = regex.compile(r"(?i)^Number\s*:")
+_NUMBER_PREFIX_RE = regex.compile(r"(?i)^Number\s*:\s*")
+_PROGRAMME_RE = regex.compile(r"(?i)^Programme\s*:")
+_PROGRAMME_PREFIX_RE = regex.compile(r"(?i)^Programme\s*:\s*")
+
+
+@lru_cache(maxsize=None)
+def get_gender_detector():
+    """The gender-guesser dictionary takes a while to load; keep one per process."""
+    return gender.Detector(case_sensitive=False)
+
+
+def _decode_chunk(data):
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")
+
+
+def iter_pdf_chunks(source):
+    """
+    Yield ``(seq, programme, text)`` for every PDF chunk of a chunk archive or
+    a legacy folder of .txt files (numbered in listing order, no programme).
+    """
+    if os.path.isdir(source):
+        seq = 0
+        for fname in os.listdir(source):
+            if not fname.lower().endswith(".txt"):
+                continue
+            try:
+                with open(os.path.join(source, fname), "rb") as fh:
+                    data = fh.read()
+            except OSError:
+                continue
+            seq += 1
+            yield seq, None, _decode_chunk(data)
+        return
+
+    with ChunkArchive(source) as archive:
+        for seq, data in archive:
+            yield seq, archive.programme(seq), _decode_chunk(data)
+
+
+def iter_pdf_chunk_texts(source):
+    """Yield the text of every PDF chunk from a chunk archive or a legacy folder of .txt files."""
+    for _, _, text in iter_pdf_chunks(source):
+        yield text
+
+
+def parse_pdf_chunk(txt):
+    """Return ``(pdf_fullname, rem2_value)`` for one PDF entity chunk."""
+    txt = txt.replace("\u00A0", " ").replace("\r", "\n")
+    lines = [ln.strip() for ln in txt.splitlines()]
+
+    pdf_fullname = None
+
+    for idx, ln in enumerate(lines):
+        m = _NAME_ALIAS_RE.match(ln)
+        if m:
+            candidate = m.group(1).strip()
+            if not candidate:
+                j = idx + 1
+                while j < len(lines) and not lines[j].strip():
+                    j += 1
+                if j < len(lines):
+                    candidate = lines[j].strip()
+            if candidate:
+                candidate = _NAME_STOP_RE.split(candidate)[0].strip()
+            if candidate and is_latin_name(candidate):
+                pdf_fullname = clean_name(candidate)
+                break
+
+    numbers = []
+    programme = None
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if _NUMBER_RE.match(line):
+            rest = _NUMBER_PREFIX_RE.sub("", line).strip()
+            if rest:
+                numbers.append(rest)
+            else:
+                j = i + 1
+                while j < len(lines) and not lines[j].strip():
+                    j += 1
+                if j < len(lines):
+                    numbers.append(lines[j].strip())
+                i = j
+        if programme is None and _PROGRAMME_RE.match(line):
+            rest = _PROGRAMME_PREFIX_RE.sub("", line).strip()
+            if rest:
+                programme = rest
+            else:
+                j = i + 1
+                while j < len(lines) and not lines[j].strip():
+                    j += 1
+                if j < len(lines):
+                    programme = lines[j].strip()
+                i = j
+        i += 1
+
+    numbers_clean = [re.sub(r"\s+", " ", n).strip() for n in numbers if n and n.strip()]
+
+    prog_clean = None
+    if programme and programme.strip():
+        parts = [p.strip() for p in programme.split("|") if p.strip()]
+        if parts:
+            prog_clean = parts[-1]
+        else:
+            prog_clean = programme.strip()
+
+    parts = []
+    if numbers_clean:
+        parts.append("Number: " + " / ".join(numbers_clean))
+    if prog_clean:
+        parts.append("Programme: " + prog_clean)
+
+    rem2_value = "; ".join(parts) if parts else ""
+
+    return pdf_fullname, rem2_value
+
+
+class PdfMapping(dict):
+    """
+    Name variant -> REM2, the first chunk with a name winning.  It is a plain
+    dict to callers and also keeps the parsed chunks: ``records`` holds one
+    ``snapshot.PDF_FIELDS`` dict per chunk and ``record_for`` the number of
+    the record each variant came from.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.record_for = {}
+
+    def add_chunk(self, seq, programme, txt):
+        pdf_fullname, rem2_value = parse_pdf_chunk(txt)
+        record = len(self.records)
+        self.records.append({"seq": seq, "programme": programme, "name": pdf_fullname,
+                             "rem2": rem2_value, "text": txt})
+
+        if pdf_fullname:
+            for key in all_variants(pdf_fullname):
+                if key and key not in self:
+                    self[key] = rem2_value
+                    self.record_for[key] = record
+
+
+def build_pdf_rem2_mapping(source):
+    mapping = PdfMapping()
+    if not os.path.exists(source):
+        print("PDF chunks not found:", source)
+        return mapping
+    for seq, programme, txt in iter_pdf_chunks(source):
+        mapping.add_chunk(seq, programme, txt)
+    return mapping
+
+
+def pdf_rem2_mapping(chunk_texts):
+    """``PdfMapping`` for PDF chunk texts, numbered from 1."""
+    mapping = PdfMapping()
+    for seq, txt in enumerate(chunk_texts, start=1):
+        mapping.add_chunk(seq, None, txt)
+    return mapping
+
+
+def populate_full_name(paths, pdf_mapping=None, detector=None):
+    """
+    Build the output table.  ``pdf_mapping`` and ``detector`` may be passed in
+    by long-running callers that keep them warm between runs.
+    """
+    from .sources.eu import EUTravelBanAdapter
+
+    print("\n" + "="*60)
+    print("STEP 2: POPULATING OUTPUT WITH ENTITY DETAILS")
+    print("="*60 + "\n")
+
+    if pdf_mapping is None:
+        pdf_mapping = build_pdf_rem2_mapping(paths.pdf_chunks_archive)
+
+    adapter = EUTravelBanAdapter(pdf_mapping=pdf_mapping, detector=detector)
+    return adapter.build_table(paths.xml_chunks_archive)
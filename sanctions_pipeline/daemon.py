@@ -0,0 +1,283 @@
+"""
+Watch mode: a long-running process that keeps the browser, the gender
+detector and the parsed PDF mapping warm between runs.
+
+Every ``interval`` seconds both sources are polled with conditional requests
+(``If-None-Match`` / ``If-Modified-Since``) and only the stages whose input
+changed are rerun.  Output files are replaced atomically, and a small JSON
+status endpoint on localhost reports the last run's stage timings and how
+fresh the sources and outputs are.
+"""
+import json
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from playwright.sync_api import sync_playwright
+
+from .config import CHROME_PATH
+from .conversion import build_pdf_rem2_mapping, get_gender_detector, populate_full_name
+from .download import conditional_download, launch_browser, locate_pdf_href, locate_xml_href, open_sanctions_page
+from .exporters import publish_table
+from .pdf_text import extract_text_from_pdf, save_text_entities, split_entities_from_text
+from .pipeline import file_sha256, timed
+from .xml_split import split_xml_entities
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _iso(ts):
+    return ts.isoformat(timespec="seconds") if ts else None
+
+
+class SourceState:
+    """What the daemon last saw for one source URL."""
+
+    def __init__(self, name, locate, folder):
+        self.name = name
+        self.locate = locate
+        self.folder = folder
+        self.url = None
+        self.validators = {}
+        self.path = None
+        self.sha256 = None
+        self.last_checked = None
+        self.last_changed = None
+
+    def to_dict(self):
+        return {
+            "url": self.url,
+            "path": str(self.path) if self.path else None,
+            "sha256": self.sha256,
+            "etag": self.validators.get("etag"),
+            "last_modified": self.validators.get("last_modified"),
+            "last_checked": _iso(self.last_checked),
+            "last_changed": _iso(self.last_changed),
+        }
+
+
+class WatchDaemon:
+    def __init__(self, paths, interval=900, port=8765, formats=("xlsx",)):
+        self.paths = paths
+        self.interval = interval
+        self.port = port
+        self.formats = list(formats)
+        self.sources = {
+            "xml": SourceState("xml", locate_xml_href, paths.xml_folder),
+            "pdf": SourceState("pdf", locate_pdf_href, paths.pdf_folder),
+        }
+
+        self.pdf_mapping = None
+        self.detector = None
+        self.entity_count = 0
+        self.published_at = None
+        self.published = {}
+        # Stages still owed a rerun: a changed source stays pending until its
+        # stage succeeds, and "publish" until the outputs are written.
+        self.pending = set()
+
+        self.started_at = _now()
+        self.cycles = 0
+        self.state = "starting"
+        self.last_run = None
+        self.next_poll_at = None
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._pw = None
+        self._browser = None
+        self._page = None
+        self._session = None
+        self._server = None
+
+    # -- warm state -----------------------------------------------------------
+
+    def start(self):
+        self.paths.ensure()
+        self._start_status_server()
+        self._session = requests.Session()
+        self.detector = get_gender_detector()
+        self._pw = sync_playwright().start()
+        self._ensure_page()
+
+    def _ensure_page(self):
+        if self._browser is None or not self._browser.is_connected():
+            self._browser = launch_browser(self._pw, CHROME_PATH)
+            self._page = None
+        if self._page is None or self._page.is_closed():
+            self._page = self._browser.new_context().new_page()
+        return self._page
+
+    def close(self):
+        self._stop.set()
+        for closer in (
+            lambda: self._browser and self._browser.close(),
+            lambda: self._pw and self._pw.stop(),
+            lambda: self._session and self._session.close(),
+            lambda: self._server and self._server.shutdown(),
+        ):
+            try:
+                closer()
+            except Exception:
+                pass
+
+    # -- polling --------------------------------------------------------------
+
+    def poll_sources(self):
+        """Return ``{name: changed}``; a 304 or an identical body counts as unchanged."""
+        try:
+            page = self._ensure_page()
+            open_sanctions_page(page)
+        except Exception as e:
+            print("⚠️ Warning: could not open SanctionsMap:", str(e))
+            page = None
+
+        changed = {}
+        for name, src in self.sources.items():
+            url = src.url
+            if page is not None:
+                try:
+                    url = src.locate(page)
+                except Exception as e:
+                    print(f"⚠️ Warning: {name.upper()} link not found, reusing last URL:", str(e))
+            if not url:
+                raise RuntimeError(f"No {name.upper()} URL known yet.")
+
+            validators = src.validators if url == src.url else None
+            path, validators = conditional_download(url, src.folder, self._session, validators)
+            src.url = url
+            src.validators = validators or {}
+            src.last_checked = _now()
+
+            if path is None:
+                changed[name] = False
+                continue
+
+            digest = file_sha256(path)
+            changed[name] = digest != src.sha256
+            src.path = path
+            if changed[name]:
+                src.sha256 = digest
+                src.last_changed = src.last_checked
+        return changed
+
+    def run_cycle(self):
+        timings = {}
+        run = {"started_at": _iso(_now()), "stage_timings_s": timings, "changed": {}, "error": None}
+        with self._lock:
+            self.state = "running"
+
+        try:
+            with timed(timings, "poll"):
+                changed = self.poll_sources()
+            run["changed"] = changed
+            self.pending.update(name for name, was_changed in changed.items() if was_changed)
+            if self.pdf_mapping is None:
+                self.pending.add("pdf")
+            if self.published_at is None:
+                self.pending.add("publish")
+
+            if "xml" in self.pending:
+                print(f"🔄 XML changed: {self.sources['xml'].path}")
+                with timed(timings, "split_xml"):
+                    self.entity_count = split_xml_entities(self.sources["xml"].path, self.paths.xml_chunks_archive)
+                self.pending.discard("xml")
+                self.pending.add("publish")
+
+            if "pdf" in self.pending:
+                print(f"🔄 PDF changed: {self.sources['pdf'].path}")
+                with timed(timings, "extract_pdf"):
+                    text = extract_text_from_pdf(self.sources["pdf"].path)
+                    save_text_entities(split_entities_from_text(text), self.paths.pdf_chunks_archive)
+                with timed(timings, "pdf_mapping"):
+                    self.pdf_mapping = build_pdf_rem2_mapping(self.paths.pdf_chunks_archive)
+                self.pending.discard("pdf")
+                self.pending.add("publish")
+
+            if "publish" in self.pending:
+                with timed(timings, "convert"):
+                    table = populate_full_name(self.paths, pdf_mapping=self.pdf_mapping, detector=self.detector)
+                with timed(timings, "publish"):
+                    self.published = publish_table(table, self.formats, self.paths.xlsx_path, self.pdf_mapping)
+                self.published_at = _now()
+                self.pending.discard("publish")
+                run["entities"] = len(table)
+            else:
+                print("💤 Sources unchanged, nothing to do.")
+        except Exception as e:
+            print("❌ Watch cycle failed:", str(e))
+            run["error"] = str(e)
+
+        run["finished_at"] = _iso(_now())
+        with self._lock:
+            self.cycles += 1
+            self.last_run = run
+            self.state = "error" if run["error"] else "idle"
+        return run
+
+    def serve_forever(self):
+        print(f"👀 Watching SanctionsMap every {self.interval}s — status on http://127.0.0.1:{self.port}/status")
+        while not self._stop.is_set():
+            self.run_cycle()
+            with self._lock:
+                self.next_poll_at = datetime.fromtimestamp(time.time() + self.interval, timezone.utc)
+            self._stop.wait(self.interval)
+
+    # -- status endpoint ------------------------------------------------------
+
+    def status(self):
+        with self._lock:
+            now = _now()
+            return {
+                "state": self.state,
+                "started_at": _iso(self.started_at),
+                "interval_s": self.interval,
+                "cycles": self.cycles,
+                "next_poll_at": _iso(self.next_poll_at),
+                "last_run": self.last_run,
+                "pending": sorted(self.pending),
+                "sources": {name: src.to_dict() for name, src in self.sources.items()},
+                "output": {
+                    "files": {fmt: str(path) for fmt, path in self.published.items()},
+                    "published_at": _iso(self.published_at),
+                    "age_s": round((now - self.published_at).total_seconds(), 1) if self.published_at else None,
+                    "entities": self.entity_count,
+                },
+            }
+
+    def _start_status_server(self):
+        daemon = self
+
+        class StatusHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/status"):
+                    self.send_error(404)
+                    return
+                body = json.dumps(daemon.status(), indent=2).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), StatusHandler)
+        threading.Thread(target=self._server.serve_forever, name="status-http", daemon=True).start()
+
+
+def watch(paths, interval=900, port=8765, formats=("xlsx",), once=False):
+    """Run the daemon; with ``once``, a single cycle whose run record is returned."""
+    daemon = WatchDaemon(paths, interval=interval, port=port, formats=formats)
+    try:
+        daemon.start()
+        if once:
+            return daemon.run_cycle()
+        daemon.serve_forever()
+    finally:
+        daemon.close()
@@ -0,0 +1,225 @@
+"""
+Download stage: locate the XML feed and PDF on SanctionsMap and save them.
+"""
+import os
+import re
+from pathlib import Path
+
+import requests
+from playwright.sync_api import sync_playwright
+
+from .config import SANCTIONS_URL
+
+
+def _filename_from_response(resp, url):
+    cd = resp.headers.get("Content-Disposition", "")
+    filename = None
+    if "filename" in cd.lower():
+        m = re.search(r"filename\*?=(?:UTF-8''|\"?)([^\";]+)\"?", cd, flags=re.IGNORECASE)
+        if m:
+            filename = m.group(1).strip().strip('"')
+
+    if not filename:
+        filename = url.split("/")[-1].split("?")[0] or "downloaded_file"
+
+    return filename.replace("\\", "_").replace("/", "_")
+
+
+def download_url_to_file(url, dest_folder, session=None, timeout=60):
+    dest_folder = Path(dest_folder)
+    dest_folder.mkdir(parents=True, exist_ok=True)
+
+    if session is None:
+        session = requests.Session()
+    resp = session.get(url, timeout=timeout, allow_redirects=True)
+    resp.raise_for_status()
+
+    dest_path = dest_folder / _filename_from_response(resp, url)
+    with open(dest_path, "wb") as f:
+        f.write(resp.content)
+
+    return dest_path
+
+
+def conditional_download(url, dest_folder, session, validators=None, timeout=60):
+    """
+    GET ``url`` with ``If-None-Match``/``If-Modified-Since`` from ``validators``.
+
+    Returns ``(path, validators)``; ``path`` is ``None`` when the server answered
+    304 Not Modified.  The file is written next to its final name and renamed
+    so readers never see a partial download.
+    """
+    validators = validators or {}
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+
+    resp = session.get(url, headers=headers, timeout=timeout, allow_redirects=True)
+    if resp.status_code == 304:
+        return None, validators
+    resp.raise_for_status()
+
+    dest_folder = Path(dest_folder)
+    dest_folder.mkdir(parents=True, exist_ok=True)
+    dest_path = dest_folder / _filename_from_response(resp, url)
+    tmp_path = dest_path.with_name(dest_path.name + ".part")
+    with open(tmp_path, "wb") as f:
+        f.write(resp.content)
+    os.replace(tmp_path, dest_path)
+
+    return dest_path, {
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+    }
+
+
+def open_sanctions_page(page):
+    page.goto(SANCTIONS_URL, wait_until="domcontentloaded", timeout=60000)
+    page.wait_for_timeout(7000)
+
+
+def _absolute(href):
+    if href.startswith("/"):
+        href = "https://www.sanctionsmap.eu" + href
+    return href
+
+
+def locate_xml_href(page):
+    possible_xpaths = [
+        "//ul[@class='filter-list']//li//a//a",
+        "//a[contains(@href, 'export') and contains(@href, '.xml')]",
+        "//a[contains(@href, '/travelbans/file/') and contains(@href, '.xml')]",
+        "//a[contains(@href, '/export') and contains(@href, '.xml')]",
+    ]
+
+    href = None
+    for xp in possible_xpaths:
+        try:
+            locator = page.locator(xp).first
+            if locator:
+                h = locator.get_attribute("href")
+                if h:
+                    href = h
+                    break
+        except Exception:
+            continue
+
+    if not href:
+        all_links = page.locator("//a")
+        count = all_links.count()
+        for i in range(count):
+            try:
+                a = all_links.nth(i)
+                a_href = a.get_attribute("href") or ""
+                if ".xml" in a_href.lower():
+                    href = a_href
+                    break
+            except Exception:
+                continue
+
+    if not href:
+        raise RuntimeError("Could not find XML link on the page.")
+
+    return _absolute(href)
+
+
+def locate_pdf_href(page):
+    possible_pdf_xpaths = [
+        "//a[contains(text(),'PDF') and contains(@href, '/travelbans/file/')]",
+        "//a[contains(@href, '.pdf') and contains(@href, 'travelbans')]",
+        "//a[contains(@href, '.pdf')]",
+    ]
+
+    href = None
+    for xp in possible_pdf_xpaths:
+        try:
+            locator = page.locator(xp).first
+            if locator:
+                h = locator.get_attribute("href")
+                if h:
+                    href = h
+                    break
+        except Exception:
+            continue
+
+    if not href:
+        all_links = page.locator("//a")
+        count = all_links.count()
+        for i in range(count):
+            try:
+                a_href = all_links.nth(i).get_attribute("href") or ""
+                if ".pdf" in a_href.lower():
+                    href = a_href
+                    break
+            except Exception:
+                continue
+
+    if not href:
+        raise RuntimeError("Could not find PDF link on the page.")
+
+    return _absolute(href)
+
+
+def find_and_download_xml(page, dest_folder):
+    print("➡️ Navigating to SanctionsMap to find XML link...")
+    open_sanctions_page(page)
+    href = locate_xml_href(page)
+
+    print(f"📄 Found XML URL: {href}")
+    print("⬇️ Downloading XML with original filename...")
+    xml_file_path = download_url_to_file(href, dest_folder)
+    print(f"✅ XML saved to: {xml_file_path}")
+    return xml_file_path
+
+
+def find_and_download_pdf(page, dest_folder):
+    print("➡️ Navigating to SanctionsMap to find PDF link...")
+    open_sanctions_page(page)
+    href = locate_pdf_href(page)
+
+    print(f"📄 Found PDF URL: {href}")
+    print("⬇️ Downloading PDF with original filename...")
+    pdf_file_path = download_url_to_file(href, dest_folder)
+    print(f"✅ PDF saved to: {pdf_file_path}")
+    return pdf_file_path
+
+
+def launch_browser(pw, chrome_path):
+    print("▶ Launching browser (Playwright)...")
+    return pw.chromium.launch(
+        executable_path=chrome_path,
+        headless=True,
+        slow_mo=120
+    )
+
+
+def download_sources(paths, chrome_path):
+    """Launch Chromium once and fetch both sources; a failed download yields ``None``."""
+    with sync_playwright() as pw:
+        browser = launch_browser(pw, chrome_path)
+
+        context = browser.new_context()
+        page = context.new_page()
+
+        # Download XML
+        xml_file = None
+        try:
+            xml_file = find_and_download_xml(page, paths.xml_folder)
+        except Exception as e:
+            print("⚠️ Warning: XML download failed:", str(e))
+
+        # Download PDF
+        pdf_file = None
+        try:
+            pdf_file = find_and_download_pdf(page, paths.pdf_folder)
+        except Exception as e:
+            print("⚠️ Warning: PDF download failed:", str(e))
+
+        try:
+            browser.close()
+        except Exception:
+            pass
+
+    return xml_file, pdf_file
@@ -0,0 +1,199 @@
+"""
+Differential equivalence harness.
+
+Runs two or more conversion engines on the same XML and PDF chunk archives,
+either recorded from a real run or produced by ``synthetic.generate_corpus``.
+Every ``CSV_COLUMNS`` value and every row's visible highlighting
+(``status.visible_flags``) is then compared.  The reference engine is
+``legacy``, the pre-refactor ``populate_full_name`` kept in ``legacy.py``.
+``current`` is the conversion the pipeline runs today.  New engines are
+registered with ``@register_engine`` and take ``(xml_archive, pdf_archive)``
+to an ``OutputTable``.
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from .config import CSV_COLUMNS
+from .status import CATEGORY_MISSING, NAME_MISSING, REM2_CONFLICT, REM2_MISSING, visible_flags
+
+ENGINES = {}
+
+
+def register_engine(name):
+    def decorator(func):
+        ENGINES[name] = func
+        return func
+    return decorator
+
+
+@register_engine("legacy")
+def legacy_engine(xml_archive, pdf_archive):
+    from . import legacy
+    from .artifacts import ChunkArchive
+    from .conversion import _decode_chunk, get_gender_detector
+    from .exporters import OutputTable
+
+    pdf_texts = []
+    if Path(pdf_archive).exists():
+        with ChunkArchive(pdf_archive) as archive:
+            pdf_texts = [_decode_chunk(data) for _, data in archive]
+    with ChunkArchive(xml_archive) as archive:
+        chunks = list(archive)
+
+    pdf_mapping = legacy.build_pdf_rem2_mapping(pdf_texts)
+    ws = legacy.populate_sheet(chunks, pdf_mapping, get_gender_detector())
+
+    rows = range(2, ws.max_row + 1)
+    columns = {}
+    for col, name in enumerate(CSV_COLUMNS, start=1):
+        columns[name] = [("" if ws.cell(r, col).value is None else ws.cell(r, col).value) for r in rows]
+
+    status = np.zeros(len(rows), dtype=np.uint8)
+    name_col, category_col, rem2_col = (CSV_COLUMNS.index(c) + 1 for c in ("FULL_NAME", "CATEGORY", "REM2"))
+    for i, r in enumerate(rows):
+        if ws.cell(r, name_col).fill == legacy.YELLOW:
+            status[i] |= NAME_MISSING
+        if ws.cell(r, category_col).fill == legacy.YELLOW:
+            status[i] |= CATEGORY_MISSING
+        rem2_fill = ws.cell(r, rem2_col).fill
+        if rem2_fill == legacy.YELLOW:
+            status[i] |= REM2_MISSING
+        elif rem2_fill == legacy.RED:
+            status[i] |= REM2_CONFLICT
+    return OutputTable.from_columns(columns, status)
+
+
+@register_engine("current")
+def current_engine(xml_archive, pdf_archive):
+    from .conversion import build_pdf_rem2_mapping
+    from .sources.eu import EUTravelBanAdapter
+
+    pdf_mapping = build_pdf_rem2_mapping(pdf_archive) if Path(pdf_archive).exists() else {}
+    return EUTravelBanAdapter(pdf_mapping=pdf_mapping).build_table(xml_archive)
+
+
+def compare_tables(expected, actual):
+    """
+    Return ``{"rows", "field_diffs": {field: count}, "first": {...} | None}``.
+    ``first`` is the lowest entity number with a difference and its first
+    differing field (``STATUS`` for the highlighting).
+    """
+    field_diffs = {}
+    first = None
+
+    def note(idx, field, want, got):
+        nonlocal first
+        if first is None or idx < first["row"] - 1:
+            first = {"row": idx + 1, "field": field, "expected": want, "actual": got}
+
+    if len(expected) != len(actual):
+        return {"rows": (len(expected), len(actual)), "field_diffs": {"(row count)": 1},
+                "first": {"row": min(len(expected), len(actual)) + 1, "field": "(row count)",
+                          "expected": len(expected), "actual": len(actual)}}
+
+    for name in CSV_COLUMNS:
+        want = [expected.flat_value(name, i) for i in range(len(expected))]
+        got = [actual.flat_value(name, i) for i in range(len(actual))]
+        if want == got:
+            continue
+        bad = [i for i, (a, b) in enumerate(zip(want, got)) if a != b]
+        field_diffs[name] = len(bad)
+        note(bad[0], name, want[bad[0]], got[bad[0]])
+
+    want_status = visible_flags(expected.status)
+    got_status = visible_flags(actual.status)
+    bad = np.flatnonzero(want_status != got_status)
+    if bad.size:
+        field_diffs["STATUS"] = int(bad.size)
+        idx = int(bad[0])
+        if first is None or idx < first["row"] - 1:
+            first = {"row": idx + 1, "field": "STATUS",
+                     "expected": int(want_status[idx]), "actual": int(got_status[idx])}
+    return {"rows": len(expected), "field_diffs": field_diffs, "first": first}
+
+
+def corpus_aliases(xml_archive):
+    """Every ``nameAlias`` ``wholeName`` in an XML chunk archive, unparsable chunks skipped."""
+    from .artifacts import ChunkArchive
+    from .xmlbackend import get_backend
+
+    backend = get_backend()
+    names = []
+    with ChunkArchive(xml_archive) as archive:
+        for _, data in archive:
+            try:
+                root = backend.fromstring(data)
+            except Exception:
+                continue
+            for elem in root.iter():
+                if isinstance(elem.tag, str) and elem.tag.rpartition("}")[2] == "nameAlias":
+                    names.append(elem.attrib.get("wholeName") or "")
+    return names
+
+
+def compare_latin_names(names):
+    """``normalize.is_latin_name`` against the legacy one; returns the names they disagree on."""
+    from . import legacy
+    from .normalize import is_latin_name
+
+    return [name for name in names if is_latin_name(name) != legacy.is_latin_name(name)]
+
+
+def run_check(xml_archive, pdf_archive, engines=("current",), reference="legacy"):
+    """Run ``reference`` and each of ``engines`` and print the comparison; returns ``True`` if all match."""
+    for name in (reference, *engines):
+        if name not in ENGINES:
+            raise LookupError(f"unknown engine {name!r}; choose from {', '.join(ENGINES)}")
+
+    import contextlib
+    import io
+
+    def run(name):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            table = ENGINES[name](xml_archive, pdf_archive)
+        return table, time.perf_counter() - start
+
+    expected, elapsed = run(reference)
+    print(f"🔬 {reference}: {len(expected)} rows in {elapsed:.2f}s")
+
+    all_ok = True
+    names = corpus_aliases(xml_archive)
+    mismatched = compare_latin_names(names)
+    if mismatched:
+        all_ok = False
+        print(f"❌ is_latin_name: {len(mismatched)} of {len(names)} aliases differ from legacy, "
+              f"first {mismatched[0]!r}")
+    else:
+        print(f"✅ is_latin_name: identical on {len(names)} aliases")
+    for name in engines:
+        actual, elapsed = run(name)
+        result = compare_tables(expected, actual)
+        if not result["field_diffs"]:
+            print(f"✅ {name}: identical ({len(actual)} rows in {elapsed:.2f}s)")
+            continue
+        all_ok = False
+        first = result["first"]
+        print(f"❌ {name}: differs from {reference} ({elapsed:.2f}s)")
+        print(f"   first difference: entity {first['row']}, {first['field']}")
+        print(f"     {reference}: {first['expected']!r}")
+        print(f"     {name}: {first['actual']!r}")
+        print("   rows differing per field: " + ", ".join(f"{k}={v}" for k, v in result["field_diffs"].items()))
+    return all_ok
+
+
+def check_synthetic(size, seed=1, engines=("current",), reference="legacy", keep_dir=None):
+    """Generate a corpus of ``size`` entities (in ``keep_dir`` or a temporary folder) and check it."""
+    from .synthetic import generate_corpus
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(keep_dir) if keep_dir else Path(tmp)
+        folder.mkdir(parents=True, exist_ok=True)
+        xml_archive, pdf_archive = folder / "xml_chunks.zip", folder / "pdf_text_chunks.zip"
+        start = time.perf_counter()
+        generate_corpus(size, xml_archive, pdf_archive, seed=seed)
+        print(f"🧪 Generated {size} entities (seed {seed}) in {time.perf_counter() - start:.2f}s")
+        return run_check(xml_archive, pdf_archive, engines=engines, reference=reference)
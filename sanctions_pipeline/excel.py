@@ -0,0 +1,110 @@
+"""
+Excel rendering: one row per entity, with the review highlighting derived
+from the row status flags.  The flags go in a last ``REVIEW_FLAGS`` column and
+a handful of conditional-formatting rules colour the rows from it, instead of
+a fill on each highlighted cell.
+"""
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.formatting.rule import FormulaRule
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+from openpyxl.utils import get_column_letter
+
+from .status import CATEGORY_MISSING, NAME_MISSING, REM2_CONFLICT, REM2_MISSING, flag_mask, new_status_array
+
+FLAGS_COLUMN = "REVIEW_FLAGS"
+HIGHLIGHT_MODES = ("rules", "cells")
+
+YELLOW_FILL = PatternFill(start_color="FFFF00", end_color="FFFF00", fill_type="solid")
+RED_FILL = PatternFill(start_color="FF0000", end_color="FF0000", fill_type="solid")
+
+_THIN = Side(style="thin")
+HEADER_FONT = Font(bold=True)
+HEADER_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
+
+
+def _cell(ws, value, fill=None):
+    cell = WriteOnlyCell(ws, value=value if value != "" else None)
+    if fill is not None:
+        cell.fill = fill
+    return cell
+
+
+def _flag_set(ref, flag):
+    # MOD/INT rather than BITAND so older Excel and LibreOffice evaluate it too.
+    return f"MOD(INT({ref}/{flag}),2)=1"
+
+
+def add_highlight_rules(ws, names, rows):
+    """
+    Worksheet-level conditional formatting over the ``FLAGS_COLUMN`` written
+    after ``names``: conflict rows red from the second column on, and the
+    FULL_NAME/CATEGORY/REM2 cell yellow for its own flag.  The red rule comes
+    first and stops evaluation, so it hides the CATEGORY/REM2 yellow as the
+    per-cell fills did.
+    """
+    if not rows:
+        return
+    last_row = rows + 1
+    ref = f"${get_column_letter(len(names) + 1)}2"
+    ws.conditional_formatting.add(
+        f"B2:{get_column_letter(len(names))}{last_row}",
+        FormulaRule(formula=[_flag_set(ref, REM2_CONFLICT)], fill=RED_FILL, stopIfTrue=True),
+    )
+    for name, flag in (("FULL_NAME", NAME_MISSING), ("CATEGORY", CATEGORY_MISSING), ("REM2", REM2_MISSING)):
+        if name in names:
+            col = get_column_letter(names.index(name) + 1)
+            ws.conditional_formatting.add(f"{col}2:{col}{last_row}",
+                                          FormulaRule(formula=[_flag_set(ref, flag)], fill=YELLOW_FILL))
+
+
+def write_workbook(table, xlsx_path, highlight="rules"):
+    """
+    ``highlight="rules"`` writes the row flags to ``FLAGS_COLUMN`` and colours
+    them with ``add_highlight_rules``, so no data cell carries a style.
+    ``"cells"`` is the previous rendering, a fill on every highlighted cell,
+    kept as the baseline for ``bench xlsx``.
+    """
+    if highlight not in HIGHLIGHT_MODES:
+        raise ValueError(f"unknown highlight mode {highlight!r}; choose from {', '.join(HIGHLIGHT_MODES)}")
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")
+    by_rules = highlight == "rules"
+
+    header = []
+    for name in (*table.names, FLAGS_COLUMN) if by_rules else table.names:
+        cell = WriteOnlyCell(ws, value=name)
+        cell.font = HEADER_FONT
+        cell.border = HEADER_BORDER
+        cell.alignment = HEADER_ALIGNMENT
+        header.append(cell)
+    ws.append(header)
+
+    status = table.status if table.status is not None else new_status_array(len(table))
+    if by_rules:
+        add_highlight_rules(ws, table.names, len(table))
+        for idx, flags in enumerate(status.tolist()):
+            ws.append([*(table.flat_value(name, idx) or None for name in table.names), flags])
+        wb.save(xlsx_path)
+        return
+
+    yellow_cols = {
+        "FULL_NAME": flag_mask(status, NAME_MISSING),
+        "CATEGORY": flag_mask(status, CATEGORY_MISSING),
+        "REM2": flag_mask(status, REM2_MISSING),
+    }
+    red_rows = flag_mask(status, REM2_CONFLICT)
+
+    for idx in range(len(table)):
+        row = []
+        for col, name in enumerate(table.names):
+            fill = None
+            if red_rows[idx] and col > 0:
+                fill = RED_FILL
+            elif name in yellow_cols and yellow_cols[name][idx]:
+                fill = YELLOW_FILL
+            row.append(_cell(ws, table.flat_value(name, idx), fill))
+        ws.append(row)
+
+    wb.save(xlsx_path)
@@ -0,0 +1,209 @@
+"""
+Output writers.
+
+Every format is produced from one in-memory ``OutputTable`` with the
+``OUTPUT_COLUMNS`` schema.  Multi-valued fields become list columns and
+low-cardinality fields are dictionary-encoded where the format supports it.
+New formats plug in with ``@register_writer``.
+"""
+import csv
+import json
+import os
+from pathlib import Path
+
+from .artifacts import temp_path
+
+# Column -> separator used in the flat (xlsx) representation.
+LIST_COLUMNS = {
+    "ALIAS": "; ",
+    "NATIONALITIES": "; ",
+    "ADDRESS": "; ",
+    "NATIONALITY_CODES": "; ",
+}
+
+DICTIONARY_COLUMNS = ("CATEGORY", "GENDER", "ADD_COUNTRY", "NATIONALITIES", "SOURCE",
+                      "ADD_COUNTRY_CODE", "NATIONALITY_CODES")
+
+# Columns whose values repeat across many rows; tables share one string per value.
+INTERNED_COLUMNS = frozenset(DICTIONARY_COLUMNS) | {
+    "ADD_CITY", "STATE", "IDENTITY TYPE", "WEB_LINK", "REM2", "STATUS", "CITIZENSHIP INFORMATION",
+}
+
+WRITERS = {}
+
+
+def register_writer(fmt, suffix):
+    def decorator(func):
+        WRITERS[fmt] = (suffix, func)
+        return func
+    return decorator
+
+
+def split_multi(value, sep):
+    if not value:
+        return []
+    return [v.strip() for v in value.split(sep) if v.strip()]
+
+
+class OutputTable:
+    """
+    Column-oriented output rows; list columns hold tuples.  ``status`` is the
+    per-row flag array from ``sanctions_pipeline.status`` (or ``None``).
+    ``rem2_records`` is, per row, the number of the ``PdfMapping`` record its
+    REM2 came from (``None`` for no match), or ``None`` for sources without one.
+    """
+
+    def __init__(self, columns, status=None, rem2_records=None):
+        self.columns = columns
+        self.names = list(columns)
+        self.status = status
+        self.rem2_records = rem2_records
+
+    @classmethod
+    def from_columns(cls, flat_columns, status=None, pool=None, rem2_records=None):
+        """Split list columns into tuples and intern repeated values through ``pool``."""
+        pool = {} if pool is None else pool
+        columns = {}
+        for name, values in flat_columns.items():
+            sep = LIST_COLUMNS.get(name)
+            interned = name in INTERNED_COLUMNS
+            if sep and interned:
+                columns[name] = [tuple(pool.setdefault(v, v) for v in split_multi(value, sep)) for value in values]
+            elif sep:
+                columns[name] = [tuple(split_multi(value, sep)) for value in values]
+            elif interned:
+                columns[name] = [pool.setdefault(v, v) for v in values]
+            else:
+                columns[name] = list(values)
+        return cls(columns, status, rem2_records)
+
+    @classmethod
+    def concat(cls, tables):
+        """One table holding the rows of ``tables`` in order (all share ``OUTPUT_COLUMNS``)."""
+        import numpy as np
+
+        tables = list(tables)
+        names = tables[0].names if tables else []
+        columns = {name: [v for t in tables for v in t.columns[name]] for name in names}
+        status = None
+        if any(t.status is not None for t in tables):
+            status = np.concatenate([
+                t.status if t.status is not None else np.zeros(len(t), dtype=np.uint8) for t in tables
+            ]).astype(np.uint8)
+        rem2_records = None
+        if any(t.rem2_records is not None for t in tables):
+            rem2_records = [r for t in tables for r in (t.rem2_records if t.rem2_records is not None else [None] * len(t))]
+        return cls(columns, status, rem2_records)
+
+    def __len__(self):
+        return len(self.columns[self.names[0]]) if self.names else 0
+
+    def flat_value(self, name, idx):
+        value = self.columns[name][idx]
+        sep = LIST_COLUMNS.get(name)
+        return sep.join(value) if sep else value
+
+    def iter_records(self):
+        cols = [self.columns[name] for name in self.names]
+        for values in zip(*cols):
+            yield dict(zip(self.names, values))
+
+
+@register_writer("xlsx", ".xlsx")
+def write_xlsx(table, path):
+    from .excel import write_workbook
+
+    write_workbook(table, path)
+
+
+@register_writer("csv", ".csv")
+def write_csv(table, path):
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(table.names)
+        for idx in range(len(table)):
+            writer.writerow([table.flat_value(name, idx) for name in table.names])
+
+
+@register_writer("jsonl", ".jsonl")
+def write_jsonl(table, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in table.iter_records():
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+@register_writer("index", ".idx")
+def write_index(table, path):
+    from .nameindex import write_name_index
+
+    write_name_index(table, path)
+
+
+@register_writer("parquet", ".parquet")
+def write_parquet(table, path):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)") from None
+
+    arrays = {}
+    for name in table.names:
+        values = table.columns[name]
+        if name in LIST_COLUMNS:
+            offsets = [0]
+            flat = []
+            for items in values:
+                flat.extend(items)
+                offsets.append(len(flat))
+            child = pa.array(flat, type=pa.string())
+            if name in DICTIONARY_COLUMNS:
+                child = child.dictionary_encode()
+            arrays[name] = pa.ListArray.from_arrays(pa.array(offsets, type=pa.int32()), child)
+        else:
+            arr = pa.array(values, type=pa.string())
+            arrays[name] = arr.dictionary_encode() if name in DICTIONARY_COLUMNS else arr
+    pq.write_table(pa.table(arrays), path, compression="zstd")
+
+
+def export_table(table, formats, base_path):
+    """Write ``table`` once per format next to ``base_path``; returns ``{format: path}``."""
+    base_path = Path(base_path)
+    written = {}
+    for fmt in formats:
+        if fmt not in WRITERS:
+            raise ValueError(f"Unknown output format: {fmt} (available: {', '.join(sorted(WRITERS))})")
+        suffix, writer = WRITERS[fmt]
+        out_path = base_path.with_suffix(suffix)
+        replace_atomically(out_path, lambda tmp_path: writer(table, tmp_path))
+        written[fmt] = out_path
+        print(f"✅ {fmt.upper()} saved to: {out_path}")
+    return written
+
+
+def replace_atomically(out_path, write):
+    """Call ``write(tmp_path)`` and move the result over ``out_path``, so readers never see a partial file."""
+    tmp_path = temp_path(out_path)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, out_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return out_path
+
+
+def publish_table(table, formats, base_path, pdf_mapping=None):
+    """
+    ``export_table`` plus the files downstream tools read: the memory-mapped
+    name index and the run snapshot with the records of ``pdf_mapping``, the
+    ``PdfMapping`` the table was built with.
+    """
+    from .snapshot import write_snapshot
+
+    written = export_table(table, [*dict.fromkeys(formats), "index"], base_path)
+    snap_path = Path(base_path).with_suffix(".snap")
+    replace_atomically(snap_path, lambda tmp_path: write_snapshot(table, tmp_path, pdf_mapping))
+    written["snapshot"] = snap_path
+    print(f"✅ SNAPSHOT saved to: {snap_path}")
+    return written
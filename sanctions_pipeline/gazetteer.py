@@ -0,0 +1,503 @@
+"""
+Local gazetteer: countries, their common spellings, and cities that come up
+in sanctions lists.
+
+The tables are plain strings parsed once, on first use, into hash maps keyed
+by a normalised form of the name.  The column functions apply every rule
+once per distinct value (``records.map_distinct``), so a value costs one
+normalisation and one dictionary hit however many rows carry it.
+``clean_place_name`` is the city/region clean-up from the original
+conversion, with unchanged results; ``clean_place_column`` runs it over a
+column.
+"""
+import re
+import unicodedata
+from functools import lru_cache
+
+from .records import map_distinct
+
+# ISO 3166-1 alpha-2 | short name | other spellings seen in the EU, UN and OFAC lists (";"-separated)
+_COUNTRIES = """
+AD|Andorra
+AE|United Arab Emirates|UAE;U.A.E.;Emirates
+AF|Afghanistan|Islamic Republic of Afghanistan;Islamic Emirate of Afghanistan
+AG|Antigua and Barbuda
+AI|Anguilla
+AL|Albania
+AM|Armenia
+AO|Angola
+AQ|Antarctica
+AR|Argentina
+AS|American Samoa
+AT|Austria
+AU|Australia
+AW|Aruba
+AX|Aland Islands
+AZ|Azerbaijan
+BA|Bosnia and Herzegovina|Bosnia;Bosnia-Herzegovina
+BB|Barbados
+BD|Bangladesh
+BE|Belgium
+BF|Burkina Faso
+BG|Bulgaria
+BH|Bahrain
+BI|Burundi
+BJ|Benin
+BL|Saint Barthelemy
+BM|Bermuda
+BN|Brunei Darussalam|Brunei
+BO|Bolivia|Bolivia (Plurinational State of);Plurinational State of Bolivia
+BQ|Bonaire, Sint Eustatius and Saba
+BR|Brazil
+BS|Bahamas|The Bahamas
+BT|Bhutan
+BV|Bouvet Island
+BW|Botswana
+BY|Belarus|Byelorussia;Republic of Belarus
+BZ|Belize
+CA|Canada
+CC|Cocos (Keeling) Islands
+CD|Democratic Republic of the Congo|Congo, Democratic Republic of the;Congo (Democratic Republic);DRC;DR Congo;Zaire;Congo-Kinshasa
+CF|Central African Republic|CAR
+CG|Congo|Republic of the Congo;Congo, Republic of the;Congo-Brazzaville
+CH|Switzerland
+CI|Cote d'Ivoire|Ivory Coast
+CK|Cook Islands
+CL|Chile
+CM|Cameroon
+CN|China|People's Republic of China;PRC
+CO|Colombia
+CR|Costa Rica
+CU|Cuba
+CV|Cabo Verde|Cape Verde
+CW|Curacao
+CX|Christmas Island
+CY|Cyprus
+CZ|Czechia|Czech Republic
+DE|Germany
+DJ|Djibouti
+DK|Denmark
+DM|Dominica
+DO|Dominican Republic
+DZ|Algeria
+EC|Ecuador
+EE|Estonia
+EG|Egypt
+EH|Western Sahara
+ER|Eritrea
+ES|Spain
+ET|Ethiopia
+FI|Finland
+FJ|Fiji
+FK|Falkland Islands|Falkland Islands (Malvinas)
+FM|Micronesia|Micronesia (Federated States of);Federated States of Micronesia
+FO|Faroe Islands
+FR|France
+GA|Gabon
+GB|United Kingdom|United Kingdom of Great Britain and Northern Ireland;UK;Great Britain;Britain
+GD|Grenada
+GE|Georgia
+GF|French Guiana
+GG|Guernsey
+GH|Ghana
+GI|Gibraltar
+GL|Greenland
+GM|Gambia|The Gambia
+GN|Guinea
+GP|Guadeloupe
+GQ|Equatorial Guinea
+GR|Greece
+GS|South Georgia and the South Sandwich Islands
+GT|Guatemala
+GU|Guam
+GW|Guinea-Bissau
+GY|Guyana
+HK|Hong Kong|Hong Kong SAR;Hong Kong, China
+HM|Heard Island and McDonald Islands
+HN|Honduras
+HR|Croatia
+HT|Haiti
+HU|Hungary
+ID|Indonesia
+IE|Ireland
+IL|Israel
+IM|Isle of Man
+IN|India
+IO|British Indian Ocean Territory
+IQ|Iraq
+IR|Iran|Iran (Islamic Republic of);Islamic Republic of Iran;Iran, Islamic Republic of;Persia
+IS|Iceland
+IT|Italy
+JE|Jersey
+JM|Jamaica
+JO|Jordan
+JP|Japan
+KE|Kenya
+KG|Kyrgyzstan|Kyrgyz Republic
+KH|Cambodia
+KI|Kiribati
+KM|Comoros
+KN|Saint Kitts and Nevis
+KP|North Korea|Korea, Democratic People's Republic of;Democratic People's Republic of Korea;DPRK;Korea, North;Korea (North)
+KR|South Korea|Korea, Republic of;Republic of Korea;Korea, South;Korea (South)
+KW|Kuwait
+KY|Cayman Islands
+KZ|Kazakhstan
+LA|Laos|Lao People's Democratic Republic;Lao PDR
+LB|Lebanon
+LC|Saint Lucia
+LI|Liechtenstein
+LK|Sri Lanka
+LR|Liberia
+LS|Lesotho
+LT|Lithuania
+LU|Luxembourg
+LV|Latvia
+LY|Libya|Libyan Arab Jamahiriya;State of Libya
+MA|Morocco
+MC|Monaco
+MD|Moldova|Moldova, Republic of;Republic of Moldova
+ME|Montenegro
+MF|Saint Martin (French part)
+MG|Madagascar
+MH|Marshall Islands
+MK|North Macedonia|Macedonia;The former Yugoslav Republic of Macedonia;Republic of North Macedonia
+ML|Mali
+MM|Myanmar|Burma;Myanmar (Burma)
+MN|Mongolia
+MO|Macao|Macau
+MP|Northern Mariana Islands
+MQ|Martinique
+MR|Mauritania
+MS|Montserrat
+MT|Malta
+MU|Mauritius
+MV|Maldives
+MW|Malawi
+MX|Mexico
+MY|Malaysia
+MZ|Mozambique
+NA|Namibia
+NC|New Caledonia
+NE|Niger
+NF|Norfolk Island
+NG|Nigeria
+NI|Nicaragua
+NL|Netherlands|The Netherlands;Holland
+NO|Norway
+NP|Nepal
+NR|Nauru
+NU|Niue
+NZ|New Zealand
+OM|Oman
+PA|Panama
+PE|Peru
+PF|French Polynesia
+PG|Papua New Guinea
+PH|Philippines
+PK|Pakistan
+PL|Poland
+PM|Saint Pierre and Miquelon
+PN|Pitcairn
+PR|Puerto Rico
+PS|Palestine|State of Palestine;Palestinian Territories;Occupied Palestinian Territory;Palestinian Territory, Occupied;West Bank;Gaza Strip
+PT|Portugal
+PW|Palau
+PY|Paraguay
+QA|Qatar
+RE|Reunion
+RO|Romania
+RS|Serbia
+RU|Russia|Russian Federation
+RW|Rwanda
+SA|Saudi Arabia|Kingdom of Saudi Arabia
+SB|Solomon Islands
+SC|Seychelles
+SD|Sudan
+SE|Sweden
+SG|Singapore
+SH|Saint Helena
+SI|Slovenia
+SJ|Svalbard and Jan Mayen
+SK|Slovakia
+SL|Sierra Leone
+SM|San Marino
+SN|Senegal
+SO|Somalia
+SR|Suriname
+SS|South Sudan
+ST|Sao Tome and Principe
+SV|El Salvador
+SX|Sint Maarten (Dutch part)
+SY|Syria|Syrian Arab Republic
+SZ|Eswatini|Swaziland
+TC|Turks and Caicos Islands
+TD|Chad
+TF|French Southern Territories
+TG|Togo
+TH|Thailand
+TJ|Tajikistan
+TK|Tokelau
+TL|Timor-Leste|East Timor
+TM|Turkmenistan
+TN|Tunisia
+TO|Tonga
+TR|Turkey|Turkiye;Republic of Turkiye
+TT|Trinidad and Tobago
+TV|Tuvalu
+TW|Taiwan|Taiwan, Province of China
+TZ|Tanzania|United Republic of Tanzania;Tanzania, United Republic of
+UA|Ukraine
+UG|Uganda
+UM|United States Minor Outlying Islands
+US|United States|United States of America;USA;U.S.A.;US
+UY|Uruguay
+UZ|Uzbekistan
+VA|Holy See|Vatican;Vatican City
+VC|Saint Vincent and the Grenadines
+VE|Venezuela|Venezuela (Bolivarian Republic of);Bolivarian Republic of Venezuela
+VG|British Virgin Islands|Virgin Islands (British)
+VI|United States Virgin Islands|Virgin Islands (U.S.)
+VN|Viet Nam|Vietnam
+VU|Vanuatu
+WF|Wallis and Futuna
+WS|Samoa
+XK|Kosovo
+YE|Yemen
+YT|Mayotte
+ZA|South Africa
+ZM|Zambia
+ZW|Zimbabwe
+"""
+
+# Common city | ISO code; spelling variants ";"-separated.  Names shared by
+# cities in different countries (Tripoli, Brest, Rostov) are left out.
+_CITIES = """
+Kabul|AF
+Kandahar;Qandahar|AF
+Herat|AF
+Jalalabad|AF
+Kunduz|AF
+Mazar-e Sharif;Mazar-i-Sharif|AF
+Helmand;Lashkar Gah|AF
+Tirana|AL
+Yerevan|AM
+Baku|AZ
+Sarajevo|BA
+Minsk|BY
+Gomel;Homel|BY
+Grodno;Hrodna|BY
+Vitebsk|BY
+Mogilev|BY
+Bujumbura|BI
+Ouagadougou|BF
+Beijing;Peking|CN
+Shanghai|CN
+Dalian|CN
+Kinshasa|CD
+Goma|CD
+Bukavu|CD
+Lubumbashi|CD
+Bangui|CF
+Brazzaville|CG
+Havana;La Habana|CU
+Cairo|EG
+Asmara|ER
+Addis Ababa|ET
+Tbilisi|GE
+Sukhumi|GE
+Tskhinvali|GE
+Conakry|GN
+Bissau|GW
+Port-au-Prince|HT
+Hong Kong|HK
+Baghdad|IQ
+Mosul|IQ
+Basra|IQ
+Erbil|IQ
+Tikrit|IQ
+Tehran;Teheran|IR
+Isfahan|IR
+Mashhad|IR
+Tabriz|IR
+Qom|IR
+Shiraz|IR
+Beirut|LB
+Benghazi|LY
+Sirte|LY
+Misrata|LY
+Bamako|ML
+Gao|ML
+Timbuktu|ML
+Yangon;Rangoon|MM
+Naypyidaw;Nay Pyi Taw|MM
+Mandalay|MM
+Chisinau|MD
+Tiraspol|MD
+Managua|NI
+Niamey|NE
+Abuja|NG
+Maiduguri|NG
+Pyongyang|KP
+Islamabad|PK
+Karachi|PK
+Peshawar|PK
+Quetta|PK
+Lahore|PK
+Miranshah|PK
+Gaza|PS
+Ramallah|PS
+Doha|QA
+Belgrade|RS
+Moscow|RU
+Saint Petersburg;St Petersburg;St. Petersburg;Leningrad|RU
+Grozny|RU
+Novosibirsk|RU
+Yekaterinburg|RU
+Kazan|RU
+Rostov-on-Don|RU
+Sochi|RU
+Vladivostok|RU
+Kaliningrad|RU
+Murmansk|RU
+Nizhny Novgorod|RU
+Krasnodar|RU
+Samara|RU
+Riyadh|SA
+Jeddah|SA
+Khartoum|SD
+Omdurman|SD
+Nyala|SD
+El Fasher;Al Fashir|SD
+Juba|SS
+Mogadishu|SO
+Kismayo|SO
+Damascus|SY
+Aleppo|SY
+Homs|SY
+Hama|SY
+Latakia|SY
+Raqqa|SY
+Idlib|SY
+Deir ez-Zor;Deir ez Zor|SY
+Tartus|SY
+Tunis|TN
+Istanbul|TR
+Ankara|TR
+Kyiv;Kiev|UA
+Donetsk|UA
+Luhansk;Lugansk|UA
+Sevastopol|UA
+Simferopol|UA
+Yalta|UA
+Kerch|UA
+Mariupol|UA
+Melitopol|UA
+Kherson|UA
+Zaporizhzhia;Zaporozhye|UA
+Dubai|AE
+Abu Dhabi|AE
+Sharjah|AE
+Caracas|VE
+Maracaibo|VE
+Sanaa;Sana'a|YE
+Aden|YE
+Hodeidah|YE
+Harare|ZW
+Bulawayo|ZW
+"""
+
+
+def normalise_key(value):
+    """Casefolded, accent-free, punctuation-free form used as the lookup key."""
+    if not value:
+        return ""
+    value = unicodedata.normalize("NFKD", value)
+    value = "".join(c for c in value if not unicodedata.combining(c))
+    value = re.sub(r"[^\w]+", " ", value.casefold().replace("'", "").replace("’", ""))
+    return " ".join(value.split())
+
+
+@lru_cache(maxsize=None)
+def _tables():
+    countries = {}
+    for line in _COUNTRIES.strip().splitlines():
+        code, name, *rest = line.split("|")
+        for spelling in (code, name, *(rest[0].split(";") if rest else ())):
+            countries.setdefault(normalise_key(spelling), code)
+    cities = {}
+    for line in _CITIES.strip().splitlines():
+        spellings, code = line.split("|")
+        for spelling in spellings.split(";"):
+            cities.setdefault(normalise_key(spelling), code)
+    return countries, cities
+
+
+def country_code(value):
+    """ISO 3166-1 alpha-2 code for a country name or spelling, or ``""``."""
+    key = normalise_key(value)
+    if not key:
+        return ""
+    countries = _tables()[0]
+    code = countries.get(key)
+    if code is None and "(" in value:
+        # "Iran (Islamic Republic of)" style qualifiers
+        code = countries.get(normalise_key(value.split("(")[0]))
+    return code or ""
+
+
+def city_country_code(value):
+    """ISO code of the country a known city is in, or ``""``; only the whole name is matched."""
+    return _tables()[1].get(normalise_key(value), "")
+
+
+def clean_place_name(value):
+    """
+    City/region clean-up: drop "city" and "province" (together with the word
+    before "province"), strip separators from each word and remove repeated
+    words.  Blank and "UNKNOWN" values give ``""``.
+    """
+    if not value or not value.strip() or value.strip().upper() == "UNKNOWN":
+        return ""
+    filtered = []
+    for w in value.split():
+        w_clean = re.sub(r"[,.\-;:]", "", w).strip()
+        lw = w_clean.lower()
+        if lw == "province":
+            if filtered:
+                filtered.pop()
+            continue
+        if lw == "city":
+            continue
+        if w_clean:
+            filtered.append(w_clean)
+
+    seen = set()
+    unique = []
+    for w in filtered:
+        wl = w.lower()
+        if wl not in seen:
+            unique.append(w)
+            seen.add(wl)
+    return " ".join(unique).strip()
+
+
+def clean_place_column(values):
+    return map_distinct(values, clean_place_name)
+
+
+def country_code_column(countries, cities=None):
+    """ISO codes for a column of country names; falls back to the city when the country is unknown."""
+    cities = cities if cities is not None else [""] * len(countries)
+    return map_distinct(list(zip(countries, cities)),
+                        lambda pair: country_code(pair[0]) or city_country_code(pair[1]))
+
+
+def _country_codes(value, sep):
+    codes = [country_code(v) for v in value.split(sep)] if value else []
+    return sep.join(dict.fromkeys(c for c in codes if c))
+
+
+def country_codes_column(values, sep="; "):
+    """ISO codes for a column of ``sep``-joined country lists, kept in the same order."""
+    return map_distinct(values, lambda value: _country_codes(value, sep))
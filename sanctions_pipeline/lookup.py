@@ -0,0 +1,377 @@
+"""
+Name lookup service.
+
+A small asyncio HTTP server on 127.0.0.1 that answers single-name queries
+against the latest published output:
+
+    GET /lookup?q=NAME[&mode=exact|prefix|token][&limit=20]
+    GET /metrics
+    GET /health
+
+When the pipeline's ``sanctions_output.idx`` is the newest output, a private
+copy of it is memory-mapped as a ``nameindex.MappedNameIndex``, which needs no
+build step.  Mapping a copy leaves the published file free to be replaced,
+which Windows refuses for a mapped file.
+Otherwise the whole output is loaded into a ``NameIndex``.  Names and aliases are
+indexed by their ``all_variants`` keys for exact and prefix queries and by
+word for token queries.  The output file is checked every
+``reload_interval`` seconds.  When it changes, a new index is built in a
+worker thread and then swapped in with a single assignment.  Lookups run
+synchronously on the event loop, so none can be in progress at the swap and
+the old index is closed (a mapped copy deleted) right away.
+"""
+import asyncio
+import csv
+import json
+import os
+import shutil
+import tempfile
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+from .exporters import LIST_COLUMNS, split_multi
+from .normalize import all_variants, remove_punctuation, strip_accents
+
+# Output formats the service can load; the newest one is used.
+LOADERS = (".idx", ".jsonl", ".csv", ".xlsx")
+MODES = ("exact", "prefix", "token")
+MAX_LIMIT = 200
+
+
+def _load_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _load_csv(path):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return [_split_lists(row) for row in csv.DictReader(f)]
+
+
+def _load_xlsx(path):
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(h) for h in next(rows)]
+        return [_split_lists({h: ("" if v is None else str(v)) for h, v in zip(header, values)})
+                for values in rows]
+    finally:
+        wb.close()
+
+
+def _split_lists(row):
+    for name, sep in LIST_COLUMNS.items():
+        if name in row:
+            row[name] = split_multi(row[name], sep)
+    return row
+
+
+def published_output(base_path):
+    """
+    The loadable output next to ``base_path``, or ``None``: the ``.idx`` when it
+    is at least as new as every other output, otherwise the newest one.
+    """
+    base_path = Path(base_path)
+    candidates = {p: p.stat().st_mtime_ns for p in (base_path.with_suffix(s) for s in LOADERS) if p.exists()}
+    if not candidates:
+        return None
+    newest = max(candidates.values())
+    return next(p for p, mtime in candidates.items() if mtime == newest)
+
+
+def load_output_rows(path):
+    path = Path(path)
+    loader = {".jsonl": _load_jsonl, ".csv": _load_csv, ".xlsx": _load_xlsx}[path.suffix.lower()]
+    return loader(path)
+
+
+def _tokens(text):
+    return remove_punctuation(strip_accents(text)).split()
+
+
+def name_postings(rows):
+    """``({all_variants key: [row]}, {token: [row]})`` over each row's FULL_NAME and ALIAS."""
+    exact = {}
+    tokens = {}
+    for idx, row in enumerate(rows):
+        for name in (row.get("FULL_NAME"), *row.get("ALIAS", ())):
+            if not name or name == "UNKNOWN":
+                continue
+            for key in set(all_variants(name)):
+                ids = exact.setdefault(key, [])
+                if not ids or ids[-1] != idx:
+                    ids.append(idx)
+            for token in _tokens(name):
+                ids = tokens.setdefault(token, [])
+                if not ids or ids[-1] != idx:
+                    ids.append(idx)
+    return exact, tokens
+
+
+class NameIndex:
+    """Read-only index over output rows; never mutated after construction."""
+
+    def __init__(self, rows, source=None):
+        self.rows = rows
+        self.source = str(source) if source else None
+        self.loaded_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        self.exact, self.tokens = name_postings(rows)
+        self.keys = sorted(self.exact)
+
+    @classmethod
+    def from_file(cls, path):
+        if Path(path).suffix.lower() == ".idx":
+            from .nameindex import MappedNameIndex
+
+            return MappedNameIndex(path)
+        return cls(load_output_rows(path), source=path)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def lookup(self, query, mode="exact", limit=20):
+        """Return matching row indices, in row order for exact/token and key order for prefix."""
+        if mode == "exact":
+            ids = set()
+            for key in set(all_variants(query)):
+                ids.update(self.exact.get(key, ()))
+            return sorted(ids)[:limit]
+
+        if mode == "prefix":
+            ids = []
+            seen = set()
+            for key in sorted(set(all_variants(query))):
+                if not key:
+                    continue
+                pos = bisect_left(self.keys, key)
+                while pos < len(self.keys) and self.keys[pos].startswith(key) and len(ids) < limit:
+                    for idx in self.exact[self.keys[pos]]:
+                        if idx not in seen:
+                            seen.add(idx)
+                            ids.append(idx)
+                    pos += 1
+            return ids[:limit]
+
+        if mode == "token":
+            postings = [self.tokens.get(t, ()) for t in dict.fromkeys(_tokens(query))]
+            if not postings:
+                return []
+            postings.sort(key=len)
+            ids = set(postings[0]).intersection(*postings[1:])
+            return sorted(ids)[:limit]
+
+        raise ValueError(f"unknown mode {mode!r}; choose from {', '.join(MODES)}")
+
+
+def map_index_copy(path):
+    """``MappedNameIndex`` over a private temporary copy of ``path``; ``close_index`` deletes the copy."""
+    from .nameindex import MappedNameIndex
+
+    fd, copy = tempfile.mkstemp(prefix=f"{Path(path).stem}-", suffix=".idx")
+    os.close(fd)
+    try:
+        shutil.copyfile(path, copy)
+        index = MappedNameIndex(copy)
+    except BaseException:
+        os.unlink(copy)
+        raise
+    index.source = str(path)
+    index.copy_path = copy
+    return index
+
+
+def load_index(path):
+    """Index for a published output; ``.idx`` files are mapped from a private copy."""
+    if Path(path).suffix.lower() == ".idx":
+        return map_index_copy(path)
+    return NameIndex.from_file(path)
+
+
+def close_index(index):
+    """Release a mapped index and delete its copy; in-memory indexes need nothing."""
+    close = getattr(index, "close", None)
+    if close is None:
+        return
+    close()
+    copy = getattr(index, "copy_path", None)
+    if copy:
+        try:
+            os.unlink(copy)
+        except OSError as e:
+            print("⚠️ Warning: could not delete", copy, "-", str(e))
+
+
+class LatencyWindow:
+    """Handling times of the last ``size`` requests, in milliseconds."""
+
+    def __init__(self, size=10000):
+        self.samples = deque(maxlen=size)
+        self.total = 0
+
+    def add(self, ms):
+        self.samples.append(ms)
+        self.total += 1
+
+    def summary(self):
+        data = sorted(self.samples)
+        if not data:
+            return {"requests": self.total, "window": 0, "p50_ms": None, "p99_ms": None, "max_ms": None}
+
+        def pct(p):
+            return round(data[min(len(data) - 1, int(p * len(data)))], 3)
+
+        return {"requests": self.total, "window": len(data),
+                "p50_ms": pct(0.50), "p99_ms": pct(0.99), "max_ms": round(data[-1], 3)}
+
+
+class LookupService:
+    def __init__(self, base_path, port=8766, reload_interval=5.0):
+        self.base_path = Path(base_path)
+        self.port = port
+        self.reload_interval = reload_interval
+        self.index = NameIndex([])
+        self._signature = None
+        self.reloads = 0
+        self.latency = {mode: LatencyWindow() for mode in MODES}
+
+    # -- index ----------------------------------------------------------------
+
+    def _output_signature(self):
+        path = published_output(self.base_path)
+        if path is None:
+            return None
+        st = os.stat(path)
+        return (str(path), st.st_mtime_ns, st.st_size)
+
+    async def reload_if_changed(self):
+        signature = self._output_signature()
+        if signature is None or signature == self._signature:
+            return False
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        try:
+            index = await loop.run_in_executor(None, load_index, signature[0])
+        except Exception as e:
+            print("⚠️ Warning: could not load", signature[0], "-", str(e))
+            return False
+        old, self.index = self.index, index
+        close_index(old)
+        self._signature = signature
+        self.reloads += 1
+        print(f"🔄 Index loaded from {signature[0]}: {len(index)} rows, {len(index.keys)} keys "
+              f"in {time.perf_counter() - start:.2f}s")
+        return True
+
+    async def _watch_output(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            await self.reload_if_changed()
+
+    # -- HTTP -----------------------------------------------------------------
+
+    def metrics(self):
+        index = self.index
+        return {
+            "index": {"rows": len(index), "keys": len(index.keys), "tokens": len(index.tokens),
+                      "source": index.source, "loaded_at": index.loaded_at, "reloads": self.reloads},
+            "latency": {mode: window.summary() for mode, window in self.latency.items()},
+        }
+
+    def handle_lookup(self, params):
+        query = (params.get("q") or [""])[0].strip()
+        mode = (params.get("mode") or ["exact"])[0].lower()
+        try:
+            limit = max(1, min(MAX_LIMIT, int((params.get("limit") or ["20"])[0])))
+        except ValueError:
+            return 400, {"error": "limit must be an integer"}
+        if not query:
+            return 400, {"error": "missing q"}
+        if mode not in MODES:
+            return 400, {"error": f"mode must be one of {', '.join(MODES)}"}
+
+        start = time.perf_counter()
+        index = self.index
+        ids = index.lookup(query, mode, limit)
+        results = [index.rows[i] for i in ids]
+        took_ms = (time.perf_counter() - start) * 1000
+        self.latency[mode].add(took_ms)
+        return 200, {"query": query, "mode": mode, "count": len(results),
+                     "took_ms": round(took_ms, 3), "results": results}
+
+    def route(self, target):
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        if path == "/lookup":
+            return self.handle_lookup(parse_qs(url.query))
+        if path == "/metrics":
+            return 200, self.metrics()
+        if path in ("/", "/health"):
+            return 200, {"ok": True, "rows": len(self.index)}
+        return 404, {"error": "not found"}
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                parts = request_line.decode("latin-1").split()
+                if len(parts) != 3:
+                    break
+                method, target, version = parts
+                if method != "GET":
+                    status, payload = 405, {"error": "only GET is supported"}
+                else:
+                    try:
+                        status, payload = self.route(target)
+                    except Exception as e:
+                        status, payload = 500, {"error": str(e)}
+
+                keep_alive = (version == "HTTP/1.1" and headers.get("connection", "").lower() != "close") \
+                    or headers.get("connection", "").lower() == "keep-alive"
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {'OK' if status == 200 else 'Error'}\r\n"
+                    "Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        await self.reload_if_changed()
+        if self._signature is None:
+            print(f"⚠️ No published output next to {self.base_path} yet; waiting for one.")
+        server = await asyncio.start_server(self._handle_connection, "127.0.0.1", self.port)
+        print(f"🔎 Lookup service on http://127.0.0.1:{self.port}/lookup?q=NAME")
+        watcher = asyncio.create_task(self._watch_output())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            watcher.cancel()
+            close_index(self.index)
+
+
+def serve(paths, port=8766, reload_interval=5.0):
+    asyncio.run(LookupService(paths.xlsx_path, port=port, reload_interval=reload_interval).serve())
@@ -0,0 +1,190 @@
+"""
+Binary name index published next to the output (``sanctions_output.idx``).
+
+Screening tools memory-map the file and query it straight away, without
+parsing a workbook or building dictionaries first.  Every process that maps
+the same file shares its pages.  The file holds:
+
+* the sorted ``all_variants`` keys of every name and alias, each with the
+  rows it appears in;
+* the sorted name tokens with their rows;
+* every row as JSON (the ``jsonl`` representation) behind an offset table,
+  so a hit is decoded only when it is read.
+
+All integers are little-endian.  The header is ``MAGIC``, ``VERSION``, the
+row, key and token counts, then ``(offset, size)`` for each of ``SECTIONS``.
+A reader rejects any other magic or version.  Keys and tokens are UTF-8 and
+sorted by their bytes, which is code point order, so prefix scans are
+contiguous.  Writers replace the file atomically.  On POSIX a reader that
+still maps the old file keeps a consistent view; Windows cannot replace a
+mapped file, so long-running readers such as ``serve`` map a private copy.
+"""
+import json
+import mmap
+import struct
+from datetime import datetime, timezone
+
+from .binfile import Strings, le_bytes, string_table, typed_section
+
+MAGIC = b"SNIX"
+VERSION = 1
+SECTIONS = (
+    "key_offsets", "key_blob", "key_row_offsets", "key_rows",
+    "token_offsets", "token_blob", "token_row_offsets", "token_rows",
+    "row_offsets", "row_blob",
+)
+# Offsets are u64, row numbers u32.
+_TYPECODES = {"key_offsets": "Q", "key_row_offsets": "Q", "key_rows": "I",
+              "token_offsets": "Q", "token_row_offsets": "Q", "token_rows": "I", "row_offsets": "Q"}
+HEADER = struct.Struct("<4sIQQQ" + "QQ" * len(SECTIONS))
+
+
+def _postings_table(lists):
+    offsets = [0]
+    flat = []
+    for ids in lists:
+        flat.extend(ids)
+        offsets.append(len(flat))
+    return le_bytes(offsets, "Q"), le_bytes(flat, "I")
+
+
+def write_name_index(table, path):
+    """Write the index for an ``OutputTable`` to ``path``."""
+    from .lookup import name_postings
+
+    rows = list(table.iter_records())
+    exact, tokens = name_postings(rows)
+    keys = sorted((k.encode("utf-8"), ids) for k, ids in exact.items())
+    toks = sorted((t.encode("utf-8"), ids) for t, ids in tokens.items())
+
+    encoded_rows = [json.dumps(row, ensure_ascii=False).encode("utf-8") for row in rows]
+    sections = {}
+    sections["key_offsets"], sections["key_blob"] = string_table([k for k, _ in keys])
+    sections["key_row_offsets"], sections["key_rows"] = _postings_table([ids for _, ids in keys])
+    sections["token_offsets"], sections["token_blob"] = string_table([t for t, _ in toks])
+    sections["token_row_offsets"], sections["token_rows"] = _postings_table([ids for _, ids in toks])
+    sections["row_offsets"], sections["row_blob"] = string_table(encoded_rows)
+
+    layout = []
+    pos = HEADER.size
+    for name in SECTIONS:
+        pos += -pos % 8
+        layout.extend((pos, len(sections[name])))
+        pos += len(sections[name])
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(rows), len(keys), len(toks), *layout))
+        for i, name in enumerate(SECTIONS):
+            f.write(b"\0" * (layout[2 * i] - f.tell()))
+            f.write(sections[name])
+    return path
+
+
+class _Rows(Strings):
+    def __getitem__(self, i):
+        return json.loads(super().__getitem__(i))
+
+
+class MappedNameIndex:
+    """
+    Read-only view of an index file; same ``lookup`` results as
+    ``lookup.NameIndex`` built from the same rows.
+    """
+
+    def __init__(self, path):
+        self.source = str(path)
+        self.loaded_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        try:
+            if len(view) < HEADER.size:
+                raise ValueError(f"{path} is not a name index")
+            magic, version, self.row_count, key_count, token_count, *layout = HEADER.unpack_from(view)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a name index")
+            if version != VERSION:
+                raise ValueError(f"{path} is index version {version}; this reader supports version {VERSION}")
+        except ValueError:
+            view.release()
+            self._mmap.close()
+            raise
+
+        parts = {}
+        for i, name in enumerate(SECTIONS):
+            offset, size = layout[2 * i], layout[2 * i + 1]
+            part = view[offset:offset + size]
+            typecode = _TYPECODES.get(name)
+            parts[name] = typed_section(part, typecode) if typecode else part
+        self._view = view
+        self._parts = parts
+        self.keys = Strings(parts["key_offsets"], parts["key_blob"])
+        self.tokens = Strings(parts["token_offsets"], parts["token_blob"])
+        self.rows = _Rows(parts["row_offsets"], parts["row_blob"])
+
+    def __len__(self):
+        return self.row_count
+
+    def close(self):
+        self.keys = self.tokens = self.rows = None
+        for part in self._parts.values():
+            if isinstance(part, memoryview):
+                part.release()
+        self._parts = {}
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _key_rows(self, pos):
+        offsets = self._parts["key_row_offsets"]
+        return self._parts["key_rows"][offsets[pos]:offsets[pos + 1]]
+
+    def _token_rows(self, pos):
+        offsets = self._parts["token_row_offsets"]
+        return self._parts["token_rows"][offsets[pos]:offsets[pos + 1]]
+
+    def lookup(self, query, mode="exact", limit=20):
+        from .lookup import MODES, _tokens
+        from .normalize import all_variants
+
+        if mode == "exact":
+            ids = set()
+            for key in set(all_variants(query)):
+                pos = self.keys.find(key.encode("utf-8"))
+                if pos is not None:
+                    ids.update(self._key_rows(pos))
+            return sorted(ids)[:limit]
+
+        if mode == "prefix":
+            ids = []
+            seen = set()
+            for key in sorted(set(all_variants(query))):
+                if not key:
+                    continue
+                prefix = key.encode("utf-8")
+                pos = self.keys.bisect_left(prefix)
+                while pos < len(self.keys) and self.keys.raw(pos).startswith(prefix) and len(ids) < limit:
+                    for idx in self._key_rows(pos):
+                        if idx not in seen:
+                            seen.add(idx)
+                            ids.append(idx)
+                    pos += 1
+            return ids[:limit]
+
+        if mode == "token":
+            postings = []
+            for token in dict.fromkeys(_tokens(query)):
+                pos = self.tokens.find(token.encode("utf-8"))
+                postings.append(self._token_rows(pos) if pos is not None else ())
+            if not postings:
+                return []
+            postings.sort(key=len)
+            ids = set(postings[0]).intersection(*postings[1:])
+            return sorted(ids)[:limit]
+
+        raise ValueError(f"unknown mode {mode!r}; choose from {', '.join(MODES)}")
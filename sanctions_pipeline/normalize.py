@@ -0,0 +1,136 @@
+"""
+Name normalisation helpers shared by the conversion stage and its matchers.
+"""
+import re
+import unicodedata
+
+import regex
+
+_NON_WORD_RE = regex.compile(r"[^\p{L}\p{N}\s]")
+
+
+def clean_fullname_no_accents_final(s: str) -> str:
+    if not s:
+        return ""
+
+    nfkd = unicodedata.normalize("NFKD", s)
+    s = "".join(c for c in nfkd if not unicodedata.combining(c))
+
+    repl = {
+        "\u2018": "'", "\u2019": "'", "\u201B": "'",
+        "\u201C": '"', "\u201D": '"',
+        "\u2013": "-", "\u2014": "-",
+        "\u00A0": " ",
+    }
+    for bad, good in repl.items():
+        s = s.replace(bad, good)
+
+    s = re.sub(r"[^A-Za-z0-9 .,'\-()]", "", s)
+    s = re.sub(r"\s+", " ", s).strip()
+
+    return s.title()
+
+
+# Script=Latin code point ranges (Unicode 17.0 Scripts.txt, the data behind
+# regex's \p{Latin}).
+LATIN_RANGES = (
+    (0x0041, 0x005A), (0x0061, 0x007A), (0x00AA, 0x00AA), (0x00BA, 0x00BA), (0x00C0, 0x00D6),
+    (0x00D8, 0x00F6), (0x00F8, 0x02B8), (0x02E0, 0x02E4), (0x1D00, 0x1D25), (0x1D2C, 0x1D5C),
+    (0x1D62, 0x1D65), (0x1D6B, 0x1D77), (0x1D79, 0x1DBE), (0x1E00, 0x1EFF), (0x2071, 0x2071),
+    (0x207F, 0x207F), (0x2090, 0x209F), (0x212A, 0x212B), (0x2132, 0x2132), (0x214E, 0x214E),
+    (0x2160, 0x2188), (0x2C60, 0x2C7F), (0xA722, 0xA787), (0xA78B, 0xA7DD), (0xA7E2, 0xA7E2),
+    (0xA7F1, 0xA7FF), (0xAB30, 0xAB5A), (0xAB5C, 0xAB64), (0xAB66, 0xAB69), (0xAB6C, 0xAB6D),
+    (0xFB00, 0xFB06), (0xFF21, 0xFF3A), (0xFF41, 0xFF5A), (0x10780, 0x10785), (0x10787, 0x107B0),
+    (0x107B2, 0x107BF), (0x1DF00, 0x1DF81), (0x1DF90, 0x1DF96), (0x1DFCD, 0x1DFF2), (0x1DFF5, 0x1DFFF),
+)
+# Besides Latin letters a name may hold ASCII digits, this punctuation and any
+# whitespace (str.isspace, i.e. what \s matches).
+_NAME_PUNCTUATION = "0123456789 .,'-()"
+_WHITESPACE = ("\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005"
+               "\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000")
+# Typographic quotes, dashes and spaces, and Cyrillic look-alikes, folded before the check.
+LATIN_FOLD = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201B": "'",
+    "\u201C": " ", "\u201D": " ", "\u201F": " ", '"': " ",
+    "\u00A0": " ", "\u202F": " ",
+    "\u2013": "-", "\u2014": "-", "\u2010": "-", "\u2011": "-", "\u2012": "-",
+    "\u0406": "I", "\u0456": "i", "\u0401": "E", "\u0451": "e",
+})
+
+
+def _latin_name_table():
+    """translate() table deleting every character a Latin name may contain, after folding."""
+    allowed = dict.fromkeys(cp for start, end in LATIN_RANGES for cp in range(start, end + 1))
+    allowed.update(dict.fromkeys(map(ord, _NAME_PUNCTUATION + _WHITESPACE)))
+    for cp, folded in LATIN_FOLD.items():
+        if all(ord(c) in allowed for c in folded):
+            allowed[cp] = None
+    return allowed
+
+
+_LATIN_NAME_TABLE = _latin_name_table()
+
+
+def is_latin_name(text):
+    """True when ``text`` is non-blank and, after ``LATIN_FOLD``, only Latin letters, digits, spaces and .,'-()"""
+    if not text:
+        return False
+    text = text.strip()
+    return bool(text) and not text.translate(_LATIN_NAME_TABLE)
+
+
+def clean_name(name):
+    name = re.sub(r"\s+", " ", name).strip()
+    return name.title()
+
+
+MALE_TITLES = [
+    "mullah", "maulavi", "mawlavi", "moulavi", "molvi", "qari", "ustad",
+    "imam", "amir", "haji", "hajji", "agha", "khan", "pir", "sardar",
+    "sayed", "sayyid", "syed", "janan agha"
+]
+MALE_NAME_PATTERNS = [
+    "gul ahmad", "gul ahmed", "abdul", "mohammad", "mohammed", "rahman",
+    "hakim", "hakimi", "ullah", "uddin", "ishakzai", "noorzai", "zai"
+]
+
+
+def is_forced_male(name):
+    if not name:
+        return False
+    n = name.lower()
+    for t in MALE_TITLES:
+        if t in n:
+            return True
+    for p in MALE_NAME_PATTERNS:
+        if p in n:
+            return True
+    return False
+
+
+def norm_keep_accents(s: str) -> str:
+    if not s:
+        return ""
+    return re.sub(r"\s+", " ", s).strip().lower()
+
+
+def remove_punctuation(s: str) -> str:
+    if not s:
+        return ""
+    s2 = _NON_WORD_RE.sub(" ", s)
+    return re.sub(r"\s+", " ", s2).strip().lower()
+
+
+def strip_accents(s: str) -> str:
+    if not s:
+        return ""
+    nfkd = unicodedata.normalize('NFKD', s)
+    only_ascii = "".join([c for c in nfkd if not unicodedata.combining(c)])
+    return re.sub(r"\s+", " ", only_ascii).strip().lower()
+
+
+def all_variants(s: str):
+    k1 = norm_keep_accents(s)
+    k2 = remove_punctuation(s)
+    k3 = strip_accents(s)
+    return k1, k2, k3
@@ -0,0 +1,250 @@
+"""
+Programme-partitioned conversion.
+
+The entities in the XML chunk archive are grouped by the programme recorded
+in each member comment.  Enrichment, the expensive per-entity part, runs
+once per partition.  It runs in parallel and its rows are cached under
+``data/partitions/`` by a hash of the partition's chunk bytes, so a
+publication that only touches one programme only re-enriches that one.
+
+PDF matching and the REM2 neighbour pass work across the whole list in
+entity order.  They run on the combined rows, which are the partitions
+concatenated and put back into entity order, so ``sanctions_output`` is
+the same as from the unpartitioned conversion.  Each programme also gets its
+own ``data/programmes/<programme>.<format>``.  A file is rewritten only when
+that programme's final rows changed.
+"""
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+from .artifacts import ChunkArchive, temp_path
+from .config import OUTPUT_COLUMNS
+
+# Bump when the enrichment rules change so cached partitions are rebuilt.
+ENRICHMENT_VERSION = 2
+DEFAULT_PROGRAMME = "GEN"
+
+
+def partition_file_name(programme):
+    """File-safe name for a programme; a short hash keeps sanitised names apart."""
+    name = re.sub(r"[^A-Za-z0-9_-]", "_", programme)
+    if name == programme and name:
+        return name
+    return f"{name or DEFAULT_PROGRAMME}-{hashlib.sha256(programme.encode()).hexdigest()[:8]}"
+
+
+def prune_stale(directory, keep, pattern="*"):
+    """Delete the files in ``directory`` matching ``pattern`` whose name is not in ``keep``; returns their names."""
+    removed = []
+    for path in sorted(directory.glob(pattern)):
+        if path.is_file() and path.name not in keep:
+            path.unlink()
+            removed.append(path.name)
+    return removed
+
+
+def partition_entities(xml_archive):
+    """``{programme: [seq, ...]}`` in first-seen programme order, from the member comments."""
+    from .xmlbackend import get_backend
+
+    backend = None
+    partitions = {}
+    with ChunkArchive(xml_archive) as archive:
+        for seq in archive.numbers():
+            programme = archive.programme(seq)
+            if programme is None:
+                # Archives written before programmes were recorded: read the chunk.
+                backend = backend or get_backend()
+                programme = _chunk_programme(backend, archive.read_bytes(seq))
+            partitions.setdefault(programme or DEFAULT_PROGRAMME, []).append(seq)
+    return partitions
+
+
+def _chunk_programme(backend, data):
+    try:
+        root = backend.fromstring(data)
+    except Exception:
+        return None
+    for elem in root.iter():
+        if isinstance(elem.tag, str) and elem.tag.rpartition("}")[2] == "regulation":
+            return elem.attrib.get("programme", "").strip() or None
+    return None
+
+
+def partition_digest(xml_archive, seqs):
+    digest = hashlib.sha256(f"v{ENRICHMENT_VERSION}".encode())
+    with ChunkArchive(xml_archive) as archive:
+        for seq in seqs:
+            data = archive.read_bytes(seq)
+            digest.update(len(data).to_bytes(8, "big"))
+            digest.update(data)
+    return digest.hexdigest()
+
+
+def enrich_partition(xml_archive, seqs):
+    """
+    Worker: the raw rows of ``seqs`` as ``{"columns": {...}, "flags": [...]}``.
+    REM2 holds each entity's PDF lookup keys; matching happens on the
+    combined rows.
+    """
+    from .conversion import get_gender_detector
+    from .records import RecordBatch
+    from .sources.eu import EUTravelBanAdapter
+
+    adapter = EUTravelBanAdapter(detector=get_gender_detector())
+    batch = RecordBatch()
+    with ChunkArchive(xml_archive) as archive:
+        for row, flags in adapter.iter_chunk_records(archive, seqs, adapter.xml_backend):
+            batch.append(row, flags)
+    return {"columns": batch.columns, "flags": batch.flags}
+
+
+def combine_parts(parts):
+    """
+    Concatenate ``(seqs, enrich_partition result)`` parts and put the rows
+    back in entity order; returns ``(seqs, columns, flags)``.
+    """
+    order = []
+    columns = {name: [] for name in OUTPUT_COLUMNS}
+    flags = []
+    for seqs, part in parts:
+        order.extend(seqs)
+        for name in OUTPUT_COLUMNS:
+            columns[name].extend(part["columns"][name])
+        flags.extend(part["flags"])
+    permutation = sorted(range(len(order)), key=order.__getitem__)
+    columns = {name: [values[i] for i in permutation] for name, values in columns.items()}
+    return [order[i] for i in permutation], columns, [flags[i] for i in permutation]
+
+
+def finish_table(columns, flags, pdf_mapping):
+    """Match REM2 against ``pdf_mapping`` and run the column pass over combined rows."""
+    from .records import RecordBatch
+    from .sources.eu import EUTravelBanAdapter
+
+    # Cached partitions come back from JSON with the lookup keys as lists.
+    columns["REM2"] = [tuple(keys) for keys in columns["REM2"]]
+    return EUTravelBanAdapter(pdf_mapping=pdf_mapping).complete(RecordBatch.from_columns(columns, flags))
+
+
+def _load_cached(path, digest):
+    try:
+        with open(path, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cached if cached.get("digest") == digest else None
+
+
+def write_json(path, payload):
+    tmp = temp_path(path)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _rows_digest(table, rows):
+    digest = hashlib.sha256()
+    for idx in rows:
+        digest.update(json.dumps([table.flat_value(n, idx) for n in table.names], ensure_ascii=False).encode())
+        digest.update(bytes([int(table.status[idx]) if table.status is not None else 0]))
+    return digest.hexdigest()
+
+
+def convert_partitioned(paths, formats=("xlsx",), workers=None, pdf_mapping=None):
+    """
+    Build ``sanctions_output`` and the per-programme outputs.  Returns
+    ``(table, written, summary)``: the combined table, ``{name: path}`` for
+    every file written and which partitions were re-enriched or rewritten.
+    """
+    from .conversion import build_pdf_rem2_mapping
+    from .exporters import WRITERS, OutputTable, export_table, publish_table
+
+    xml_archive = paths.xml_chunks_archive
+    cache_dir = paths.partitions_dir
+    out_dir = paths.programmes_dir
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    partitions = partition_entities(xml_archive)
+    print(f"🗂️ {sum(map(len, partitions.values()))} XML entities in {len(partitions)} programme partition(s)")
+
+    results = {}
+    stale = []
+    for programme, seqs in partitions.items():
+        path = cache_dir / f"{partition_file_name(programme)}.json"
+        digest = partition_digest(xml_archive, seqs)
+        cached = _load_cached(path, digest)
+        if cached is not None:
+            results[programme] = cached
+        else:
+            stale.append((programme, seqs, path, digest))
+
+    workers = workers or min(len(stale), os.cpu_count() or 1)
+    if len(stale) > 1 and workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(enrich_partition, xml_archive, seqs) for _, seqs, _, _ in stale]
+            built = [f.result() for f in futures]
+    else:
+        built = [enrich_partition(xml_archive, seqs) for _, seqs, _, _ in stale]
+    for (programme, _, path, digest), result in zip(stale, built):
+        result["digest"] = digest
+        write_json(path, result)
+        results[programme] = result
+    print(f"♻️ Reused {len(partitions) - len(stale)} partition(s), enriched {len(stale)}: "
+          f"{', '.join(p for p, *_ in stale) or 'none'}")
+
+    # Combined view: concatenate, then back into entity order.
+    seqs, columns, flags = combine_parts((seqs, results[programme]) for programme, seqs in partitions.items())
+    seq_programme = {seq: programme for programme, seqs in partitions.items() for seq in seqs}
+    programmes = [seq_programme[seq] for seq in seqs]
+
+    if pdf_mapping is None:
+        pdf_mapping = build_pdf_rem2_mapping(paths.pdf_chunks_archive)
+    print(f"Found {len(flags)} XML entities – PDF mapping entries: {len(pdf_mapping)}")
+    table = finish_table(columns, flags, pdf_mapping)
+    published = publish_table(table, formats, paths.xlsx_path, pdf_mapping)
+    written = {f"combined.{fmt}": path for fmt, path in published.items()}
+
+    # Per-programme outputs, only where the final rows changed.
+    index_path = cache_dir / "outputs.json"
+    try:
+        with open(index_path, encoding="utf-8") as f:
+            previous = json.load(f)
+    except (OSError, ValueError):
+        previous = {}
+    rows_by_programme = {}
+    for idx, programme in enumerate(programmes):
+        rows_by_programme.setdefault(programme, []).append(idx)
+
+    current = {}
+    rewritten = []
+    for programme, rows in rows_by_programme.items():
+        name = partition_file_name(programme)
+        digest = _rows_digest(table, rows)
+        current[programme] = {"rows": digest, "formats": sorted(formats)}
+        targets = [out_dir / f"{name}{WRITERS[fmt][0]}" for fmt in formats]
+        if previous.get(programme) == current[programme] and all(t.exists() for t in targets):
+            continue
+        part = OutputTable({n: [table.columns[n][i] for i in rows] for n in table.names},
+                           table.status[rows] if table.status is not None else None)
+        for fmt, path in export_table(part, formats, out_dir / f"{name}.xlsx").items():
+            written[f"{programme}.{fmt}"] = path
+        rewritten.append(programme)
+    write_json(index_path, current)
+    print(f"📁 Programme outputs rewritten: {', '.join(rewritten) or 'none'}")
+
+    # Programmes that dropped out of the feed, and formats no longer asked for: their files go.
+    names = {partition_file_name(programme) for programme in partitions}
+    outputs = {f"{name}{WRITERS[fmt][0]}" for name in names for fmt in formats}
+    removed = (prune_stale(cache_dir, {f"{name}.json" for name in names} | {index_path.name}, "*.json")
+               + prune_stale(out_dir, outputs))
+    if removed:
+        print(f"🧹 Removed {len(removed)} stale programme file(s): {', '.join(removed)}")
+
+    summary = {"partitions": len(partitions), "enriched": [p for p, *_ in stale], "rewritten": rewritten,
+               "removed": removed, "rows": len(table)}
+    return table, written, summary
@@ -0,0 +1,170 @@
+"""
+PDF stage: extract the regulation text and cut it into per-entity chunks.
+
+Text extraction goes through one of ``PDF_BACKENDS``, each a generator of
+per-page text:
+
+* ``pdfplumber`` (default) is pdfplumber's ``extract_text``;
+* ``pdfminer`` runs pdfminer without layout analysis and groups the
+  characters into lines and words with pdfplumber's default tolerances;
+* ``pdfium`` uses pypdfium2's text page, with each line's whitespace
+  normalised the way pdfplumber does it.
+
+Set ``SANCTIONS_PDF_BACKEND`` to pick one; ``bench pdf`` compares them.
+"""
+import os
+import re
+
+from .artifacts import ChunkWriter
+
+# pdfplumber's extract_text defaults.
+X_TOLERANCE = 3
+Y_TOLERANCE = 3
+
+
+def _pdfplumber_pages(pdf_file_path):
+    import pdfplumber
+
+    with pdfplumber.open(pdf_file_path) as pdf:
+        for p in pdf.pages:
+            yield p.extract_text()
+
+
+def _pdfminer_pages(pdf_file_path):
+    from pdfminer.converter import PDFPageAggregator
+    from pdfminer.layout import LTChar
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    manager = PDFResourceManager(caching=True)
+    device = PDFPageAggregator(manager, laparams=None)
+    interpreter = PDFPageInterpreter(manager, device)
+    with open(pdf_file_path, "rb") as f:
+        for page in PDFPage.get_pages(f):
+            interpreter.process_page(page)
+            layout = device.get_result()
+            chars = [(layout.y1 - c.y1, c.x0, c.x1, c.get_text()) for c in layout if isinstance(c, LTChar)]
+            yield _chars_to_text(chars)
+
+
+def _chars_to_text(chars):
+    """``(top, x0, x1, text)`` characters to lines of single-spaced words, top to bottom."""
+    chars.sort()
+    lines = []
+    line = []
+    line_top = None
+    for char in chars:
+        if line and char[0] > line_top + Y_TOLERANCE:
+            lines.append(line)
+            line = []
+        if not line:
+            line_top = char[0]
+        line.append(char)
+    if line:
+        lines.append(line)
+
+    out = []
+    for line in lines:
+        line.sort(key=lambda c: c[1])
+        words = []
+        word = []
+        last_x1 = None
+        for _, x0, x1, text in line:
+            if text.isspace():
+                if word:
+                    words.append("".join(word))
+                    word = []
+            else:
+                if word and x0 > last_x1 + X_TOLERANCE:
+                    words.append("".join(word))
+                    word = []
+                word.append(text)
+            last_x1 = x1
+        if word:
+            words.append("".join(word))
+        out.append(" ".join(words))
+    return "\n".join(out)
+
+
+def _pdfium_pages(pdf_file_path):
+    import pypdfium2
+
+    pdf = pypdfium2.PdfDocument(pdf_file_path)
+    try:
+        for page in pdf:
+            textpage = page.get_textpage()
+            text = textpage.get_text_range()
+            textpage.close()
+            page.close()
+            lines = (" ".join(line.split()) for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n"))
+            yield "\n".join(line for line in lines if line)
+    finally:
+        pdf.close()
+
+
+PDF_BACKENDS = {
+    "pdfplumber": (_pdfplumber_pages, "pdfplumber"),
+    "pdfminer": (_pdfminer_pages, "pdfminer.six"),
+    "pdfium": (_pdfium_pages, "pypdfium2"),
+}
+DEFAULT_PDF_BACKEND = "pdfplumber"
+
+
+def pdf_backend_name(name=None):
+    """``name`` (or ``$SANCTIONS_PDF_BACKEND``), defaulting to pdfplumber."""
+    name = (name or os.environ.get("SANCTIONS_PDF_BACKEND") or DEFAULT_PDF_BACKEND).lower()
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"unknown PDF backend {name!r}; choose from {', '.join(PDF_BACKENDS)}")
+    return name
+
+
+def iter_page_texts(pdf_file_path, backend=None):
+    """Yield the text of each page (``None`` or ``""`` for a page without text)."""
+    name = pdf_backend_name(backend)
+    pages, package = PDF_BACKENDS[name]
+    try:
+        yield from pages(pdf_file_path)
+    except ImportError:
+        raise RuntimeError(f"the {name} PDF backend needs {package} (pip install {package})") from None
+
+
+def extract_text_from_pdf(pdf_file_path, backend=None):
+    print(f"🔥 Extracting text from PDF ({pdf_backend_name(backend)})...")
+    full_text = []
+    for text in iter_page_texts(pdf_file_path, backend):
+        if text:
+            full_text.append(text + "\n")
+    return "".join(full_text)
+
+
+def split_entities_from_text(text):
+    print("✂️ Splitting PDF text into entity chunks...")
+    pattern = r"(?=Entity\s+\d+\b)"
+    parts = re.split(pattern, text)
+    entities = []
+
+    for chunk in parts:
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        if not chunk.lower().startswith("entity"):
+            continue
+
+        prog_m = re.search(r"Programme\s*[:\-]\s*([A-Za-z0-9]+)", chunk, flags=re.IGNORECASE)
+        programme = prog_m.group(1).upper() if prog_m else "GEN"
+
+        entities.append({
+            "programme": programme,
+            "text": chunk
+        })
+
+    print(f"🧩 Extracted {len(entities)} entity text chunks from PDF.")
+    return entities
+
+
+def save_text_entities(entities_list, archive_path):
+    print("💾 Saving entity text chunks...")
+    with ChunkWriter(archive_path, ".txt") as writer:
+        for ent in entities_list:
+            writer.append(ent["text"], programme=ent["programme"] or "GEN")
+    print(f"✅ Saved {len(entities_list)} chunks to: {archive_path}")
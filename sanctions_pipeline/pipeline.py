@@ -0,0 +1,191 @@
+"""
+Stage orchestration.
+
+Each stage imports its module on first use so that ``--help``, offline-only
+runs and the packaged executable only pay for the dependencies they touch.
+"""
+import hashlib
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from .config import CHROME_PATH, SANCTIONS_URL
+
+
+@contextmanager
+def timed(timings, name):
+    """Record the wall time of the ``with`` block in seconds under ``timings[name]``."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round(time.perf_counter() - start, 3)
+
+
+def file_sha256(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def latest_file(folder, suffix):
+    folder = Path(folder)
+    if not folder.exists():
+        return None
+    candidates = [p for p in folder.iterdir() if p.suffix.lower() == suffix]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda p: p.stat().st_mtime)
+
+
+def download_stage(paths, resume=False):
+    """
+    The download has no inputs to hash, so ``resume`` only skips it while the
+    last run is unfinished.  Once that run got through ``convert`` the site is
+    checked again; the later stages are still skipped if the files are the same.
+    """
+    from .checkpoint import completed_since, output_path, run_stage
+    from .download import download_sources
+
+    def run():
+        paths.ensure()
+        xml_file, pdf_file = download_sources(paths, CHROME_PATH)
+        return {"xml": xml_file, "pdf": pdf_file}, {}
+
+    if resume and completed_since(paths, "convert", "download"):
+        print("🔄 Last run finished; checking the site for a new publication.")
+        resume = False
+    manifest = run_stage(paths, "download", {}, run, resume=resume, params={"url": SANCTIONS_URL})
+    return output_path(manifest, "xml"), output_path(manifest, "pdf")
+
+
+def split_xml_stage(paths, xml_file, resume=False, workers=None):
+    if not (xml_file and Path(xml_file).exists()):
+        print("⚠️ No XML file to split.")
+        return 0
+
+    from .checkpoint import run_stage
+    from .xml_split import split_xml_entities
+
+    def run():
+        paths.ensure()
+        total = split_xml_entities(xml_file, paths.xml_chunks_archive, workers=workers)
+        return {"xml_chunks": paths.xml_chunks_archive}, {"entities": total}
+
+    try:
+        manifest = run_stage(paths, "split_xml", {"xml": xml_file}, run, resume=resume)
+    except Exception as e:
+        print("❌ Error while splitting XML entities:", str(e))
+        return 0
+    return manifest["result"]["entities"]
+
+
+def pdf_stage(paths, pdf_file, resume=False):
+    if not (pdf_file and Path(pdf_file).exists()):
+        print("⚠️ No PDF file to process.")
+        return
+
+    from .checkpoint import run_stage
+    from .pdf_text import extract_text_from_pdf, pdf_backend_name, save_text_entities, split_entities_from_text
+
+    backend = pdf_backend_name()
+
+    def run():
+        paths.ensure()
+        pdf_text = extract_text_from_pdf(pdf_file, backend)
+        entities = split_entities_from_text(pdf_text)
+        save_text_entities(entities, paths.pdf_chunks_archive)
+        return {"pdf_chunks": paths.pdf_chunks_archive}, {"chunks": len(entities)}
+
+    try:
+        run_stage(paths, "extract_pdf", {"pdf": pdf_file}, run, resume=resume, params={"pdf_backend": backend})
+    except Exception as e:
+        print("❌ Error processing PDF:", str(e))
+
+
+def convert_stage(paths, formats=("xlsx",), resume=False, by_programme=False, workers=None):
+    from .checkpoint import run_stage
+    from .conversion import build_pdf_rem2_mapping, populate_full_name
+    from .exporters import publish_table
+
+    def run():
+        if by_programme:
+            from .partitions import convert_partitioned
+
+            _, written, summary = convert_partitioned(paths, formats, workers=workers)
+            return {name: path for name, path in written.items() if name.startswith("combined.")}, summary
+        pdf_mapping = build_pdf_rem2_mapping(paths.pdf_chunks_archive)
+        table = populate_full_name(paths, pdf_mapping=pdf_mapping)
+        written = publish_table(table, formats, paths.xlsx_path, pdf_mapping)
+        return written, {"rows": len(table)}
+
+    inputs = {"xml_chunks": paths.xml_chunks_archive}
+    if paths.pdf_chunks_archive.exists():
+        inputs["pdf_chunks"] = paths.pdf_chunks_archive
+    params = {"formats": list(formats)}
+    if by_programme:
+        params["by_programme"] = True
+    return run_stage(paths, "convert", inputs, run, resume=resume, params=params)
+
+
+def publish_empty(paths, formats=("xlsx",)):
+    """Publish an empty table, as the original wrote an empty workbook, so no earlier run's rows stay published."""
+    from .exporters import publish_table
+    from .sources.base import RecordBatch
+    from .sources.eu import EUTravelBanAdapter
+
+    paths.ensure()
+    table = EUTravelBanAdapter(pdf_mapping={}).complete(RecordBatch())
+    return publish_table(table, formats, paths.xlsx_path)
+
+
+def split_all(paths, xml_file, pdf_file, resume=False, workers=None):
+    # Split XML into entity chunks
+    entity_count = split_xml_stage(paths, xml_file, resume=resume, workers=workers)
+
+    # Process PDF text
+    pdf_stage(paths, pdf_file, resume=resume)
+
+    print("\n" + "="*60)
+    print("STEP 1 COMPLETE - FILES CREATED")
+    print("="*60)
+    print(f"Main folder: {paths.parent_dir}")
+    print(f"- XML file: {xml_file if xml_file else 'none'}")
+    print(f"- XML chunks: {paths.xml_chunks_archive}")
+    print(f"- PDF: {pdf_file if pdf_file else 'none'}")
+    print(f"- PDF text chunks: {paths.pdf_chunks_archive}")
+    return entity_count
+
+
+def run_all(paths, xml_file=None, pdf_file=None, formats=("xlsx",), resume=False, workers=None):
+    """
+    Full pipeline; pass local ``xml_file``/``pdf_file`` to skip the browser
+    download.  With ``resume`` every stage whose manifest is still valid is
+    skipped, so a re-run after a failure starts at the stage that failed.
+    ``workers`` parses the XML feed in that many processes.
+    """
+    print("\n" + "="*60)
+    print("SANCTIONS SCRAPER & CONVERTER - MERGED VERSION")
+    print("="*60 + "\n")
+
+    print("STEP 1: DOWNLOADING & SETTING UP")
+    print("-"*60 + "\n")
+
+    if xml_file is None and pdf_file is None:
+        xml_file, pdf_file = download_stage(paths, resume=resume)
+
+    entity_count = split_all(paths, xml_file, pdf_file, resume=resume, workers=workers)
+
+    # Now run the conversion
+    if entity_count > 0:
+        convert_stage(paths, formats, resume=resume)
+    else:
+        print("\n⚠️ No entities found, publishing an empty output instead of converting.")
+        publish_empty(paths, formats)
+
+    print("\n" + "="*60)
+    print("🎉 ALL DONE - EXCEL FILE POPULATED")
+    print("="*60)
+    print(f"\nFinal output: {paths.xlsx_path}")
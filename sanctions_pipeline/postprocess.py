@@ -0,0 +1,45 @@
+"""
+Whole-column clean-up rules, applied once per column after the entity loop
+instead of cell by cell.
+"""
+import numpy as np
+import pandas as pd
+
+from .records import map_distinct
+
+_NAME_PUNCT = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201B": "'",
+    "\u201C": '"', "\u201D": '"',
+    "\u2013": "-", "\u2014": "-",
+    "\u00A0": " ",
+})
+
+
+def _series(values):
+    return pd.Series(values, dtype=object)
+
+
+def clean_fullname_column(values):
+    """Vectorised ``clean_fullname_no_accents_final``; ``"UNKNOWN"`` and blanks are left alone."""
+    s = _series(values)
+    cleaned = (
+        s.str.normalize("NFKD")
+        .str.translate(_NAME_PUNCT)
+        .str.replace(r"[^A-Za-z0-9 .,'\-()]", "", regex=True)
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+        .str.title()
+    )
+    keep = (s == "UNKNOWN") | (s == "")
+    return np.where(keep, s, cleaned).tolist()
+
+
+def reformat_dates_column(values):
+    """``YYYY-MM-DD`` -> ``DD-MM-YYYY``; anything that is not three dash-separated parts becomes blank."""
+    parts = _series(values).str.extract(r"^([^-]*)-([^-]*)-([^-]*)\Z")
+    return (parts[2] + "-" + parts[1] + "-" + parts[0]).fillna("").tolist()
+
+
+def title_column(values):
+    """Stripped and title-cased, once per distinct value."""
+    return map_distinct(values, lambda v: v.strip().title())
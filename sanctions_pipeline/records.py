@@ -0,0 +1,104 @@
+"""
+Working state for entities.
+
+An adapter fills one ``EntityRecord`` per listed party and appends it to a
+``RecordBatch``.  The record has a slot per output column instead of a dict,
+and the batch stores each column as a list.  Values that repeat across rows
+(countries, categories, programmes and so on) are interned through a per-batch
+pool, so a hundred thousand rows from one country share a single string.
+Column clean-up rules go through ``map_distinct``, so each distinct value is
+normalised once into its canonical form, not once per row.
+"""
+from .config import OUTPUT_COLUMNS
+from .exporters import INTERNED_COLUMNS, OutputTable
+
+# Column name -> attribute name ("IDENTITY NUMBER" -> "identity_number").
+FIELD_NAMES = {name: name.lower().replace(" ", "_") for name in OUTPUT_COLUMNS}
+
+
+def map_distinct(values, func, pool=None):
+    """
+    ``[func(v) for v in values]`` with ``func`` called once per distinct
+    value; equal results are interned through ``pool``.
+    """
+    pool = {} if pool is None else pool
+    canonical = {}
+    for value in dict.fromkeys(values):
+        result = func(value)
+        canonical[value] = pool.setdefault(result, result)
+    return [canonical[value] for value in values]
+
+
+class EntityRecord:
+    """
+    One output row.  Fields are attributes named after the columns
+    (``record.full_name``); item access by column name (``record["FULL_NAME"]``)
+    is kept for the column-oriented adapter code.
+    """
+
+    __slots__ = tuple(FIELD_NAMES.values())
+
+    def __init__(self, **columns):
+        for attr in self.__slots__:
+            setattr(self, attr, "")
+        for name, value in columns.items():
+            self[name] = value
+
+    def __getitem__(self, name):
+        return getattr(self, FIELD_NAMES[name])
+
+    def __setitem__(self, name, value):
+        setattr(self, FIELD_NAMES[name], value)
+
+    def get(self, name, default=""):
+        return getattr(self, FIELD_NAMES[name], default)
+
+    def values(self):
+        return tuple(getattr(self, attr) for attr in self.__slots__)
+
+    def __repr__(self):
+        return f"EntityRecord(full_name={self.full_name!r}, source={self.source!r})"
+
+
+class RecordBatch:
+    """Column lists for a run of records plus their status flags."""
+
+    def __init__(self):
+        self.columns = {name: [] for name in OUTPUT_COLUMNS}
+        self.flags = []
+        self.pool = {}
+
+    @classmethod
+    def from_columns(cls, columns, flags):
+        """A batch over already collected ``OUTPUT_COLUMNS`` lists (values are interned again)."""
+        batch = cls()
+        for name, values in columns.items():
+            if name in INTERNED_COLUMNS:
+                values = [batch.pool.setdefault(v, v) for v in values]
+            batch.columns[name] = list(values)
+        batch.flags = list(flags)
+        return batch
+
+    def intern(self, value):
+        return self.pool.setdefault(value, value)
+
+    def append(self, record, flags=0):
+        for name, value in zip(OUTPUT_COLUMNS, record.values()):
+            if name in INTERNED_COLUMNS:
+                value = self.pool.setdefault(value, value)
+            self.columns[name].append(value)
+        self.flags.append(flags)
+
+    def __len__(self):
+        return len(self.flags)
+
+    def status(self):
+        import numpy as np
+
+        return np.array(self.flags, dtype=np.uint8)
+
+    def to_table(self, columns=None, status=None, rem2_records=None):
+        """Build the ``OutputTable``; pass ``columns``/``status`` after a finalize pass."""
+        columns = self.columns if columns is None else columns
+        return OutputTable.from_columns(columns, self.status() if status is None else status, pool=self.pool,
+                                        rem2_records=rem2_records)
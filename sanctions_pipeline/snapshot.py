@@ -0,0 +1,231 @@
+"""
+Binary snapshot of a run (``sanctions_output.snap``) for reporting,
+reconciliation and audit jobs.
+
+It holds the output rows with their status flags, every PDF chunk as a
+record (programme, matched name, REM2 value, text), the PDF name-variant
+mapping that ``build_pdf_rem2_mapping`` builds, and, per row, the PDF record
+its REM2 came from.  Readers memory-map the file.  ``Snapshot(path)`` only
+reads the header and section directory, and each section is decoded on first
+access, so opening takes milliseconds.  This module needs nothing beyond the
+standard library, so other tools can read a snapshot without the scraping or
+spreadsheet dependencies::
+
+    with Snapshot("data/sanctions_output.snap") as snap:
+        for row in snap.entities:
+            ...
+
+The file is ``MAGIC``, ``SCHEMA_VERSION`` and the section count, then one
+``(name, offset, size)`` entry per section.  All integers are little-endian.
+Readers reject other schema versions and ignore sections they do not know,
+so new sections can be added without a version bump.
+"""
+import json
+import mmap
+import struct
+
+from .binfile import Strings, le_bytes, string_table, typed_section
+
+MAGIC = b"SNAP"
+SCHEMA_VERSION = 1
+HEADER = struct.Struct("<4sII")
+ENTRY = struct.Struct("<32sQQ")  # section name (ASCII, NUL-padded), offset, size
+# Section -> array typecode; the rest, including the u8 ``status``, are bytes.
+# Offsets are u64, PDF record numbers u32, per-row matches i32 (-1 for none).
+_TYPECODES = {"entity_offsets": "Q", "pdf_record_offsets": "Q",
+              "pdf_key_offsets": "Q", "pdf_key_records": "I", "match_records": "i"}
+NO_MATCH = -1
+PDF_FIELDS = ("seq", "programme", "name", "rem2", "text")
+
+
+def write_snapshot(table, path, pdf_mapping=None):
+    """
+    Write the snapshot of ``table`` to ``path``.  The PDF records and keys
+    come from ``pdf_mapping``, the ``conversion.PdfMapping`` the table was
+    built with, and the per-row matches from ``table.rem2_records``.
+    """
+    from datetime import datetime, timezone
+
+    from . import __version__, status
+
+    records = getattr(pdf_mapping, "records", [])
+    key_records = getattr(pdf_mapping, "record_for", {})
+
+    rows = len(table)
+    row_status = table.status.tolist() if table.status is not None else [0] * rows
+    matched = table.rem2_records if table.rem2_records is not None and records else [None] * rows
+    keys = sorted((k.encode("utf-8"), i) for k, i in key_records.items())
+    meta = {
+        "schema_version": SCHEMA_VERSION,
+        "pipeline_version": __version__,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "columns": list(table.names),
+        "status_flags": {name: getattr(status, name)
+                         for name in ("NAME_MISSING", "CATEGORY_MISSING", "REM2_MISSING", "REM2_CONFLICT")},
+        "entities": rows,
+        "pdf_records": len(records),
+        "pdf_keys": len(keys),
+    }
+
+    sections = {"meta": json.dumps(meta, ensure_ascii=False).encode("utf-8")}
+    sections["entity_offsets"], sections["entity_blob"] = string_table(
+        [json.dumps(row, ensure_ascii=False).encode("utf-8") for row in zip(*(table.columns[n] for n in table.names))])
+    sections["status"] = bytes(row_status)
+    sections["pdf_record_offsets"], sections["pdf_record_blob"] = string_table(
+        [json.dumps([record[f] for f in PDF_FIELDS], ensure_ascii=False).encode("utf-8") for record in records])
+    sections["pdf_key_offsets"], sections["pdf_key_blob"] = string_table([k for k, _ in keys])
+    sections["pdf_key_records"] = le_bytes([i for _, i in keys], "I")
+    sections["match_records"] = le_bytes([NO_MATCH if record is None else record for record in matched], "i")
+
+    pos = HEADER.size + ENTRY.size * len(sections)
+    directory = []
+    for name, data in sections.items():
+        pos += -pos % 8
+        directory.append((name, pos, len(data)))
+        pos += len(data)
+
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, SCHEMA_VERSION, len(sections)))
+        for name, offset, size in directory:
+            f.write(ENTRY.pack(name.encode("ascii"), offset, size))
+        for name, offset, _ in directory:
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(sections[name])
+    return path
+
+
+class _Records(Strings):
+    """Rows stored as JSON arrays, returned as dicts keyed by ``fields``."""
+
+    def __init__(self, offsets, blob, fields):
+        super().__init__(offsets, blob)
+        self.fields = fields
+
+    def __getitem__(self, i):
+        return dict(zip(self.fields, json.loads(super().__getitem__(i))))
+
+
+class Snapshot:
+    """Read-only, lazily decoded view of a snapshot file."""
+
+    def __init__(self, path):
+        self.source = str(path)
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        if len(self._view) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a run snapshot")
+        magic, version, count = HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a run snapshot")
+        if version != SCHEMA_VERSION:
+            self.close()
+            raise ValueError(f"{path} is snapshot schema {version}; this reader supports schema {SCHEMA_VERSION}")
+        self.schema_version = version
+        self._directory = {}
+        if HEADER.size + count * ENTRY.size > len(self._view):
+            self.close()
+            raise ValueError(f"{path} is truncated")
+        for i in range(count):
+            name, offset, size = ENTRY.unpack_from(self._view, HEADER.size + i * ENTRY.size)
+            if offset + size > len(self._view):
+                self.close()
+                raise ValueError(f"{path} is truncated")
+            self._directory[name.rstrip(b"\0").decode("ascii")] = (offset, size)
+        self._sections = {}
+        self._cache = {}
+
+    def section(self, name):
+        """The raw section as a memoryview (typed for array sections); decoded once, on first access."""
+        if name not in self._sections:
+            if name not in self._directory:
+                raise KeyError(f"{self.source} has no {name!r} section")
+            offset, size = self._directory[name]
+            part = self._view[offset:offset + size]
+            typecode = _TYPECODES.get(name)
+            self._sections[name] = typed_section(part, typecode) if typecode else part
+        return self._sections[name]
+
+    def sections(self):
+        return list(self._directory)
+
+    def _cached(self, name, build):
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    @property
+    def meta(self):
+        return self._cached("meta", lambda: json.loads(self.section("meta").tobytes()))
+
+    def _records(self, name, fields):
+        return self._cached(name, lambda: _Records(self.section(f"{name}_offsets"), self.section(f"{name}_blob"),
+                                                   fields))
+
+    @property
+    def entities(self):
+        """Output rows as dicts, decoded on access; supports ``len``, indexing and iteration."""
+        return self._records("entity", self.meta["columns"])
+
+    @property
+    def status(self):
+        """Per-row status flags (see ``meta["status_flags"]``)."""
+        return self.section("status")
+
+    @property
+    def pdf_records(self):
+        """PDF chunks as ``PDF_FIELDS`` dicts, in chunk archive order."""
+        return self._records("pdf_record", PDF_FIELDS)
+
+    @property
+    def _pdf_keys(self):
+        return self._cached("pdf_keys", lambda: Strings(self.section("pdf_key_offsets"), self.section("pdf_key_blob")))
+
+    def pdf_record_for(self, key):
+        """Number of the PDF record a normalised name variant maps to, or ``None``."""
+        pos = self._pdf_keys.find(key.encode("utf-8"))
+        return None if pos is None else self.section("pdf_key_records")[pos]
+
+    def pdf_rem2(self, key):
+        """REM2 value for a normalised name variant, as ``build_pdf_rem2_mapping`` gives it, or ``None``."""
+        record = self.pdf_record_for(key)
+        return None if record is None else self.pdf_records[record]["rem2"]
+
+    def pdf_mapping(self):
+        """The whole name variant -> REM2 mapping as a dict."""
+        keys = self._pdf_keys
+        records = self.section("pdf_key_records")
+        rem2 = {}
+        mapping = {}
+        for pos in range(len(keys)):
+            record = records[pos]
+            if record not in rem2:
+                rem2[record] = self.pdf_records[record]["rem2"]
+            mapping[keys[pos]] = rem2[record]
+        return mapping
+
+    def matches(self):
+        """Yield ``(row, status, pdf record or None)``; the record is the one the row's REM2 was matched from."""
+        status = self.status
+        for row, record in enumerate(self.section("match_records")):
+            yield row, status[row], None if record == NO_MATCH else record
+
+    def __len__(self):
+        return len(self.section("status"))
+
+    def close(self):
+        self._cache = {}
+        for part in getattr(self, "_sections", {}).values():
+            if isinstance(part, memoryview):
+                part.release()
+        self._sections = {}
+        self._view.release()
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,29 @@
+"""
+Source adapters.
+
+Adapters are registered by name and imported only when used, so listing them
+costs nothing.  ``get_adapter("un")()`` returns a ready adapter instance.
+"""
+from importlib import import_module
+
+ADAPTERS = {
+    "eu-travel-ban": ("eu", "EUTravelBanAdapter"),
+    "eu-fsf": ("eu", "EUFinancialSanctionsAdapter"),
+    "un": ("un", "UNConsolidatedAdapter"),
+    "ofac-sdn": ("ofac", "OFACSDNAdapter"),
+}
+
+
+def register_adapter(name, module, class_name):
+    """Register an adapter class living in ``module`` (absolute, or relative to this package)."""
+    ADAPTERS[name] = (module, class_name)
+
+
+def get_adapter(name):
+    try:
+        module, class_name = ADAPTERS[name]
+    except KeyError:
+        raise LookupError(f"unknown source {name!r}; choose from {', '.join(ADAPTERS)}") from None
+    if "." not in module:
+        module = f"{__name__}.{module}"
+    return getattr(import_module(module), class_name)
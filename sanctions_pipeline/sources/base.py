@@ -0,0 +1,105 @@
+"""
+Source adapter interface.
+
+An adapter turns one sanctions feed into rows of the ``OUTPUT_COLUMNS`` schema.
+``iter_records`` must stream: it yields one ``(EntityRecord, flags)`` pair per
+listed party and must not hold the whole document in memory.  ``finalize``
+runs once over the source's collected columns for rules that need every row
+(such as the travel-ban REM2 duplicate handling).
+"""
+from pathlib import Path
+
+from ..gazetteer import country_code_column, country_codes_column
+from ..normalize import is_forced_male
+from ..records import EntityRecord, RecordBatch
+from ..xmlbackend import get_backend
+
+
+class SourceAdapter:
+    name = None
+    label = None            # value of the SOURCE column
+    web_link = None         # value of the WEB_LINK column
+    default_url = None      # where ``fetch`` downloads the feed from, if anywhere
+    backend = None          # XML backend override; see ``xmlbackend.get_backend``
+    rem2_records = None     # per-row PDF record numbers, set by ``finalize`` where REM2 comes from the PDF
+
+    @property
+    def xml_backend(self):
+        return self.backend or get_backend()
+
+    def new_row(self):
+        return EntityRecord(WEB_LINK=self.web_link, SOURCE=self.label)
+
+    def fetch(self, dest_folder, session=None):
+        if not self.default_url:
+            raise RuntimeError(f"{self.name} has no download URL; pass a local file.")
+        from ..download import download_url_to_file
+
+        print(f"⬇️ Downloading {self.name} from {self.default_url}")
+        return download_url_to_file(self.default_url, dest_folder, session=session, timeout=300)
+
+    def default_input(self, paths):
+        """Local file to read when the caller gives none; ``None`` means download with ``fetch``."""
+        return None
+
+    def iter_records(self, path):
+        raise NotImplementedError
+
+    def finalize(self, columns, status):
+        return columns
+
+    def build_table(self, path):
+        batch = RecordBatch()
+        for row, row_flags in self.iter_records(path):
+            batch.append(row, row_flags)
+        return self.complete(batch)
+
+    def complete(self, batch):
+        """Run ``finalize`` and the gazetteer code columns over a filled batch and build the table."""
+        status = batch.status()
+        columns = self.finalize(batch.columns, status)
+        columns["ADD_COUNTRY_CODE"] = country_code_column(columns["ADD_COUNTRY"], columns["ADD_CITY"])
+        columns["NATIONALITY_CODES"] = country_codes_column(columns["NATIONALITIES"])
+        return batch.to_table(columns, status, rem2_records=self.rem2_records)
+
+
+def iter_elements(path, wanted, prune=(), backend=None):
+    """
+    Stream the elements whose local name is in ``wanted`` from a large XML file.
+
+    Each yielded element is cleared and detached once the caller moves on, and
+    elements named in ``prune`` are dropped unread, so memory stays flat
+    regardless of file size.
+    """
+    wanted = {wanted} if isinstance(wanted, str) else set(wanted)
+    backend = backend or get_backend()
+    yield from backend.iterparse(path, wanted, set(prune))
+
+
+def namespace_of(elem):
+    return elem.tag.split("}")[0] + "}" if elem.tag.startswith("{") else ""
+
+
+def infer_gender(selected_name, source_gender, detector):
+    """Source value first, then the forced-male name rules, then the dictionary guess."""
+    if source_gender:
+        return "Female" if source_gender.strip().upper() in ("F", "FEMALE") else "Male"
+    if selected_name and is_forced_male(selected_name):
+        return "Male"
+    if selected_name:
+        g = detector.get_gender(selected_name.split()[0])
+        return "Female" if g == "female" else "Male"
+    return "Male"
+
+
+def format_iso_date(value):
+    """``YYYY-MM-DD`` -> ``DD-MM-YYYY``; anything else becomes blank."""
+    try:
+        yyyy, mm, dd = value.strip().split("-")
+    except (AttributeError, ValueError):
+        return ""
+    return f"{dd}-{mm}-{yyyy}"
+
+
+def source_file(path):
+    return Path(path) if path else None
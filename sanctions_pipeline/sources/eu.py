@@ -0,0 +1,544 @@
+"""
+EU adapters.
+
+The SanctionsMap travel-ban export and the EU financial-sanctions (FSF)
+consolidated list share the ``sanctionEntity`` schema, so both go through
+``sanction_entity_row``.  The travel-ban adapter additionally matches each
+entity against the PDF for REM2 and resolves duplicate names across the list.
+"""
+import re
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+
+from ..artifacts import ChunkArchive
+from ..config import DEFAULT_SOURCE, DEFAULT_WEB_LINK
+from ..gazetteer import clean_place_column
+from ..normalize import all_variants, clean_name, is_latin_name
+from ..postprocess import clean_fullname_column, reformat_dates_column, title_column
+from ..status import CATEGORY_MISSING, NAME_MISSING, REM2_CONFLICT, REM2_MISSING
+from ..xmlbackend import Queries
+from .base import SourceAdapter, infer_gender, iter_elements, namespace_of
+
+
+ENTITY_FIELDS = {
+    "subject_type": "subjectType",
+    "name_alias": "nameAlias",
+    "citizenship": "citizenship",
+    "birthdate": "birthdate",
+    "address": "address",
+    "regulation": "regulation",
+    "remark": "remark",
+}
+
+
+@lru_cache(maxsize=None)
+def entity_queries(backend, namespace):
+    """The ``sanctionEntity`` lookups, compiled once per backend and namespace."""
+    return Queries(backend, namespace, ENTITY_FIELDS)
+
+
+def rem2_match_keys(aliases, selected_name):
+    """PDF mapping keys for an entity, in the order they are tried."""
+    xml_alias_candidates = []
+    for alias in aliases:
+        wn = alias.attrib.get("wholeName")
+        if wn and is_latin_name(wn):
+            xml_alias_candidates.append(clean_name(wn))
+
+    if selected_name and selected_name not in xml_alias_candidates:
+        xml_alias_candidates.insert(0, selected_name)
+
+    keys = []
+    for candidate in xml_alias_candidates:
+        keys.extend(key for key in all_variants(candidate) if key)
+    return tuple(keys)
+
+
+def match_pdf_record(keys, pdf_mapping):
+    """``(REM2, PDF record number or None)`` for the first of ``keys`` in ``pdf_mapping``."""
+    record_for = getattr(pdf_mapping, "record_for", {})
+    for key in keys:
+        if key in pdf_mapping:
+            return pdf_mapping[key], record_for.get(key)
+    return "", None
+
+
+def match_rem2(keys, pdf_mapping):
+    return match_pdf_record(keys, pdf_mapping)[0]
+
+
+def sanction_entity_row(root, queries, pdf_mapping, detector, row):
+    """
+    Fill ``row`` from one ``sanctionEntity`` (``root`` may be the entity or a
+    wrapper around it) and return its status flags.  ``queries`` comes from
+    ``entity_queries`` for the document's namespace.  REM2 holds the PDF match
+    candidate, or with ``pdf_mapping=None`` the tuple of lookup keys for a
+    later ``match_rem2``; DOB and the country columns are left raw for the column pass.
+    """
+    flags = 0
+
+    # CATEGORY (B)
+    subjects = queries.subject_type(root)
+    subject = subjects[0] if subjects else None
+    if subject is not None:
+        classification = subject.attrib.get("classificationCode")
+        row["CATEGORY"] = classification if classification else "UNKNOWN"
+        if not classification:
+            flags |= CATEGORY_MISSING
+    else:
+        row["CATEGORY"] = "UNKNOWN"
+        flags |= CATEGORY_MISSING
+
+    # FULL_NAME (A)
+    aliases = queries.name_alias(root)
+    selected_name = None
+    xml_gender_value = None
+
+    for alias in aliases:
+        if "gender" in alias.attrib:
+            xml_gender_value = alias.attrib["gender"]
+
+        wn = alias.attrib.get("wholeName")
+        if wn and is_latin_name(wn):
+            selected_name = clean_name(wn)
+            break
+
+    if selected_name:
+        row["FULL_NAME"] = selected_name
+    else:
+        row["FULL_NAME"] = "UNKNOWN"
+        flags |= NAME_MISSING
+
+    # NATIONALITIES (K)
+    citizenships = queries.citizenship(root)
+    if citizenships:
+        first_cit = citizenships[0]
+        country_desc = first_cit.attrib.get("countryDescription")
+        if country_desc and country_desc.strip() and country_desc.strip().upper() != "UNKNOWN":
+            row["NATIONALITIES"] = country_desc.strip()
+        else:
+            row["NATIONALITIES"] = ""
+    else:
+        row["NATIONALITIES"] = ""
+
+    # DOB (G)
+    birthdates = queries.birthdate(root)
+    dob_found = None
+    for b in birthdates:
+        bd = b.attrib.get("birthdate")
+        if bd and bd.strip():
+            dob_found = bd.strip()
+            break
+    row["DOB"] = dob_found or ""
+
+    # ADDRESS – H,I,J
+
+    addresses = queries.address(root)
+
+    if addresses:
+        first_addr = addresses[0]
+
+        def valid(field):
+            return field and field.strip() and field.strip().upper() != "UNKNOWN"
+
+        row["ADD_CITY"] = first_addr.attrib.get("city") or ""
+
+        country_val = first_addr.attrib.get("countryDescription")
+        if valid(country_val):
+            row["ADD_COUNTRY"] = country_val.strip()
+        else:
+            row["ADD_COUNTRY"] = ""
+
+        row["STATE"] = first_addr.attrib.get("region") or ""
+    else:
+        row["ADD_CITY"] = ""
+        row["ADD_COUNTRY"] = ""
+        row["STATE"] = ""
+
+    # ADDRESS COLUMN (L)
+    address_list = []
+    for addr in addresses:
+        parts = []
+        cd = addr.attrib.get("countryDescription")
+        city = addr.attrib.get("city")
+        street = addr.attrib.get("street")
+        region = addr.attrib.get("region")
+        place = addr.attrib.get("place")
+        zipcode = addr.attrib.get("zipCode")
+
+        def valid(field):
+            return field and field.strip() and field.strip().upper() != "UNKNOWN"
+
+        if valid(cd):
+            cd_clean = re.sub(r"\s+", " ", cd.replace(",", " ")).strip()
+            parts.append(cd_clean.title())
+        for field in [city, street, region, place]:
+            if valid(field):
+                cleaned = re.sub(r"\s+", " ", field.replace(",", " ")).strip()
+                parts.append(cleaned)
+        if valid(zipcode):
+            zip_clean = re.sub(r"\s+", " ", zipcode.replace(",", " ")).strip()
+            parts.append(zip_clean)
+
+        if parts:
+            address_list.append(" ".join(parts))
+
+    row["ADDRESS"] = "; ".join(address_list) if address_list else ""
+
+    # ALIASES (T)
+    all_aliases = []
+    selected_latin = selected_name.lower() if selected_name else None
+
+    for alias in aliases:
+        wn = alias.attrib.get("wholeName")
+        if not wn:
+            continue
+        if selected_latin and wn.strip().lower() == selected_latin:
+            continue
+        if is_latin_name(wn):
+            all_aliases.append(clean_name(wn))
+
+    row["ALIAS"] = "; ".join(all_aliases) if all_aliases else ""
+
+    # GENDER (F)
+    row["GENDER"] = infer_gender(selected_name, xml_gender_value, detector)
+
+    # REM1 (Y)
+    all_functions = []
+    for alias in aliases:
+        func = alias.attrib.get("function")
+        if not func:
+            continue
+        fn = func.strip()
+        if re.search(r"\([a-z]\)", fn):
+            cleaned = re.sub(r"\([a-z]\)", "|", fn)
+            parts = [p.strip().strip(",") for p in cleaned.split("|") if p.strip()]
+            all_functions.extend(parts)
+        else:
+            all_functions.append(fn)
+
+    if all_functions:
+        row["REM1"] = "Designation: " + "; ".join(all_functions)
+    else:
+        row["REM1"] = ""
+
+    # REM2 candidate
+    rem2_keys = rem2_match_keys(aliases, selected_name)
+    rem2_value = rem2_keys if pdf_mapping is None else match_rem2(rem2_keys, pdf_mapping)
+
+    # DETAILS COLUMN (P)
+    details = {
+        "Title": [],
+        "Birth date": [],
+        "Birth place": [],
+        "Citizenship": [],
+        "Remark": []
+    }
+
+    for reg in queries.regulation(root):
+        num_title = reg.attrib.get("numberTitle")
+        if num_title:
+            details["Title"].append(num_title.strip())
+
+    for alias in aliases:
+        t = alias.attrib.get("title")
+        if t:
+            cleaned = re.sub(r"\(\w\)", "", t)
+            parts = [p.strip() for p in cleaned.split(",") if p.strip()]
+            details["Title"].extend(parts)
+
+    full_date_count = 0
+    years_from_full_dates = set()
+
+    for b in birthdates:
+        bd = b.attrib.get("birthdate")
+        if bd:
+            full_date_count += 1
+            if full_date_count > 1:
+                try:
+                    yyyy, mm, dd = bd.split("-")
+                    details["Birth date"].append(f"{dd}-{mm}-{yyyy}")
+                    years_from_full_dates.add(yyyy)
+                except:
+                    pass
+            else:
+                try:
+                    yyyy, mm, dd = bd.split("-")
+                    years_from_full_dates.add(yyyy)
+                except:
+                    pass
+
+    for b in birthdates:
+        y = b.attrib.get("year")
+        if y and y.isdigit() and y not in years_from_full_dates:
+            details["Birth date"].append(y)
+
+    for b in birthdates:
+        yr_from = b.attrib.get("yearRangeFrom")
+        yr_to = b.attrib.get("yearRangeTo")
+        if yr_from and yr_to:
+            details["Birth date"].append(f"{yr_from} to {yr_to}")
+
+    for b in birthdates:
+        place = b.attrib.get("place")
+        if place:
+            details["Birth place"].append(place.strip())
+
+    cit_list = []
+    for c in citizenships:
+        d = c.attrib.get("countryDescription")
+        if d and d.strip() and d.strip().upper() != "UNKNOWN":
+            cit_list.append(d.strip().title())
+
+    if len(cit_list) > 1:
+        first = cit_list[0].strip().lower()
+        second = cit_list[1].strip()
+        if second and second.strip().lower() != first:
+            details["Citizenship"] = [second]
+        else:
+            details["Citizenship"] = []
+    else:
+        details["Citizenship"] = []
+
+    def clean_remark_text(txt):
+        if not txt:
+            return None
+        t = txt.strip()
+        return t if t else None
+
+    for r in queries.remark(root):
+        if r.text:
+            cleaned = clean_remark_text(r.text)
+            if cleaned and cleaned.strip().lower() != "none":
+                details["Remark"].append(cleaned)
+
+    for key in details:
+        seen = set()
+        uniq = []
+        for val in details[key]:
+            low = val.lower()
+            if low not in seen:
+                seen.add(low)
+                uniq.append(val)
+        details[key] = uniq
+
+    parts = []
+    order = ["Title", "Birth date", "Birth place", "Citizenship", "Remark"]
+    for field in order:
+        vals = details[field]
+        if not vals:
+            continue
+        if len(vals) == 1:
+            block = f"{field}: {vals[0].strip()}"
+        else:
+            merged = " / ".join(v.strip() for v in vals)
+            block = f"{field}: {merged.strip()}"
+
+        parts.append(block.strip())
+
+    details_value = "; ".join(parts)
+    details_value = details_value.replace("\n", " ").replace("\r", " ").strip()
+    row["DETAILS"] = details_value
+
+    row["REM2"] = rem2_value if rem2_value else ""
+    return flags
+
+
+def clean_columns(columns):
+    columns["FULL_NAME"] = clean_fullname_column(columns["FULL_NAME"])
+    columns["DOB"] = reformat_dates_column(columns["DOB"])
+    columns["NATIONALITIES"] = title_column(columns["NATIONALITIES"])
+    columns["ADD_COUNTRY"] = title_column(columns["ADD_COUNTRY"])
+    columns["ADD_CITY"] = clean_place_column(columns["ADD_CITY"])
+    columns["STATE"] = clean_place_column(columns["STATE"])
+    return columns
+
+
+def resolve_rem2(full_names, rem2_candidates, row_status, candidate_records=None):
+    """
+    REM2 duplicate handling.  Unique names keep their PDF match; a name that
+    occurs more than once only takes a REM2 value when the nearest non-empty
+    neighbours agree, otherwise the row is flagged as a conflict.  Returns
+    ``(rem2, records)``: each row's PDF record number follows its value, so a
+    row filled from a neighbour gets the neighbour's record.
+    """
+    total = len(full_names)
+    rem2 = [""] * total
+    candidate_records = list(candidate_records) if candidate_records is not None else [None] * total
+    records = [None] * total
+    name_counts = Counter(full_names)
+
+    # SECOND PASS: duplicate-handling for REM2
+    for idx in range(total):
+        fn = full_names[idx]
+        cand = rem2_candidates[idx]
+
+        if fn == "UNKNOWN":
+            row_status[idx] |= REM2_MISSING
+            continue
+
+        if name_counts[fn] == 1:
+            if cand:
+                rem2[idx] = cand
+                records[idx] = candidate_records[idx]
+            else:
+                row_status[idx] |= REM2_MISSING
+        else:
+            prev_nonempty = ""
+            j = idx - 1
+            while j >= 0:
+                if rem2_candidates[j]:
+                    prev_nonempty = rem2_candidates[j]
+                    prev_record = candidate_records[j]
+                    break
+                j -= 1
+
+            next_nonempty = ""
+            j = idx + 1
+            while j < total:
+                if rem2_candidates[j]:
+                    next_nonempty = rem2_candidates[j]
+                    break
+                j += 1
+
+            if prev_nonempty and next_nonempty and prev_nonempty == next_nonempty:
+                rem2[idx] = prev_nonempty
+                rem2_candidates[idx] = prev_nonempty
+                records[idx] = candidate_records[idx] = prev_record
+            else:
+                row_status[idx] |= REM2_CONFLICT
+
+    # THIRD PASS: retry conflicts against the resolved column
+    for idx in range(total):
+        fn = full_names[idx]
+        if fn == "UNKNOWN" or rem2[idx] or name_counts[fn] <= 1:
+            continue
+
+        prev_nonempty = ""
+        j = idx - 1
+        while j >= 0:
+            if rem2[j]:
+                prev_nonempty = rem2[j]
+                prev_record = records[j]
+                break
+            j -= 1
+
+        next_nonempty = ""
+        j = idx + 1
+        while j < total:
+            if rem2[j]:
+                next_nonempty = rem2[j]
+                break
+            j += 1
+
+        if prev_nonempty and next_nonempty and prev_nonempty == next_nonempty:
+            rem2[idx] = prev_nonempty
+            records[idx] = prev_record
+            row_status[idx] ^= REM2_CONFLICT  # always set by the second pass
+
+    return rem2, records
+
+
+class EUTravelBanAdapter(SourceAdapter):
+    """SanctionsMap travel-ban list: XML chunk archive (or raw export) plus the PDF REM2 mapping."""
+
+    name = "eu-travel-ban"
+    label = DEFAULT_SOURCE
+    web_link = DEFAULT_WEB_LINK
+
+    def __init__(self, pdf_mapping=None, pdf_source=None, detector=None):
+        self.pdf_mapping = pdf_mapping
+        self.pdf_source = pdf_source
+        self.detector = detector
+
+    def default_input(self, paths):
+        # No direct download: the browser stages leave the chunks behind.
+        if not paths.xml_chunks_archive.exists():
+            raise RuntimeError(f"{paths.xml_chunks_archive} not found; run the pipeline first or pass the XML export.")
+        if self.pdf_source is None and self.pdf_mapping is None:
+            self.pdf_source = paths.pdf_chunks_archive
+        return paths.xml_chunks_archive
+
+    def _prepare(self):
+        from ..conversion import build_pdf_rem2_mapping, get_gender_detector
+
+        if self.pdf_mapping is None:
+            self.pdf_mapping = build_pdf_rem2_mapping(self.pdf_source) if self.pdf_source else {}
+        if self.detector is None:
+            self.detector = get_gender_detector()
+
+    def iter_records(self, path):
+        self._prepare()
+        backend = self.xml_backend
+        if Path(path).suffix.lower() == ".zip":
+            with ChunkArchive(path) as archive:
+                print(f"Found {len(archive)} XML entities – PDF mapping entries: {len(self.pdf_mapping)}")
+                yield from self.iter_chunk_records(archive, archive.numbers(), backend)
+            return
+
+        for entity in iter_elements(path, "sanctionEntity", backend=backend):
+            row = self.new_row()
+            queries = entity_queries(backend, namespace_of(entity))
+            flags = sanction_entity_row(entity, queries, None, self.detector, row)
+            yield row, flags
+
+    def iter_chunk_records(self, archive, seqs, backend):
+        """``(row, flags)`` for the chunks ``seqs`` of an XML chunk archive; REM2 holds the lookup keys."""
+        for seq in seqs:
+            row = self.new_row()
+            try:
+                root = backend.fromstring(archive.read_bytes(seq))
+            except Exception as e:
+                print(f"Failed parse: entity{seq}.xml", e)
+                row["FULL_NAME"] = "UNKNOWN"
+                yield row, NAME_MISSING
+                continue
+
+            namespace = ""
+            if len(root) > 0 and isinstance(root[0].tag, str) and root[0].tag.startswith("{"):
+                namespace = root[0].tag.split("}")[0] + "}"
+            queries = entity_queries(backend, namespace)
+            yield row, sanction_entity_row(root, queries, None, self.detector, row)
+
+    def finalize(self, columns, status):
+        """Match each row's lookup keys against the PDF mapping, then resolve duplicates."""
+        matches = [match_pdf_record(keys, self.pdf_mapping) for keys in columns["REM2"]]
+        columns["REM2"], self.rem2_records = resolve_rem2(
+            columns["FULL_NAME"], [rem2 for rem2, _ in matches], status, [record for _, record in matches])
+        return clean_columns(columns)
+
+
+class EUFinancialSanctionsAdapter(EUTravelBanAdapter):
+    """EU consolidated financial-sanctions list (FSF XML); REM2 comes from the regulation programme."""
+
+    name = "eu-fsf"
+    label = "EU FINANCIAL SANCTIONS"
+    web_link = "https://data.europa.eu/data/datasets/consolidated-list-of-persons-groups-and-entities-subject-to-eu-financial-sanctions"
+    default_url = "https://webgate.ec.europa.eu/fsd/fsf/public/files/xmlFullSanctionsList_1_1/content?token=dG9rZW4tMjAxNw"
+
+    def __init__(self, detector=None):
+        super().__init__(pdf_mapping={}, detector=detector)
+
+    def default_input(self, paths):
+        return None
+
+    def iter_records(self, path):
+        self._prepare()
+        backend = self.xml_backend
+        for entity in iter_elements(path, "sanctionEntity", backend=backend):
+            queries = entity_queries(backend, namespace_of(entity))
+            row = self.new_row()
+            flags = sanction_entity_row(entity, queries, self.pdf_mapping, self.detector, row)
+
+            programmes = []
+            for reg in queries.regulation(entity):
+                prog = (reg.attrib.get("programme") or "").strip()
+                if prog and prog not in programmes:
+                    programmes.append(prog)
+            row["REM2"] = "Programme: " + " / ".join(programmes) if programmes else ""
+            row["VIOLATION_ID"] = entity.attrib.get("euReferenceNumber", "")
+            yield row, flags
+
+    def finalize(self, columns, status):
+        return clean_columns(columns)
@@ -0,0 +1,254 @@
+"""
+OFAC SDN advanced XML adapter.
+
+The advanced export is large and normalised: parties refer by ID to reference
+values, locations, identity documents and sanctions entries that live in other
+sections of the same file, some of them after ``DistinctParties``.  The file is
+therefore streamed twice: the first pass keeps only compact lookup tables
+(names, countries, locations, documents, programmes) and drops every party;
+the second pass streams ``DistinctParty`` elements one at a time against those
+tables.
+"""
+import re
+
+from ..normalize import clean_name, is_latin_name
+from ..postprocess import clean_fullname_column, title_column
+from ..status import CATEGORY_MISSING, NAME_MISSING
+from .base import SourceAdapter, infer_gender, iter_elements, namespace_of
+
+_REFERENCE_SETS = {
+    "AliasTypeValues", "CountryValues", "DetailReferenceValues", "FeatureTypeValues",
+    "IDRegDocTypeValues", "LocPartTypeValues", "NamePartTypeValues", "PartySubTypeValues",
+    "PartyTypeValues", "SanctionsTypeValues", "ScriptValues",
+}
+
+_STREET_PARTS = ("ADDRESS1", "ADDRESS2", "ADDRESS3")
+
+
+def _clean(text):
+    return re.sub(r"\s+", " ", text or "").strip()
+
+
+class OFACLookups:
+    """The small tables the party pass needs, built by the first streaming pass."""
+
+    def __init__(self):
+        self.refs = {}          # set name -> {ID: text}
+        self.party_types = {}   # PartySubType ID -> PartyTypeID
+        self.locations = {}     # Location ID -> (country, city, state, address)
+        self.documents = {}     # Identity ID -> [(type, number)]
+        self.programmes = {}    # Profile ID -> [programme]
+
+    def ref(self, set_name, ref_id):
+        return self.refs.get(set_name, {}).get(ref_id, "")
+
+    def load(self, path, backend=None):
+        for elem in iter_elements(path, ("ReferenceValueSets", "Location", "IDRegDocument", "SanctionsEntry"),
+                                  prune=("DistinctParty", "ProfileRelationship"), backend=backend):
+            local = elem.tag.rpartition("}")[2]
+            ns = namespace_of(elem)
+            if local == "ReferenceValueSets":
+                self._load_refs(elem)
+            elif local == "Location":
+                self._load_location(elem, ns)
+            elif local == "IDRegDocument":
+                number = _clean(elem.findtext(f"{ns}IDRegistrationNo"))
+                if number:
+                    doc_type = self.ref("IDRegDocTypeValues", elem.attrib.get("IDRegDocTypeID"))
+                    self.documents.setdefault(elem.attrib.get("IdentityID"), []).append((doc_type, number))
+            else:
+                self._load_entry(elem, ns)
+        return self
+
+    def _load_refs(self, elem):
+        for value_set in elem:
+            if not isinstance(value_set.tag, str):
+                continue
+            set_name = value_set.tag.rpartition("}")[2]
+            if set_name not in _REFERENCE_SETS:
+                continue
+            table = self.refs.setdefault(set_name, {})
+            for item in value_set:
+                if not isinstance(item.tag, str):
+                    continue
+                table[item.attrib.get("ID")] = _clean(item.text)
+                if set_name == "PartySubTypeValues":
+                    self.party_types[item.attrib.get("ID")] = item.attrib.get("PartyTypeID")
+
+    def _load_location(self, elem, ns):
+        country_el = elem.find(f"{ns}LocationCountry")
+        country = self.ref("CountryValues", country_el.attrib.get("CountryID")) if country_el is not None else ""
+        parts = {}
+        for part in elem.findall(f"{ns}LocationPart"):
+            part_type = self.ref("LocPartTypeValues", part.attrib.get("LocPartTypeID")).upper()
+            value = _clean(part.findtext(f"{ns}LocationPartValue/{ns}Value"))
+            if value:
+                parts[part_type] = value
+        city = parts.get("CITY", "")
+        state = parts.get("STATE/PROVINCE", "") or parts.get("REGION", "")
+        pieces = [country, city, *(parts.get(p, "") for p in _STREET_PARTS), state, parts.get("POSTAL CODE", "")]
+        address = " ".join(p.replace(",", " ").strip() for p in pieces if p)
+        self.locations[elem.attrib.get("ID")] = (country, city, state, re.sub(r"\s+", " ", address))
+
+    def _load_entry(self, elem, ns):
+        programmes = self.programmes.setdefault(elem.attrib.get("ProfileID"), [])
+        for measure in elem.findall(f"{ns}SanctionsMeasure"):
+            if self.ref("SanctionsTypeValues", measure.attrib.get("SanctionsTypeID")) != "Program":
+                continue
+            prog = _clean(measure.findtext(f"{ns}Comment"))
+            if prog and prog not in programmes:
+                programmes.append(prog)
+
+
+class OFACSDNAdapter(SourceAdapter):
+    name = "ofac-sdn"
+    label = "OFAC SDN"
+    web_link = "https://sanctionssearch.ofac.treas.gov/"
+    default_url = "https://sanctionslistservice.ofac.treas.gov/api/PublicationPreview/exports/SDN_ADVANCED.XML"
+
+    def __init__(self, detector=None):
+        self.detector = detector
+
+    def iter_records(self, path):
+        if self.detector is None:
+            from ..conversion import get_gender_detector
+
+            self.detector = get_gender_detector()
+
+        backend = self.xml_backend
+        lookups = OFACLookups().load(path, backend=backend)
+        for party in iter_elements(path, "DistinctParty",
+                                   prune=("ReferenceValueSets", "Location", "IDRegDocument",
+                                          "SanctionsEntry", "ProfileRelationship"), backend=backend):
+            yield self._row(party, namespace_of(party), lookups)
+
+    def _names(self, identity, ns, lookups):
+        group_types = {
+            g.attrib.get("ID"): lookups.ref("NamePartTypeValues", g.attrib.get("NamePartTypeID"))
+            for g in identity.iter(f"{ns}NamePartGroup")
+        }
+        primary, aliases = None, []
+        for alias in identity.findall(f"{ns}Alias"):
+            for doc_name in alias.findall(f"{ns}DocumentedName"):
+                parts = {}
+                ordered = []
+                for value in doc_name.iter(f"{ns}NamePartValue"):
+                    text = _clean(value.text)
+                    if text:
+                        parts.setdefault(group_types.get(value.attrib.get("NamePartGroupID"), ""), text)
+                        ordered.append(text)
+                if "First Name" in parts or "Last Name" in parts:
+                    whole = " ".join(parts[t] for t in ("First Name", "Middle Name", "Last Name") if t in parts)
+                else:
+                    whole = " ".join(ordered)
+                if not whole or not is_latin_name(whole):
+                    continue
+                if primary is None and alias.attrib.get("Primary") == "true":
+                    primary = (clean_name(whole), parts)
+                else:
+                    aliases.append(clean_name(whole))
+        return primary, aliases
+
+    def _row(self, party, ns, lookups):
+        row = self.new_row()
+        flags = 0
+        row["VIOLATION_ID"] = party.attrib.get("FixedRef", "")
+
+        profile = party.find(f"{ns}Profile")
+        if profile is None:
+            row["FULL_NAME"] = "UNKNOWN"
+            row["CATEGORY"] = "UNKNOWN"
+            return row, NAME_MISSING | CATEGORY_MISSING
+
+        subtype_id = profile.attrib.get("PartySubTypeID")
+        party_type = lookups.ref("PartyTypeValues", lookups.party_types.get(subtype_id))
+        subtype = lookups.ref("PartySubTypeValues", subtype_id)
+        if party_type == "Individual":
+            row["CATEGORY"] = "person"
+        elif subtype and subtype != "Unknown":
+            row["CATEGORY"] = subtype.lower()
+        elif party_type == "Entity":
+            row["CATEGORY"] = "enterprise"
+        else:
+            row["CATEGORY"] = "UNKNOWN"
+            flags |= CATEGORY_MISSING
+
+        identities = profile.findall(f"{ns}Identity")
+        identity = next((i for i in identities if i.attrib.get("Primary") == "true"), identities[0] if identities else None)
+        primary, aliases = (None, []) if identity is None else self._names(identity, ns, lookups)
+        selected_name = primary[0] if primary else (aliases.pop(0) if aliases else None)
+        if selected_name:
+            row["FULL_NAME"] = selected_name
+        else:
+            row["FULL_NAME"] = "UNKNOWN"
+            flags |= NAME_MISSING
+        if primary and party_type == "Individual":
+            parts = primary[1]
+            row["F_NAME"] = clean_name(parts.get("First Name", ""))
+            row["M_NAME"] = clean_name(parts.get("Middle Name", ""))
+            row["L_NAME"] = clean_name(parts.get("Last Name", ""))
+        row["ALIAS"] = "; ".join(a for a in dict.fromkeys(aliases) if a != selected_name)
+
+        source_gender = ""
+        nationalities, addresses, titles, birth_places, extra_dates = [], [], [], [], []
+        for feature in profile.findall(f"{ns}Feature"):
+            feature_type = lookups.ref("FeatureTypeValues", feature.attrib.get("FeatureTypeID"))
+            for version in feature.findall(f"{ns}FeatureVersion"):
+                detail = version.find(f"{ns}VersionDetail")
+                detail_text = _clean(detail.text) if detail is not None else ""
+                detail_ref = lookups.ref("DetailReferenceValues", detail.attrib.get("DetailReferenceID")) if detail is not None else ""
+                loc_el = version.find(f"{ns}VersionLocation")
+                location = lookups.locations.get(loc_el.attrib.get("LocationID")) if loc_el is not None else None
+
+                if feature_type == "Birthdate":
+                    start = version.find(f"{ns}DatePeriod/{ns}Start/{ns}From")
+                    if start is None:
+                        continue
+                    y, m, d = (_clean(start.findtext(f"{ns}{t}")) for t in ("Year", "Month", "Day"))
+                    if y and m and d and not row.get("DOB"):
+                        row["DOB"] = f"{int(d):02d}-{int(m):02d}-{y}"
+                    elif y:
+                        extra_dates.append(y)
+                elif feature_type in ("Nationality Country", "Citizenship Country"):
+                    country = location[0] if location else detail_ref
+                    if country and country not in nationalities:
+                        nationalities.append(country)
+                elif feature_type == "Location" and location:
+                    addresses.append(location)
+                elif feature_type == "Place of Birth":
+                    place = detail_text or (location[3] if location else "")
+                    if place:
+                        birth_places.append(place)
+                elif feature_type == "Gender":
+                    source_gender = detail_ref or detail_text
+                elif feature_type == "Title" and detail_text:
+                    titles.append(detail_text)
+
+        if party_type == "Individual":
+            row["GENDER"] = infer_gender(selected_name, source_gender, self.detector)
+        row["NATIONALITIES"] = "; ".join(nationalities)
+        if addresses:
+            row["ADD_COUNTRY"], row["ADD_CITY"], row["STATE"], _ = addresses[0]
+            row["ADDRESS"] = "; ".join(dict.fromkeys(a[3] for a in addresses if a[3]))
+
+        docs = lookups.documents.get(identity.attrib.get("ID")) if identity is not None else None
+        if docs:
+            row["IDENTITY NUMBER"] = "; ".join(number for _, number in docs)
+            row["IDENTITY TYPE"] = "; ".join(doc_type or "Document" for doc_type, _ in docs)
+
+        programmes = lookups.programmes.get(profile.attrib.get("ID"), [])
+        row["REM2"] = "Programme: " + " / ".join(programmes) if programmes else ""
+
+        details = []
+        for field, vals in (("Title", titles), ("Birth date", extra_dates), ("Birth place", birth_places)):
+            vals = list(dict.fromkeys(vals))
+            if vals:
+                details.append(f"{field}: " + " / ".join(vals))
+        row["DETAILS"] = "; ".join(details)
+        return row, flags
+
+    def finalize(self, columns, status):
+        columns["FULL_NAME"] = clean_fullname_column(columns["FULL_NAME"])
+        columns["NATIONALITIES"] = title_column(columns["NATIONALITIES"])
+        columns["ADD_COUNTRY"] = title_column(columns["ADD_COUNTRY"])
+        return columns
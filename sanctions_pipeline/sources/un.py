@@ -0,0 +1,142 @@
+"""
+UN Security Council consolidated list adapter.
+
+The feed has no namespace; individuals and entities are ``INDIVIDUAL`` and
+``ENTITY`` elements under ``INDIVIDUALS`` / ``ENTITIES``.  Both are streamed
+with ``iter_elements``.
+"""
+import re
+
+from ..normalize import clean_name, is_latin_name
+from ..postprocess import clean_fullname_column, title_column
+from ..status import NAME_MISSING
+from .base import SourceAdapter, format_iso_date, infer_gender, iter_elements
+
+
+def _text(elem, tag):
+    child = elem.find(tag)
+    if child is None or child.text is None:
+        return ""
+    return re.sub(r"\s+", " ", child.text).strip()
+
+
+def _values(elem, path):
+    out = []
+    for v in elem.findall(path):
+        if v.text and v.text.strip() and v.text.strip() not in out:
+            out.append(v.text.strip())
+    return out
+
+
+def _valid(value):
+    return value and value.strip() and value.strip().upper() != "UNKNOWN"
+
+
+class UNConsolidatedAdapter(SourceAdapter):
+    name = "un"
+    label = "UN CONSOLIDATED LIST"
+    web_link = "https://main.un.org/securitycouncil/en/content/un-sc-consolidated-list"
+    default_url = "https://scsanctions.un.org/resources/xml/en/consolidated.xml"
+
+    def __init__(self, detector=None):
+        self.detector = detector
+
+    def iter_records(self, path):
+        if self.detector is None:
+            from ..conversion import get_gender_detector
+
+            self.detector = get_gender_detector()
+
+        for elem in iter_elements(path, ("INDIVIDUAL", "ENTITY"), backend=self.xml_backend):
+            yield self._row(elem)
+
+    def _row(self, elem):
+        row = self.new_row()
+        flags = 0
+        is_person = elem.tag == "INDIVIDUAL"
+        prefix = "INDIVIDUAL" if is_person else "ENTITY"
+
+        row["CATEGORY"] = "person" if is_person else "enterprise"
+
+        parts = [_text(elem, t) for t in ("FIRST_NAME", "SECOND_NAME", "THIRD_NAME", "FOURTH_NAME")]
+        whole = " ".join(p for p in parts if p)
+        selected_name = clean_name(whole) if whole and is_latin_name(whole) else None
+        if selected_name:
+            row["FULL_NAME"] = selected_name
+        else:
+            row["FULL_NAME"] = "UNKNOWN"
+            flags |= NAME_MISSING
+
+        if is_person:
+            row["GENDER"] = infer_gender(selected_name, _text(elem, "GENDER"), self.detector)
+            for dob in elem.findall("INDIVIDUAL_DATE_OF_BIRTH"):
+                formatted = format_iso_date(_text(dob, "DATE"))
+                if formatted:
+                    row["DOB"] = formatted
+                    break
+
+        row["NATIONALITIES"] = "; ".join(_values(elem, "NATIONALITY/VALUE"))
+
+        addresses = elem.findall(f"{prefix}_ADDRESS")
+        if addresses:
+            first = addresses[0]
+            city, country, state = _text(first, "CITY"), _text(first, "COUNTRY"), _text(first, "STATE_PROVINCE")
+            row["ADD_CITY"] = city if _valid(city) else ""
+            row["ADD_COUNTRY"] = country if _valid(country) else ""
+            row["STATE"] = state if _valid(state) else ""
+        address_list = []
+        for addr in addresses:
+            parts = [_text(addr, t) for t in ("COUNTRY", "CITY", "STREET", "STATE_PROVINCE", "ZIP_CODE")]
+            parts = [p.replace(",", " ").strip() for p in parts if _valid(p)]
+            if parts:
+                address_list.append(re.sub(r"\s+", " ", " ".join(parts)))
+        row["ADDRESS"] = "; ".join(address_list)
+
+        numbers, types = [], []
+        for doc in elem.findall("INDIVIDUAL_DOCUMENT"):
+            number = _text(doc, "NUMBER")
+            if number:
+                numbers.append(number)
+                types.append(_text(doc, "TYPE_OF_DOCUMENT") or "Document")
+        row["IDENTITY NUMBER"] = "; ".join(numbers)
+        row["IDENTITY TYPE"] = "; ".join(types)
+
+        aliases = []
+        for alias in elem.findall(f"{prefix}_ALIAS"):
+            name = _text(alias, "ALIAS_NAME")
+            if name and is_latin_name(name):
+                cleaned = clean_name(name)
+                if cleaned != selected_name and cleaned not in aliases:
+                    aliases.append(cleaned)
+        row["ALIAS"] = "; ".join(aliases)
+
+        row["REF_DATE"] = format_iso_date(_text(elem, "LISTED_ON"))
+        row["VIOLATION_ID"] = _text(elem, "REFERENCE_NUMBER")
+
+        designations = _values(elem, "DESIGNATION/VALUE")
+        row["REM1"] = "Designation: " + "; ".join(designations) if designations else ""
+        list_type = _text(elem, "UN_LIST_TYPE")
+        row["REM2"] = "Programme: " + list_type if list_type else ""
+
+        details = []
+        titles = _values(elem, "TITLE/VALUE")
+        if titles:
+            details.append("Title: " + " / ".join(titles))
+        places = []
+        for pob in elem.findall("INDIVIDUAL_PLACE_OF_BIRTH"):
+            place = ", ".join(p for p in (_text(pob, "CITY"), _text(pob, "STATE_PROVINCE"), _text(pob, "COUNTRY")) if p)
+            if place:
+                places.append(place)
+        if places:
+            details.append("Birth place: " + " / ".join(places))
+        comment = _text(elem, "COMMENTS1")
+        if comment:
+            details.append("Remark: " + comment)
+        row["DETAILS"] = "; ".join(details)
+        return row, flags
+
+    def finalize(self, columns, status):
+        columns["FULL_NAME"] = clean_fullname_column(columns["FULL_NAME"])
+        columns["NATIONALITIES"] = title_column(columns["NATIONALITIES"])
+        columns["ADD_COUNTRY"] = title_column(columns["ADD_COUNTRY"])
+        return columns
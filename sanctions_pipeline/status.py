@@ -0,0 +1,32 @@
+"""
+Per-row review status.
+
+Every output row carries a bitmask in a ``uint8`` array instead of the
+cell colours that used to encode it; the Excel writer renders the
+highlighting from these flags.
+"""
+import numpy as np
+
+NAME_MISSING = 1        # no Latin wholeName, FULL_NAME is "UNKNOWN"
+CATEGORY_MISSING = 2    # no subjectType classification, CATEGORY is "UNKNOWN"
+REM2_MISSING = 4        # no PDF match for REM2 (yellow)
+REM2_CONFLICT = 8       # duplicate name with disagreeing REM2 neighbours (red row)
+
+
+def new_status_array(size):
+    return np.zeros(size, dtype=np.uint8)
+
+
+def flag_mask(row_status, flag):
+    return (np.asarray(row_status) & flag) != 0
+
+
+def visible_flags(row_status):
+    """
+    The flags as they show in the workbook.  A conflict row is red from the
+    second column on, which hides its CATEGORY and REM2 yellow; the FULL_NAME
+    yellow stays visible.
+    """
+    row_status = np.asarray(row_status, dtype=np.uint8)
+    conflict = (row_status & REM2_CONFLICT) != 0
+    return np.where(conflict, row_status & (NAME_MISSING | REM2_CONFLICT), row_status).astype(np.uint8)
@@ -0,0 +1,109 @@
+"""
+Synthetic travel-ban corpora.
+
+``generate_corpus`` writes an XML chunk archive and a PDF text chunk archive
+shaped like the real ones. The generated data covers the awkward cases the
+conversion has to handle:
+
+* Cyrillic-only aliases;
+* duplicate names with agreeing and disagreeing PDF entries;
+* missing classifications;
+* partial and ranged birth dates;
+* "UNKNOWN" countries;
+* lettered functions and titles;
+* PDF chunks with the name or number on the following line;
+* the odd malformed chunk.
+
+The same ``seed`` always gives the same corpus.
+"""
+import random
+from xml.sax.saxutils import escape, quoteattr
+
+from .artifacts import ChunkWriter
+
+NAMESPACE = "http://eu.europa.ec/fpi/fsd/export"
+
+FIRST = ["Ivan", "Olga", "Mohammad", "Anna", "José", "Zoë", "Abdul", "Maria", "Kim", "Sergei", "Fatima", "Janan Agha"]
+LAST = ["Petrov", "Ivanova", "Rahman", "Müller", "García", "Kim", "Noorzai", "Smith", "O’Brien", "Łukasz"]
+CYRILLIC = ["Иван Петров", "Ольга Иванова", "Сергей"]
+COUNTRIES = ["RUSSIAN FEDERATION", "IRAN (ISLAMIC REPUBLIC OF)", "UNKNOWN", "afghanistan", "Belarus",
+             "SYRIAN ARAB REPUBLIC", "Korea, Democratic People's Republic of"]
+CITIES = ["Moscow City", "Kabul Province Kabul", "Minsk, Minsk", "Tehran - city", "UNKNOWN",
+          "Herat province herat", "Damascus"]
+PROGRAMMES = ["RUS", "IRN", "BLR", "SYR", "AFG|TAQA", "PRK"]
+
+
+def _entity_xml(r, seq, name):
+    aliases = []
+    if r.random() < 0.2:
+        aliases.append(f"<nameAlias wholeName={quoteattr(r.choice(CYRILLIC))} />")
+    gender = r.choice(["", ' gender="M"', ' gender="F"', ""])
+    function = r.choice(["", ' function="(a) Minister, (b) Governor"', ' function="Head of security"'])
+    title = r.choice(["", ' title="(a) Mullah, (b) Haji"', ' title="General"'])
+    aliases.append(f"<nameAlias wholeName={quoteattr(name)}{gender}{function}{title} />")
+    for _ in range(r.randint(0, 3)):
+        aliases.append(f"<nameAlias wholeName={quoteattr(r.choice(FIRST) + ' ' + r.choice(LAST))} />")
+    if r.random() < 0.05:
+        aliases = [f"<nameAlias wholeName={quoteattr(r.choice(CYRILLIC))} />"]
+
+    subject = r.choice(['<subjectType classificationCode="person" />',
+                        '<subjectType classificationCode="enterprise" />', "<subjectType />", ""])
+    citizenships = "".join(f"<citizenship countryDescription={quoteattr(r.choice(COUNTRIES))} />"
+                           for _ in range(r.randint(0, 3)))
+    birthdates = []
+    for _ in range(r.randint(0, 3)):
+        k = r.random()
+        if k < 0.5:
+            birthdates.append(f'<birthdate birthdate="19{r.randint(40, 99)}-0{r.randint(1, 9)}-1{r.randint(0, 9)}" '
+                              f'year="19{r.randint(40, 99)}" place={quoteattr(r.choice(CITIES))} />')
+        elif k < 0.7:
+            birthdates.append(f'<birthdate year="19{r.randint(40, 99)}" />')
+        elif k < 0.85:
+            birthdates.append('<birthdate yearRangeFrom="1950" yearRangeTo="1955" />')
+        else:
+            birthdates.append('<birthdate birthdate="1970" />')
+    addresses = "".join(
+        f"<address city={quoteattr(r.choice(CITIES))} countryDescription={quoteattr(r.choice(COUNTRIES))} "
+        f'region={quoteattr(r.choice(CITIES))} street="1, Main  St" zipCode="12345" place="" />'
+        for _ in range(r.randint(0, 2))
+    )
+    regulation = f'<regulation numberTitle="2014/145 (OJ L78)" programme="{r.choice(PROGRAMMES).split("|")[0]}" />'
+    remark = r.choice(["", "<remark>Some remark</remark>", "<remark>none</remark>",
+                       f"<remark>{escape(chr(10) + '  Multi' + chr(10) + 'line  ')}</remark>"])
+    body = f"{regulation}{subject}{''.join(aliases)}{citizenships}{''.join(birthdates)}{addresses}{remark}"
+    return (f"<?xml version='1.0' encoding='utf-8'?>\n<root><sanctionEntity xmlns=\"{NAMESPACE}\" "
+            f"logicalId=\"{seq}\">{body}</sanctionEntity></root>").encode("utf-8")
+
+
+def _pdf_chunk(r, seq, name):
+    programme = r.choice(PROGRAMMES)
+    lines = [f"Entity {seq}", f"Name/Alias: {name}" if r.random() < 0.9 else "Name/Alias:", "", name,
+             f"Programme: EU | {programme}"]
+    for _ in range(r.randint(0, 2)):
+        lines.append("Number:" if r.random() < 0.3 else f"Number: {r.randint(1000, 9999)}  A")
+        lines.append(f"P{r.randint(100, 999)}")
+    return "\n".join(lines), programme.split("|")[0]
+
+
+def generate_corpus(size, xml_archive, pdf_archive, seed=1):
+    """Write ``size`` entities to ``xml_archive`` and about three quarters of them to ``pdf_archive``."""
+    r = random.Random(seed)
+    names = []
+    with ChunkWriter(xml_archive, ".xml") as xml_writer, ChunkWriter(pdf_archive, ".txt") as pdf_writer:
+        for seq in range(1, size + 1):
+            if names and r.random() < 0.15:
+                name = r.choice(names)
+            else:
+                name = f"{r.choice(FIRST)} {''.join(r.choice('abcdefghik') for _ in range(5)).title()} {r.choice(LAST)}"
+                if r.random() < 0.2:
+                    name += " " + r.choice(LAST)
+                names.append(name)
+
+            if r.random() < 0.002:
+                xml_writer.append(b"<root><sanctionEntity>broken</root>")
+            else:
+                xml_writer.append(_entity_xml(r, seq, name))
+            if r.random() < 0.75:
+                text, programme = _pdf_chunk(r, seq, name)
+                pdf_writer.append(text, programme=programme)
+    return size
@@ -0,0 +1,198 @@
+"""
+Lease-based task queue in a single SQLite file.
+
+Any number of processes, on one machine or on several sharing the file, can
+``claim`` tasks.  A claim is a lease: the task belongs to its owner until the
+lease expires, and the owner renews it while it works.  When a worker dies or
+hangs, its lease runs out and the next ``claim`` hands the task out again.
+Each hand-out counts as an attempt.  A task that fails or loses its lease on
+its last attempt is marked ``failed``; ``retry_failed`` puts those back.
+Completion only counts for the current lease holder.  Tasks must therefore be
+idempotent: a worker that lost its lease may still finish and write its
+files, but its result is discarded.
+
+SQLite locking on network filesystems is only as good as their lock support.
+Lease times are wall-clock times, so the machines' clocks should agree to well
+within the lease length.
+"""
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    run TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    UNIQUE (run, kind, key)
+);
+CREATE INDEX IF NOT EXISTS tasks_claim ON tasks (state, priority, id);
+"""
+
+
+@dataclass(frozen=True)
+class Task:
+    id: int
+    run: str
+    kind: str
+    key: str
+    payload: dict
+    attempts: int
+
+
+class WorkQueue:
+    def __init__(self, path, timeout=60.0):
+        self.path = str(path)
+        # Autocommit; every write goes through an explicit BEGIN IMMEDIATE.
+        self.db = sqlite3.connect(self.path, timeout=timeout, isolation_level=None)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @contextmanager
+    def transaction(self):
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    def add(self, run, kind, key, payload, priority=0, max_attempts=3):
+        """Queue a task unless ``(run, kind, key)`` already exists; returns whether it was added."""
+        cur = self.db.execute(
+            "INSERT OR IGNORE INTO tasks (run, kind, key, priority, payload, state, max_attempts, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (run, kind, key, priority, json.dumps(payload), PENDING, max_attempts, time.time()),
+        )
+        return cur.rowcount == 1
+
+    def claim(self, owner, lease_s):
+        """Lease the next runnable task (lowest priority, then oldest) to ``owner``, or ``None``."""
+        now = time.time()
+        with self.transaction():
+            self.db.execute(
+                "UPDATE tasks SET state = ?, owner = NULL, lease_expires = NULL, updated_at = ?, "
+                "error = 'lease expired on the last attempt' "
+                "WHERE state = ? AND lease_expires < ? AND attempts >= max_attempts",
+                (FAILED, now, LEASED, now),
+            )
+            row = self.db.execute(
+                "SELECT id, run, kind, key, payload, attempts FROM tasks "
+                "WHERE state = ? OR (state = ? AND lease_expires < ?) "
+                "ORDER BY priority, id LIMIT 1",
+                (PENDING, LEASED, now),
+            ).fetchone()
+            if row is None:
+                return None
+            self.db.execute(
+                "UPDATE tasks SET state = ?, owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE id = ?",
+                (LEASED, owner, now + lease_s, now, row[0]),
+            )
+        task_id, run, kind, key, payload, attempts = row
+        return Task(task_id, run, kind, key, json.loads(payload), attempts + 1)
+
+    def renew(self, task, owner, lease_s):
+        """Extend ``owner``'s lease on ``task``; ``False`` if the lease was lost."""
+        now = time.time()
+        with self.transaction():
+            cur = self.db.execute(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ? WHERE id = ? AND owner = ? AND state = ?",
+                (now + lease_s, now, task.id, owner, LEASED),
+            )
+        return cur.rowcount == 1
+
+    def complete(self, task, owner, result, then=None):
+        """
+        Mark ``task`` done with ``result`` and run ``then(queue)`` in the same
+        transaction (to queue follow-up tasks).  ``False`` if ``owner`` no
+        longer holds the lease; nothing is recorded then.
+        """
+        with self.transaction():
+            cur = self.db.execute(
+                "UPDATE tasks SET state = ?, result = ?, error = NULL, owner = NULL, lease_expires = NULL, "
+                "updated_at = ? WHERE id = ? AND owner = ? AND state = ?",
+                (DONE, json.dumps(result), time.time(), task.id, owner, LEASED),
+            )
+            if cur.rowcount != 1:
+                return False
+            if then is not None:
+                then(self)
+        return True
+
+    def fail(self, task, owner, error):
+        """Give ``task`` back for another attempt, or mark it failed after its last one."""
+        with self.transaction():
+            self.db.execute(
+                "UPDATE tasks SET state = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END, "
+                "error = ?, owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND owner = ? AND state = ?",
+                (FAILED, PENDING, error, time.time(), task.id, owner, LEASED),
+            )
+
+    def retry_failed(self, run=None):
+        """Reset failed tasks (of ``run``) to pending with fresh attempts; returns how many."""
+        with self.transaction():
+            cur = self.db.execute(
+                "UPDATE tasks SET state = ?, attempts = 0, updated_at = ? WHERE state = ? AND (? IS NULL OR run = ?)",
+                (PENDING, time.time(), FAILED, run, run),
+            )
+        return cur.rowcount
+
+    def unfinished(self, run, kind):
+        return self.db.execute(
+            "SELECT COUNT(*) FROM tasks WHERE run = ? AND kind = ? AND state != ?", (run, kind, DONE)
+        ).fetchone()[0]
+
+    def active(self):
+        """Whether any task is still pending or leased."""
+        return self.db.execute(
+            "SELECT EXISTS (SELECT 1 FROM tasks WHERE state IN (?, ?))", (PENDING, LEASED)
+        ).fetchone()[0] == 1
+
+    def results(self, run, kind):
+        """``[(key, result)]`` of the done ``kind`` tasks of ``run``, ordered by key."""
+        rows = self.db.execute(
+            "SELECT key, result FROM tasks WHERE run = ? AND kind = ? AND state = ? ORDER BY key",
+            (run, kind, DONE),
+        )
+        return [(key, json.loads(result)) for key, result in rows]
+
+    def summary(self):
+        """``{run: {kind: {state: count}}}`` plus the errors of failed tasks."""
+        counts = {}
+        for run, kind, state, n in self.db.execute(
+            "SELECT run, kind, state, COUNT(*) FROM tasks GROUP BY run, kind, state ORDER BY run, kind"
+        ):
+            counts.setdefault(run, {}).setdefault(kind, {})[state] = n
+        failures = self.db.execute(
+            "SELECT run, kind, key, attempts, error FROM tasks WHERE state = ? ORDER BY id", (FAILED,)
+        ).fetchall()
+        return counts, failures
@@ -0,0 +1,225 @@
+"""
+XML split stage: break the downloaded feed into one chunk per sanctionEntity.
+The programme of the entity's first regulation goes in the member comment.
+
+The feed is streamed through the ``xmlbackend`` parser (lxml when installed)
+with tag filtering, so memory stays flat.
+
+With ``workers`` the feed is memory-mapped and one byte scan finds where each
+``<sanctionEntity>`` starts and ends.  The markup between entities is read
+tag by tag to keep the namespace declarations of the enclosing elements.
+Worker processes map the same file and parse their ranges, each wrapped in an
+element carrying those declarations, so the feed is never copied or parsed as
+a whole.  Chunks are written in feed order and, with the same backend, are
+byte-for-byte the same as from the sequential split.  The scan assumes
+entities are not nested and do not appear inside comments or CDATA.  When the
+scan does not add up or a range does not parse, the sequential split runs
+instead.
+"""
+import mmap
+import re
+from functools import partial
+
+from .artifacts import ChunkWriter
+from .xmlbackend import get_backend
+
+ENTITY_TAG = b"sanctionEntity"
+_NAME_BYTES = frozenset(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_.-")
+_TAG_END = re.compile(rb"""(?:[^<>"']|"[^"]*"|'[^']*')*>""")
+_XMLNS = re.compile(rb"""\sxmlns(?::[\w.-]+)?\s*=\s*(?:"[^"]*"|'[^']*')""")
+# Ranges per worker, so a slow range does not leave the other workers idle.
+_BATCHES_PER_WORKER = 4
+
+
+def entity_programme(entity, namespace):
+    """Programme of the entity's first regulation, or ``None``."""
+    regulation = entity.find(f".//{namespace}regulation")
+    programme = regulation.attrib.get("programme", "").strip() if regulation is not None else ""
+    return programme or None
+
+
+def entity_chunk(backend, entity):
+    """``(chunk bytes, programme)`` for one parsed entity."""
+    namespace = entity.tag.split("}")[0] + "}" if entity.tag.startswith("{") else ""
+    return backend.chunk_bytes(entity), entity_programme(entity, namespace)
+
+
+def _root_start(buf):
+    """``(prolog, root start tag, end offset)``: the XML declaration, if any, and the root's start tag."""
+    prolog = b""
+    pos = 0
+    while True:
+        pos = buf.find(b"<", pos)
+        if pos < 0:
+            raise ValueError("no root element")
+        if buf[pos:pos + 5] == b"<?xml":
+            end = buf.find(b"?>", pos) + 2
+            prolog = buf[pos:end]
+            pos = end
+        elif buf[pos:pos + 4] == b"<!--":
+            pos = buf.find(b"-->", pos) + 3
+        elif buf[pos:pos + 9] == b"<!DOCTYPE":
+            end = buf.find(b">", pos)
+            if b"[" in buf[pos:end]:
+                raise ValueError("internal DTD subsets are not supported")
+            pos = end + 1
+        elif buf[pos:pos + 2] == b"<?":
+            pos = buf.find(b"?>", pos) + 2
+        else:
+            match = _TAG_END.match(buf, pos + 1)
+            if match is None:
+                raise ValueError("unterminated root start tag")
+            return prolog, buf[pos:match.end()], match.end()
+
+
+def _skip_markup(buf, lt):
+    """End of the comment, CDATA section, processing instruction or declaration at ``lt``, or ``None``."""
+    for opener, closer in ((b"<!--", b"-->"), (b"<![CDATA[", b"]]>"), (b"<?", b"?>"), (b"<!", b">")):
+        if buf[lt:lt + len(opener)] == opener:
+            end = buf.find(closer, lt + len(opener))
+            if end < 0:
+                raise ValueError(f"unterminated markup at byte {lt}")
+            return end + len(closer)
+    return None
+
+
+def _track_scopes(buf, pos, end, scopes):
+    """Push and pop the namespace declarations of the elements opened and closed in ``buf[pos:end]``."""
+    while True:
+        lt = buf.find(b"<", pos, end)
+        if lt < 0:
+            return
+        pos = _skip_markup(buf, lt)
+        if pos is not None:
+            continue
+        match = _TAG_END.match(buf, lt + 1)
+        if match is None:
+            raise ValueError(f"unterminated tag at byte {lt}")
+        pos = match.end()
+        if buf[lt + 1:lt + 2] == b"/":
+            if len(scopes) == 1:
+                raise ValueError(f"unmatched closing tag at byte {lt}")
+            scopes.pop()
+        elif buf[pos - 2:pos - 1] != b"/":
+            scopes.append(_XMLNS.findall(buf[lt:pos]))
+
+
+def _scope_head(prolog, scopes, heads):
+    """
+    Wrapper start tag declaring every namespace in scope, inner declarations
+    first and winning; lxml serialises inherited declarations in that order.
+    """
+    declared = {}
+    for decls in reversed(scopes):
+        for decl in decls:
+            declared.setdefault(decl.split(b"=", 1)[0].strip(), decl)
+    key = tuple(declared.values())
+    if key not in heads:
+        heads[key] = prolog + b"<root" + b"".join(key) + b">"
+    return heads[key]
+
+
+def scan_entity_ranges(buf):
+    """
+    ``(start, end, head)`` per entity of a mapped feed.  ``head`` opens a
+    wrapper element, after the feed's XML declaration, with the namespace
+    declarations of the root and every other enclosing element.  Raises
+    ``ValueError`` when the tags do not pair up.
+    """
+    prolog, root_tag, pos = _root_start(buf)
+    scopes = [_XMLNS.findall(root_tag)]
+    heads = {}
+    outside = pos           # start of the markup between the previous entity and the next
+
+    ranges = []
+    start = None
+    while True:
+        hit = buf.find(ENTITY_TAG, pos)
+        if hit < 0:
+            break
+        pos = hit + len(ENTITY_TAG)
+        if buf[pos:pos + 1] not in (b" ", b"\t", b"\r", b"\n", b">", b"/"):
+            continue
+        i = hit
+        if buf[i - 1:i] == b":":
+            i -= 1
+            while i > 0 and buf[i - 1] in _NAME_BYTES:
+                i -= 1
+        if buf[i - 2:i] == b"</":
+            closing, lt = True, i - 2
+        elif buf[i - 1:i] == b"<":
+            closing, lt = False, i - 1
+        else:
+            continue
+        match = _TAG_END.match(buf, pos)
+        if match is None:
+            raise ValueError(f"unterminated tag at byte {lt}")
+        pos = match.end()
+        if closing:
+            if start is None:
+                raise ValueError(f"unmatched closing tag at byte {lt}")
+            start, lt = None, start
+        elif start is not None:
+            raise ValueError(f"nested entity at byte {lt}")
+        else:
+            _track_scopes(buf, outside, lt, scopes)
+            head = _scope_head(prolog, scopes, heads)
+            if buf[pos - 2:pos - 1] != b"/":
+                start = lt
+                continue
+        ranges.append((lt, pos, head))
+        outside = pos
+    if start is not None:
+        raise ValueError(f"unterminated entity at byte {start}")
+    return ranges
+
+
+def _split_ranges(xml_path, ranges):
+    """Worker: the chunks of ``ranges``, read from the worker's own mapping of the feed."""
+    backend = get_backend()
+    chunks = []
+    with open(xml_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        for start, end, head in ranges:
+            try:
+                entity = backend.fromstring(head + buf[start:end] + b"</root>")[0]
+            except SyntaxError as e:
+                # ET.ParseError and lxml's XMLSyntaxError; ValueError pickles reliably.
+                raise ValueError(f"entity at byte {start} does not parse: {e}") from None
+            chunks.append(entity_chunk(backend, entity))
+    return chunks
+
+
+def _split_parallel(input_xml_path, archive_path, workers):
+    from concurrent.futures import ProcessPoolExecutor
+
+    with open(input_xml_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        ranges = scan_entity_ranges(buf)
+    total = len(ranges)
+    print(f"Found {total} <sanctionEntity> elements, parsing in {workers} processes")
+
+    size = max(1, -(-total // (workers * _BATCHES_PER_WORKER)))
+    batches = [ranges[i:i + size] for i in range(0, total, size)]
+    with ProcessPoolExecutor(max_workers=workers) as pool, ChunkWriter(archive_path, ".xml") as writer:
+        for chunks in pool.map(partial(_split_ranges, str(input_xml_path)), batches):
+            for data, programme in chunks:
+                writer.append(data, programme=programme)
+    return total
+
+
+def split_xml_entities(input_xml_path, archive_path, workers=None):
+    print("🔎 Parsing XML and splitting sanctionEntity tags...")
+    if workers and workers > 1:
+        try:
+            return _split_parallel(input_xml_path, archive_path, workers)
+        except (ValueError, SyntaxError) as e:
+            print(f"⚠️ Byte-range split not possible ({e}), parsing the whole feed instead")
+
+    backend = get_backend()
+    total = 0
+    with ChunkWriter(archive_path, ".xml") as writer:
+        for entity in backend.iterparse(input_xml_path, {"sanctionEntity"}):
+            writer.append(*entity_chunk(backend, entity))
+            total += 1
+    print(f"Found {total} <sanctionEntity> elements")
+
+    return total
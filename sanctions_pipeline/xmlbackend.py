@@ -0,0 +1,110 @@
+"""
+XML parser backends.
+
+``lxml`` is used when it is installed: lookups are compiled once per
+namespace into XPath objects, and ``iterparse`` filters by tag in C so the
+unwanted elements never reach Python.  The stdlib ``ElementTree`` backend is
+the fallback and gives the same results.  Set ``SANCTIONS_XML_BACKEND`` to
+``lxml`` or ``etree`` to force one.
+"""
+import os
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+
+BACKENDS = ("lxml", "etree")
+
+
+class EtreeBackend:
+    name = "etree"
+
+    def fromstring(self, data):
+        return ET.fromstring(data)
+
+    def descendants(self, local_name, namespace):
+        """Compiled ``.//name`` lookup: a callable returning the matching elements."""
+        path = f".//{namespace}{local_name}"
+        return lambda elem: elem.findall(path)
+
+    def chunk_bytes(self, elem):
+        """``elem`` without its tail in a ``<root>`` wrapper, as a UTF-8 document."""
+        wrapper = ET.Element("root")
+        wrapper.append(elem)
+        tail, elem.tail = elem.tail, None
+        try:
+            return ET.tostring(wrapper, encoding="utf-8", xml_declaration=True)
+        finally:
+            elem.tail = tail
+
+    def iterparse(self, path, wanted, prune=()):
+        stack = []
+        for event, elem in ET.iterparse(path, events=("start", "end")):
+            if event == "start":
+                stack.append(elem)
+                continue
+            stack.pop()
+            local = elem.tag.rpartition("}")[2]
+            if local in wanted:
+                yield elem
+            elif local not in prune:
+                continue
+            elem.clear()
+            if stack:
+                stack[-1].remove(elem)
+
+
+class LxmlBackend:
+    name = "lxml"
+
+    def __init__(self):
+        from lxml import etree
+
+        self.etree = etree
+        self.parser = etree.XMLParser(resolve_entities=False, no_network=True)
+
+    def fromstring(self, data):
+        return self.etree.fromstring(data, self.parser)
+
+    def descendants(self, local_name, namespace):
+        if namespace:
+            return self.etree.XPath(f".//ns:{local_name}", namespaces={"ns": namespace.strip("{}")})
+        return self.etree.XPath(f".//{local_name}")
+
+    def chunk_bytes(self, elem):
+        body = self.etree.tostring(elem, encoding="utf-8", xml_declaration=False, with_tail=False)
+        return b"<?xml version='1.0' encoding='utf-8'?>\n<root>" + body + b"</root>"
+
+    def iterparse(self, path, wanted, prune=()):
+        tags = [f"{{*}}{name}" for name in (*wanted, *prune)]
+        for _, elem in self.etree.iterparse(str(path), events=("end",), tag=tags,
+                                            resolve_entities=False, no_network=True):
+            if elem.tag.rpartition("}")[2] in wanted:
+                yield elem
+            # Drop the element and everything already parsed before it.
+            elem.clear(keep_tail=True)
+            parent = elem.getparent()
+            if parent is not None:
+                while elem.getprevious() is not None:
+                    del parent[0]
+
+
+@lru_cache(maxsize=None)
+def get_backend(name=None):
+    """``name`` (or ``$SANCTIONS_XML_BACKEND``); defaults to lxml when importable."""
+    name = (name or os.environ.get("SANCTIONS_XML_BACKEND") or "").lower() or None
+    if name not in (None, *BACKENDS):
+        raise ValueError(f"unknown XML backend {name!r}; choose from {', '.join(BACKENDS)}")
+    if name in (None, "lxml"):
+        try:
+            return LxmlBackend()
+        except ImportError:
+            if name == "lxml":
+                raise RuntimeError("the lxml backend needs lxml (pip install lxml)") from None
+    return EtreeBackend()
+
+
+class Queries:
+    """Named descendant lookups compiled once for one backend and namespace."""
+
+    def __init__(self, backend, namespace, names):
+        for attr, local_name in names.items():
+            setattr(self, attr, backend.descendants(local_name, namespace))
@@ -0,0 +1,94 @@
+import pytest
+
+from sanctions_pipeline import checkpoint
+from sanctions_pipeline.checkpoint import (_hash_files, completed_since, load_manifest, manifest_is_valid,
+                                           run_stage)
+from sanctions_pipeline.config import DataPaths
+
+
+@pytest.fixture
+def stage(tmp_path):
+    """A completed one-input, one-output stage; returns ``(paths, source, output)``."""
+    paths = DataPaths(tmp_path)
+    source, output = tmp_path / "in.txt", tmp_path / "out.txt"
+    source.write_text("input")
+
+    def run():
+        output.write_text(source.read_text().upper())
+        return {"out": output}, {}
+
+    run_stage(paths, "copy", {"in": source}, run, params={"mode": "upper"})
+    return paths, source, output
+
+
+def is_valid(paths, source, params=None):
+    return manifest_is_valid(load_manifest(paths, "copy"), _hash_files({"in": source}),
+                             params or {"mode": "upper"})
+
+
+def test_unchanged_stage_is_valid(stage):
+    paths, source, _ = stage
+    assert load_manifest(paths, "copy")["status"] == "complete"
+    assert is_valid(paths, source)
+
+
+def test_changed_input_invalidates(stage):
+    paths, source, _ = stage
+    source.write_text("other input")
+    assert not is_valid(paths, source)
+
+
+def test_changed_params_invalidate(stage):
+    paths, source, _ = stage
+    assert not is_valid(paths, source, {"mode": "lower"})
+
+
+@pytest.mark.parametrize("change", ["modify", "delete"])
+def test_changed_output_invalidates(stage, change):
+    paths, source, output = stage
+    if change == "modify":
+        output.write_text("INPUT!")
+    else:
+        output.unlink()
+    assert not is_valid(paths, source)
+
+
+def test_incomplete_stage_is_not_valid(tmp_path):
+    paths = DataPaths(tmp_path)
+    manifest = run_stage(paths, "partial", {}, lambda: ({"out": tmp_path / "missing.txt"}, {}))
+    assert manifest["status"] == "incomplete"
+    assert not manifest_is_valid(load_manifest(paths, "partial"), {}, {})
+
+
+def test_failed_stage_is_not_valid(tmp_path):
+    paths = DataPaths(tmp_path)
+
+    def fail():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        run_stage(paths, "broken", {}, fail)
+    manifest = load_manifest(paths, "broken")
+    assert (manifest["status"], manifest["error"]) == ("failed", "boom")
+    assert not manifest_is_valid(manifest, {}, {})
+
+
+def test_completed_since_follows_the_last_run(tmp_path, monkeypatch):
+    paths = DataPaths(tmp_path)
+    clock = iter(f"2024-01-01T00:00:{s:02d}+00:00" for s in range(60))
+    monkeypatch.setattr(checkpoint, "_now", lambda: next(clock))
+
+    def done():
+        return {}, {}
+
+    run_stage(paths, "download", {}, done)
+    assert not completed_since(paths, "convert", "download")
+    run_stage(paths, "convert", {}, done)
+    assert completed_since(paths, "convert", "download")
+
+    # A new download starts a new run, which has not converted yet ...
+    run_stage(paths, "download", {}, done)
+    assert not completed_since(paths, "convert", "download")
+    # ... and a conversion skipped on resume still counts as reached.
+    assert run_stage(paths, "convert", {}, done, resume=True)["skipped"]
+    assert completed_since(paths, "convert", "download")
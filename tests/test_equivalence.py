@@ -0,0 +1,68 @@
+import pytest
+
+from sanctions_pipeline.equivalence import ENGINES, compare_latin_names, compare_tables, corpus_aliases
+from sanctions_pipeline.sources.eu import resolve_rem2
+from sanctions_pipeline.status import REM2_CONFLICT, REM2_MISSING, visible_flags
+from sanctions_pipeline.synthetic import generate_corpus
+
+pytest.importorskip("openpyxl")  # the legacy engine builds a workbook
+
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_current_matches_legacy_on_synthetic_corpus(tmp_path, seed):
+    xml_archive, pdf_archive = tmp_path / "xml_chunks.zip", tmp_path / "pdf_text_chunks.zip"
+    generate_corpus(400, xml_archive, pdf_archive, seed=seed)
+
+    expected = ENGINES["legacy"](xml_archive, pdf_archive)
+    actual = ENGINES["current"](xml_archive, pdf_archive)
+    result = compare_tables(expected, actual)
+    assert result["field_diffs"] == {}, result["first"]
+    assert compare_latin_names(corpus_aliases(xml_archive)) == []
+    # The corpus has to reach every REM2 path for the comparison to mean anything.
+    flags = visible_flags(actual.status)
+    assert (flags & REM2_MISSING).any() and (flags & REM2_CONFLICT).any()
+
+
+def resolve(names, candidates, records=None):
+    status = [0] * len(names)
+    rem2, matched = resolve_rem2(list(names), list(candidates), status, records)
+    return rem2, matched, status
+
+
+def test_unique_names_keep_their_match():
+    assert resolve(["A", "B"], ["x", "y"], [3, 4]) == (["x", "y"], [3, 4], [0, 0])
+
+
+def test_missing_rem2_is_flagged():
+    rem2, records, status = resolve(["A", "UNKNOWN", "UNKNOWN"], ["", "x", ""], [None, 1, None])
+    assert rem2 == ["", "", ""]
+    assert records == [None, None, None]
+    assert status == [REM2_MISSING] * 3
+
+
+def test_duplicate_takes_agreeing_neighbours_value_and_record():
+    rem2, records, status = resolve(["A", "D", "D", "B"], ["x", "y", "", "x"], [0, 1, None, 2])
+    assert rem2 == ["x", "x", "x", "x"]
+    assert records == [0, 0, 0, 2]
+    assert status == [0, 0, 0, 0]
+
+
+def test_duplicate_with_disagreeing_neighbours_is_a_conflict():
+    rem2, records, status = resolve(["A", "D", "D", "B"], ["x", "", "", "y"], [0, None, None, 1])
+    assert rem2 == ["x", "", "", "y"]
+    assert records == [0, None, None, 1]
+    assert status == [0, REM2_CONFLICT, REM2_CONFLICT, 0]
+
+
+def test_duplicate_at_the_edge_is_a_conflict():
+    _, _, status = resolve(["D", "D"], ["x", "x"])
+    assert status == [REM2_CONFLICT, REM2_CONFLICT]
+
+
+def test_third_pass_clears_conflicts_resolved_by_neighbours():
+    # Row 1 conflicts on the candidates (x / y); row 2 then resolves to x and
+    # the third pass gives row 1 the resolved value and clears its flag.
+    rem2, records, status = resolve(["A", "D", "D", "D"], ["x", "", "y", "x"], [0, None, 1, 2])
+    assert rem2 == ["x", "x", "x", ""]
+    assert records == [0, 0, 0, None]
+    assert status == [0, 0, 0, REM2_CONFLICT]
@@ -0,0 +1,53 @@
+import pytest
+
+from sanctions_pipeline.gazetteer import (city_country_code, country_code, country_code_column,
+                                          country_codes_column)
+
+
+@pytest.mark.parametrize("value, code", [
+    ("Russian Federation", "RU"),
+    ("russia", "RU"),
+    ("Iran (Islamic Republic of)", "IR"),
+    ("Iran, Islamic Republic of", "IR"),
+    ("Korea, Democratic People's Republic of", "KP"),
+    ("DPRK", "KP"),
+    ("Korea (South)", "KR"),
+    ("Côte d’Ivoire", "CI"),
+    ("Ivory Coast", "CI"),
+    ("Congo, Democratic Republic of the", "CD"),
+    ("Congo", "CG"),
+    ("Syrian Arab Republic", "SY"),
+    ("Venezuela (Bolivarian Republic of)", "VE"),
+    ("Myanmar (Burma)", "MM"),
+    ("U.S.A.", "US"),
+    ("Türkiye", "TR"),
+    ("Lao PDR", "LA"),
+    ("Libyan Arab Jamahiriya", "LY"),
+    ("Czech Republic", "CZ"),
+    ("The former Yugoslav Republic of Macedonia", "MK"),
+    ("Occupied Palestinian Territory", "PS"),
+    ("Great Britain", "GB"),
+])
+def test_country_code_spellings(value, code):
+    assert country_code(value) == code
+
+
+@pytest.mark.parametrize("value", ["", "UNKNOWN", "Atlantis", "Korea"])
+def test_unknown_country_has_no_code(value):
+    assert country_code(value) == ""
+
+
+def test_country_codes_column_keeps_order_and_drops_unknowns():
+    values = ["Russian Federation; Belarus", "Iran (Islamic Republic of)", "", "Atlantis; DPRK; North Korea",
+              "Russian Federation; Belarus"]
+    assert country_codes_column(values) == ["RU; BY", "IR", "", "KP", "RU; BY"]
+
+
+def test_city_fallback_needs_the_whole_city_name():
+    assert city_country_code("St. Petersburg") == "RU"
+    assert city_country_code("Kiev") == "UA"
+    assert city_country_code("Minsk Region") == ""
+    assert city_country_code("New Kabul Road") == ""
+    # Shared by Libya and Lebanon, so not guessed.
+    assert city_country_code("Tripoli") == ""
+    assert country_code_column(["", "Syria", "Atlantis"], ["Damascus", "Tripoli", "Tripoli"]) == ["SY", "SY", ""]
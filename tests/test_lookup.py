@@ -0,0 +1,43 @@
+import asyncio
+import os
+
+from sanctions_pipeline.exporters import OutputTable, export_table
+from sanctions_pipeline.lookup import LookupService, published_output
+
+
+def touch(path, mtime_ns):
+    path.write_text("")
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_published_output_prefers_an_index_that_is_not_older(tmp_path):
+    base = tmp_path / "sanctions_output.xlsx"
+    assert published_output(base) is None
+    touch(base.with_suffix(".jsonl"), 2_000_000_000)
+    touch(base.with_suffix(".idx"), 2_000_000_000)
+    assert published_output(base) == base.with_suffix(".idx")
+    touch(base.with_suffix(".csv"), 3_000_000_000)
+    assert published_output(base) == base.with_suffix(".csv")
+
+
+def test_reload_closes_the_swapped_out_index(tmp_path):
+    base = tmp_path / "sanctions_output.xlsx"
+
+    def publish(names):
+        export_table(OutputTable({"FULL_NAME": names, "ALIAS": [()] * len(names)}), ["index"], base)
+
+    async def run():
+        service = LookupService(base)
+        publish(["Ivan Petrov"])
+        assert await service.reload_if_changed()
+        first = service.index
+        assert service.handle_lookup({"q": ["ivan petrov"]})[1]["count"] == 1
+
+        publish(["Ivan Petrov", "Olga Petrova"])
+        os.utime(base.with_suffix(".idx"), ns=(5_000_000_000, 5_000_000_000))
+        assert await service.reload_if_changed()
+        assert not os.path.exists(first.copy_path)
+        assert service.handle_lookup({"q": ["petrov"], "mode": ["token"]})[1]["count"] == 1
+        assert len(service.index) == 2
+
+    asyncio.run(run())
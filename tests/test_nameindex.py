@@ -0,0 +1,81 @@
+import struct
+
+import pytest
+
+from sanctions_pipeline import nameindex
+from sanctions_pipeline.exporters import OutputTable
+from sanctions_pipeline.lookup import MODES, NameIndex
+from sanctions_pipeline.nameindex import MappedNameIndex, write_name_index
+
+NAMES = [
+    ("Ivan Petrov", ("Иван Петров", "Vanya Petrov")),
+    ("José García", ()),
+    ("Zoë O’Brien-Łukasz", ("Zoe OBrien",)),
+    ("UNKNOWN", ()),
+    ("", ("Anna Ivanova",)),
+    ("Ivan Ivanov", ("", "Petrov Ivan")),
+    ("Müller GmbH", ("Mueller GmbH",)),
+]
+QUERIES = ["Ivan Petrov", "ivan", "Iv", "Petrov", "jose garcia", "José", "Zoë", "zoe o brien", "Иван",
+           "Иван Петров", "Müller", "mueller", "Anna", "UNKNOWN", "nobody", "Ivan Petrov Ivanov", "ł"]
+
+
+@pytest.fixture
+def table():
+    return OutputTable({"FULL_NAME": [name for name, _ in NAMES], "ALIAS": [aliases for _, aliases in NAMES],
+                        "SOURCE": ["EU"] * len(NAMES)})
+
+
+@pytest.fixture
+def mapped(table, tmp_path):
+    path = write_name_index(table, tmp_path / "out.idx")
+    with MappedNameIndex(path) as index:
+        yield index
+
+
+def test_rows_round_trip(table, mapped):
+    assert len(mapped) == len(table)
+    assert [mapped.rows[i] for i in range(len(mapped))] == [
+        {**row, "ALIAS": list(row["ALIAS"])} for row in table.iter_records()]
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_lookup_matches_in_memory_index(table, mapped, mode):
+    memory = NameIndex(list(table.iter_records()))
+    for query in QUERIES:
+        for limit in (1, 20):
+            assert mapped.lookup(query, mode, limit) == memory.lookup(query, mode, limit), (query, mode, limit)
+
+
+def test_lookup_finds_non_ascii_and_alias_only_rows(mapped):
+    assert mapped.lookup("Иван Петров") == [0]
+    assert mapped.lookup("zoe obrien") == [2]
+    assert mapped.lookup("Anna Ivanova") == [4]
+    assert mapped.lookup("UNKNOWN") == []
+    assert mapped.lookup("Petrov", "token") == [0, 5]
+    assert mapped.lookup("ivan", "prefix") == [5, 0]
+
+
+def _patch_header(path, **fields):
+    data = bytearray(path.read_bytes())
+    magic, version = struct.unpack_from("<4sI", data)
+    struct.pack_into("<4sI", data, 0, fields.get("magic", magic), fields.get("version", version))
+    path.write_bytes(bytes(data))
+
+
+@pytest.mark.parametrize("fields, message", [
+    ({"magic": b"XXXX"}, "is not a name index"),
+    ({"version": nameindex.VERSION + 1}, f"this reader supports version {nameindex.VERSION}"),
+])
+def test_bad_header_is_rejected(table, tmp_path, fields, message):
+    path = write_name_index(table, tmp_path / "out.idx")
+    _patch_header(path, **fields)
+    with pytest.raises(ValueError, match=message):
+        MappedNameIndex(path)
+
+
+def test_truncated_file_is_rejected(tmp_path):
+    path = tmp_path / "short.idx"
+    path.write_bytes(nameindex.MAGIC)
+    with pytest.raises(ValueError, match="is not a name index"):
+        MappedNameIndex(path)
@@ -0,0 +1,33 @@
+import sys
+
+import pytest
+
+from sanctions_pipeline.exporters import OutputTable, export_table
+from sanctions_pipeline.pdf_text import iter_page_texts
+from sanctions_pipeline.xmlbackend import get_backend
+
+
+def missing(monkeypatch, *modules):
+    for name in modules:
+        monkeypatch.setitem(sys.modules, name, None)
+
+
+def test_parquet_without_pyarrow_says_what_to_install(monkeypatch, tmp_path):
+    missing(monkeypatch, "pyarrow", "pyarrow.parquet")
+    base = tmp_path / "out.xlsx"
+    with pytest.raises(RuntimeError, match=r"pip install pyarrow"):
+        export_table(OutputTable({"FULL_NAME": ["A"]}), ["parquet"], base)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_forced_lxml_backend_without_lxml_says_what_to_install(monkeypatch):
+    missing(monkeypatch, "lxml", "lxml.etree")
+    with pytest.raises(RuntimeError, match=r"pip install lxml"):
+        get_backend.__wrapped__("lxml")
+    assert get_backend.__wrapped__(None).name == "etree"
+
+
+def test_pdfium_backend_without_pypdfium2_says_what_to_install(monkeypatch, tmp_path):
+    missing(monkeypatch, "pypdfium2")
+    with pytest.raises(RuntimeError, match=r"pip install pypdfium2"):
+        list(iter_page_texts(tmp_path / "list.pdf", "pdfium"))
@@ -0,0 +1,22 @@
+from sanctions_pipeline.config import DataPaths
+from sanctions_pipeline.partitions import convert_partitioned
+from sanctions_pipeline.synthetic import generate_corpus
+
+
+def test_dropped_format_and_programme_files_are_pruned(tmp_path):
+    paths = DataPaths(tmp_path)
+    generate_corpus(200, paths.xml_chunks_archive, paths.pdf_chunks_archive, seed=5)
+    out_dir = paths.programmes_dir
+
+    convert_partitioned(paths, ("csv", "jsonl"), workers=1)
+    csv_files = {p.name for p in out_dir.glob("*.csv")}
+    assert csv_files and {p.stem for p in out_dir.glob("*.jsonl")} == {p.stem for p in out_dir.glob("*.csv")}
+    (out_dir / "GONE.csv").write_text("")
+    (paths.partitions_dir / "GONE.json").write_text("{}")
+
+    _, _, summary = convert_partitioned(paths, ("csv",), workers=1)
+    assert summary["enriched"] == []
+    assert {p.name for p in out_dir.iterdir()} == csv_files
+    assert not (paths.partitions_dir / "GONE.json").exists()
+    assert "GONE.csv" in summary["removed"]
+    assert sum(name.endswith(".jsonl") for name in summary["removed"]) == len(csv_files)
@@ -0,0 +1,111 @@
+import json
+import struct
+
+import pytest
+
+from sanctions_pipeline import snapshot
+from sanctions_pipeline.artifacts import ChunkWriter
+from sanctions_pipeline.config import DataPaths
+from sanctions_pipeline.conversion import build_pdf_rem2_mapping
+from sanctions_pipeline.snapshot import NO_MATCH, Snapshot, write_snapshot
+from sanctions_pipeline.sources.eu import EUTravelBanAdapter
+from sanctions_pipeline.synthetic import NAMESPACE, generate_corpus
+
+
+def build(paths):
+    pdf_mapping = build_pdf_rem2_mapping(paths.pdf_chunks_archive)
+    table = EUTravelBanAdapter(pdf_mapping=pdf_mapping).build_table(paths.xml_chunks_archive)
+    return table, pdf_mapping
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    paths = DataPaths(tmp_path)
+    generate_corpus(300, paths.xml_chunks_archive, paths.pdf_chunks_archive, seed=3)
+    table, pdf_mapping = build(paths)
+    return table, pdf_mapping, write_snapshot(table, tmp_path / "out.snap", pdf_mapping)
+
+
+def test_round_trip(corpus):
+    table, pdf_mapping, path = corpus
+    with Snapshot(path) as snap:
+        assert snap.meta["entities"] == len(snap) == len(table)
+        assert snap.meta["columns"] == table.names
+        assert list(snap.entities) == [json.loads(json.dumps(row, ensure_ascii=False))
+                                       for row in table.iter_records()]
+        assert bytes(snap.status) == bytes(table.status.tolist())
+        assert list(snap.pdf_records) == pdf_mapping.records
+        assert snap.pdf_mapping() == dict(pdf_mapping)
+        key = next(iter(pdf_mapping))
+        assert snap.pdf_rem2(key) == pdf_mapping[key]
+        assert snap.pdf_record_for(key) == pdf_mapping.record_for[key]
+        assert snap.pdf_rem2("no such name") is None
+
+
+def test_matches_are_the_records_conversion_used(corpus):
+    table, _, path = corpus
+    with Snapshot(path) as snap:
+        matches = list(snap.matches())
+        assert [record for _, _, record in matches] == table.rem2_records
+        assert any(record is not None for record in table.rem2_records)
+        for row, _, record in matches:
+            rem2 = table.columns["REM2"][row]
+            assert (record is None) == (not rem2)
+            if record is not None:
+                assert snap.pdf_records[record]["rem2"] == rem2
+
+
+def entity(name):
+    return (f'<root><sanctionEntity xmlns="{NAMESPACE}"><nameAlias wholeName="{name}" />'
+            f'<regulation programme="RUS" /></sanctionEntity></root>')
+
+
+def test_shared_rem2_points_at_the_matching_record(tmp_path):
+    paths = DataPaths(tmp_path)
+    with ChunkWriter(paths.xml_chunks_archive, ".xml") as writer:
+        for name in ("Ivan Petrov", "Olga Smirnova", "Nobody Known"):
+            writer.append(entity(name))
+    with ChunkWriter(paths.pdf_chunks_archive, ".txt") as writer:
+        for name in ("Olga Smirnova", "Ivan Petrov"):
+            writer.append(f"Entity\nName/Alias: {name}\nProgramme: EU | RUS", programme="RUS")
+    table, pdf_mapping = build(paths)
+    assert [r["rem2"] for r in pdf_mapping.records] == ["Programme: RUS"] * 2
+
+    with Snapshot(write_snapshot(table, tmp_path / "out.snap", pdf_mapping)) as snap:
+        assert [record for _, _, record in snap.matches()] == [1, 0, None]
+        assert snap.section("match_records")[2] == NO_MATCH
+
+
+def test_without_pdf_records_nothing_matches(corpus, tmp_path):
+    table, _, _ = corpus
+    with Snapshot(write_snapshot(table, tmp_path / "bare.snap")) as snap:
+        assert len(snap.pdf_records) == 0
+        assert {record for _, _, record in snap.matches()} == {None}
+
+
+def test_other_schema_version_is_rejected(corpus):
+    _, _, path = corpus
+    data = bytearray(path.read_bytes())
+    struct.pack_into("<I", data, 4, snapshot.SCHEMA_VERSION + 1)
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match=f"this reader supports schema {snapshot.SCHEMA_VERSION}"):
+        Snapshot(path)
+
+
+@pytest.mark.parametrize("keep, message", [
+    (6, "is not a run snapshot"),
+    (snapshot.HEADER.size + snapshot.ENTRY.size, "is truncated"),
+    (-100, "is truncated"),
+])
+def test_truncated_file_is_rejected(corpus, keep, message):
+    _, _, path = corpus
+    path.write_bytes(path.read_bytes()[:keep])
+    with pytest.raises(ValueError, match=message):
+        Snapshot(path)
+
+
+def test_bad_magic_is_rejected(tmp_path):
+    path = tmp_path / "bad.snap"
+    path.write_bytes(b"XXXX" + bytes(64))
+    with pytest.raises(ValueError, match="is not a run snapshot"):
+        Snapshot(path)
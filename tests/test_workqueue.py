@@ -0,0 +1,160 @@
+import zipfile
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from sanctions_pipeline import backfill, workqueue
+from sanctions_pipeline.config import DataPaths
+from sanctions_pipeline.synthetic import generate_corpus
+from sanctions_pipeline.workqueue import DONE, FAILED, LEASED, PENDING, WorkQueue
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(workqueue.time, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def queues(tmp_path):
+    """Two connections to one queue file, as two workers would have."""
+    path = tmp_path / "queue.db"
+    with WorkQueue(path) as a, WorkQueue(path) as b:
+        yield a, b
+
+
+def states(queue):
+    return dict(queue.db.execute("SELECT key, state FROM tasks"))
+
+
+def test_expired_lease_is_handed_out_again(queues, clock):
+    a, b = queues
+    a.add("run", "enrich", "1", {})
+    first = a.claim("a", lease_s=10)
+    assert first.attempts == 1
+    assert b.claim("b", lease_s=10) is None
+
+    clock.now += 11
+    second = b.claim("b", lease_s=10)
+    assert (second.id, second.attempts) == (first.id, 2)
+    assert not a.renew(first, "a", lease_s=10)
+    assert b.renew(second, "b", lease_s=10)
+
+
+def test_lease_lost_on_last_attempt_fails_the_task(queues, clock):
+    a, b = queues
+    a.add("run", "enrich", "1", {}, max_attempts=1)
+    a.claim("a", lease_s=10)
+
+    clock.now += 11
+    assert b.claim("b", lease_s=10) is None
+    assert states(b) == {"1": FAILED}
+    _, failures = b.summary()
+    assert failures == [("run", "enrich", "1", 1, "lease expired on the last attempt")]
+
+    assert b.retry_failed("run") == 1
+    assert b.claim("b", lease_s=10).attempts == 1
+
+
+def test_stale_owner_cannot_complete(queues, clock):
+    a, b = queues
+    a.add("run", "enrich", "1", {})
+    stale = a.claim("a", lease_s=10)
+    clock.now += 11
+    current = b.claim("b", lease_s=10)
+
+    followups = []
+    assert not a.complete(stale, "a", {"by": "a"}, then=followups.append)
+    assert followups == []
+    assert states(a) == {"1": LEASED}
+
+    assert b.complete(current, "b", {"by": "b"})
+    assert a.results("run", "enrich") == [("1", {"by": "b"})]
+
+
+def test_fail_retries_until_the_last_attempt(queues, clock):
+    a, _ = queues
+    a.add("run", "enrich", "1", {}, max_attempts=2)
+    a.fail(a.claim("a", lease_s=10), "a", "boom")
+    assert states(a) == {"1": PENDING}
+    a.fail(a.claim("a", lease_s=10), "a", "boom again")
+    assert states(a) == {"1": FAILED}
+    assert a.claim("a", lease_s=10) is None
+
+
+def test_merge_is_queued_once_by_the_last_enrich(queues, clock):
+    a, b = queues
+    a.add("run", "enrich", "1", {}, priority=1)
+    a.add("run", "enrich", "2", {}, priority=1)
+    tasks = {"a": a.claim("a", lease_s=10), "b": b.claim("b", lease_s=10)}
+
+    def then(queue):
+        # Same rule as ``backfill.enrich``.
+        if queue.unfinished("run", "enrich") == 0:
+            queue.add("run", "merge", "", {}, priority=0)
+
+    assert a.complete(tasks["a"], "a", {}, then)
+    assert "" not in states(a)
+    assert b.complete(tasks["b"], "b", {}, then)
+    assert b.complete(tasks["b"], "b", {}, then) is False
+    assert a.db.execute("SELECT COUNT(*) FROM tasks WHERE kind = 'merge'").fetchone()[0] == 1
+    assert states(a)[""] == PENDING
+
+
+def write_feed(xml_archive, feed_path):
+    """A feed file made of the corpus chunks that parse (the generator breaks a few on purpose)."""
+    parts = [b'<?xml version="1.0" encoding="UTF-8"?>\n<export>']
+    with zipfile.ZipFile(xml_archive) as archive:
+        for info in archive.infolist():
+            try:
+                root = ET.fromstring(archive.read(info))
+            except ET.ParseError:
+                continue
+            parts.append(ET.tostring(root[0]))
+    parts.append(b"</export>\n")
+    feed_path.write_bytes(b"\n".join(parts))
+
+
+def test_backfill_matches_plain_convert(tmp_path):
+    from sanctions_pipeline.pipeline import convert_stage
+
+    corpus = DataPaths(tmp_path / "corpus")
+    generate_corpus(120, corpus.xml_chunks_archive, corpus.pdf_chunks_archive, seed=7)
+    publication = tmp_path / "archive" / "2024-01-01"
+    publication.mkdir(parents=True)
+    write_feed(corpus.xml_chunks_archive, publication / "feed.xml")
+
+    queue_path = tmp_path / "queue.db"
+    assert backfill.submit(queue_path, [publication], tmp_path / "work", chunk_size=25, formats=("jsonl",)) == 1
+    run = DataPaths(tmp_path / "work" / "2024-01-01")
+    # No PDF in the folder: ``prepare`` keeps the PDF chunks placed here.
+    run.parent_dir.mkdir(parents=True)
+    run.pdf_chunks_archive.write_bytes(corpus.pdf_chunks_archive.read_bytes())
+
+    backfill.work_local(queue_path, 2, lease_s=60, poll_s=0.05)
+
+    with WorkQueue(queue_path) as queue:
+        counts, failures = queue.summary()
+    assert failures == []
+    assert counts["2024-01-01"]["enrich"] == {DONE: 5}
+    assert counts["2024-01-01"]["merge"] == {DONE: 1}
+
+    plain = DataPaths(tmp_path / "plain")
+    plain.parent_dir.mkdir()
+    plain.xml_chunks_archive.write_bytes(run.xml_chunks_archive.read_bytes())
+    plain.pdf_chunks_archive.write_bytes(run.pdf_chunks_archive.read_bytes())
+    convert_stage(plain, formats=("jsonl",))
+
+    expected = plain.xlsx_path.with_suffix(".jsonl").read_bytes()
+    assert run.xlsx_path.with_suffix(".jsonl").read_bytes() == expected
+    with zipfile.ZipFile(run.xml_chunks_archive) as archive:
+        assert len(expected.splitlines()) == len(archive.infolist()) > 100
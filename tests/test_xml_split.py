@@ -0,0 +1,89 @@
+import zipfile
+
+import pytest
+
+from sanctions_pipeline import xml_split
+from sanctions_pipeline.xmlbackend import get_backend
+
+# The entities use prefixes declared on enclosing elements below the root.
+NESTED_NAMESPACES = b"""<?xml version="1.0" encoding="UTF-8"?>
+<export xmlns="http://eu.europa.ec/fpi/fsd/export" generationDate="2024-01-01">
+  <!-- comments between entities are skipped -->
+  <list xmlns:x="http://example.com/x">
+    <x:sanctionEntity logicalId="1">
+      <x:nameAlias wholeName="Ivan Petrov"/>
+      <x:regulation programme="RUS"/>
+    </x:sanctionEntity>
+    <group xmlns:y="http://example.com/y" xmlns:x="http://example.com/x2">
+      <y:sanctionEntity logicalId="2">
+        <x:nameAlias wholeName="Anna Ivanova"/>
+        <y:regulation programme="BLR"/>
+      </y:sanctionEntity>
+    </group>
+    <sanctionEntity logicalId="3"><regulation programme="SYR"/></sanctionEntity>
+  </list>
+  <x:sanctionEntity xmlns:x="http://example.com/x3" logicalId="4"/>
+</export>
+"""
+
+
+def members(path):
+    with zipfile.ZipFile(path) as archive:
+        return [(info.filename, info.comment, archive.read(info)) for info in archive.infolist()]
+
+
+@pytest.fixture(params=["etree", "lxml"])
+def backend(request, monkeypatch):
+    if request.param == "lxml":
+        pytest.importorskip("lxml")
+    monkeypatch.setenv("SANCTIONS_XML_BACKEND", request.param)
+    get_backend.cache_clear()
+    yield request.param
+    get_backend.cache_clear()
+
+
+def test_parallel_split_keeps_enclosing_namespaces(tmp_path, backend):
+    feed = tmp_path / "feed.xml"
+    feed.write_bytes(NESTED_NAMESPACES)
+
+    assert xml_split.split_xml_entities(feed, tmp_path / "seq.zip") == 4
+    assert xml_split.split_xml_entities(feed, tmp_path / "par.zip", workers=2) == 4
+
+    expected = members(tmp_path / "seq.zip")
+    assert [comment for _, comment, _ in expected] == [b"RUS", b"BLR", b"SYR", b""]
+    assert members(tmp_path / "par.zip") == expected
+
+
+def test_scan_heads_declare_enclosing_namespaces():
+    ranges = xml_split.scan_entity_ranges(NESTED_NAMESPACES)
+    assert len(ranges) == 4
+    heads = [head for _, _, head in ranges]
+    assert b'xmlns:x="http://example.com/x"' in heads[0]
+    assert b'xmlns:y="http://example.com/y"' in heads[1]
+    assert b'xmlns:x="http://example.com/x2"' in heads[1]
+    assert b"example.com/y" not in heads[2]
+    assert b'xmlns:x="http://example.com/x3"' not in heads[3]
+
+
+# Valid feeds the byte-range scan rejects: entity tags inside a comment cannot
+# be paired up, and an entity declared in the DTD would be unknown to a range.
+UNPAIRED_TAGS = NESTED_NAMESPACES.replace(
+    b"<!-- comments between entities are skipped -->", b"<!-- the old format closed with </sanctionEntity> -->")
+DTD_ENTITY = NESTED_NAMESPACES.replace(
+    b"<export ", b'<!DOCTYPE export [<!ENTITY eu "European Union">]>\n<export ').replace(
+    b'wholeName="Anna Ivanova"', b'wholeName="Anna Ivanova (&eu;)"')
+
+
+@pytest.mark.parametrize("data, reason", [
+    (UNPAIRED_TAGS, "unmatched closing tag"),
+    (DTD_ENTITY, "internal dtd subsets are not supported"),
+], ids=["comment", "dtd"])
+def test_unsplittable_feed_falls_back_to_sequential_split(tmp_path, backend, capsys, data, reason):
+    feed = tmp_path / "feed.xml"
+    feed.write_bytes(data)
+    assert xml_split.split_xml_entities(feed, tmp_path / "seq.zip") == 4
+
+    assert xml_split.split_xml_entities(feed, tmp_path / "par.zip", workers=2) == 4
+    out = capsys.readouterr().out
+    assert "Byte-range split not possible" in out and reason in out.lower()
+    assert members(tmp_path / "par.zip") == members(tmp_path / "seq.zip")